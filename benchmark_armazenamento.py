@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark do TarefaModel sobre cada armazenamento (memória, SQLite e MongoDB) e volume de tarefas
+
+Cada combinação roda em um processo separado, para que o pico de memória (RSS) seja só dela.
+O resultado (vazão, latências p50/p99 e pico de RSS) é gravado em JSON para comparar execuções.
+
+Uso:
+    python benchmark_armazenamento.py                              # memória e SQLite, 1k e 100k
+    python benchmark_armazenamento.py --armazenamentos memoria mongo --tamanhos 1000 100000 1000000
+    python benchmark_armazenamento.py --armazenamentos mongo --iniciar-mongod
+    python benchmark_armazenamento.py --comparar benchmark_anterior.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ARMAZENAMENTOS = ("memoria", "sqlite", "mongo")
+TAMANHOS_PADRAO = (1000, 100_000)
+
+# Operações pontuais cronometradas uma a uma (latência) em cada volume
+AMOSTRAS_PONTUAIS = 1000
+# Tarefas por operação em massa (atualizar status e excluir)
+TAREFAS_EM_MASSA = 1000
+# Repetições das listagens completas (que crescem com o volume)
+REPETICOES_LISTAGEM = 3
+
+# Coleção usada no MongoDB: criada e removida pelo benchmark, nunca a da aplicação
+COLECAO_BENCHMARK = "tarefas_benchmark"
+
+PALAVRAS = (
+    "relatório reunião cliente orçamento revisar enviar planilha contrato projeto entrega "
+    "equipe prazo código teste documentação servidor backup fatura agenda pesquisa"
+).split()
+
+
+def _percentil(amostras, p):
+    """Percentil p (0-100) pelo método do posto mais próximo."""
+    ordenadas = sorted(amostras)
+    posicao = max(0, min(len(ordenadas) - 1, int(round(p / 100 * len(ordenadas) + 0.5)) - 1))
+    return ordenadas[posicao]
+
+
+def _resumir(amostras, itens_por_amostra=1):
+    """Vazão e latências (ms) de uma lista de durações em segundos."""
+    total = sum(amostras)
+    return {
+        "amostras": len(amostras),
+        "segundos": total,
+        "operacoes_por_segundo": len(amostras) * itens_por_amostra / total if total else 0.0,
+        "p50_ms": _percentil(amostras, 50) * 1000,
+        "p99_ms": _percentil(amostras, 99) * 1000,
+    }
+
+
+def _cronometrar(funcao, *args, **kwargs):
+    """Executa a função e retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def _pico_rss_mb():
+    """Pico de memória residente do processo em MB (None onde o módulo resource não existe)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _gerar_arquivo(caminho, quantidade, aleatorio):
+    """Grava um JSONL com tarefas de tamanho realista (título curto, descrição de ~200 caracteres)."""
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        for i in range(quantidade):
+            titulo = " ".join(aleatorio.choices(PALAVRAS, k=4)).capitalize() + f" {i}"
+            descricao = " ".join(aleatorio.choices(PALAVRAS, k=25))
+            status = "Concluída" if aleatorio.random() < 0.5 else "Pendente"
+            arquivo.write(json.dumps({"titulo": titulo, "descricao": descricao, "status": status}, ensure_ascii=False) + "\n")
+
+
+def _criar_model(armazenamento, pasta, mongo_uri):
+    """TarefaModel configurado para o armazenamento, sem cache e sem acompanhar alterações.
+
+    As variáveis são definidas antes de importar o model, que as lê ao ser carregado.
+    """
+    os.environ["MONITORAR_ALTERACOES"] = "false"
+    os.environ["ESCRITA_ADIADA"] = "false"
+    os.environ["ARMAZENAMENTO_LOCAL"] = "sqlite" if armazenamento == "sqlite" else "memoria"
+    os.environ["SQLITE_CAMINHO"] = os.path.join(pasta, "tarefas.db")
+    os.environ["DIARIO_OFFLINE_CAMINHO"] = ""
+    os.environ["MONGO_URI"] = mongo_uri if armazenamento == "mongo" else ""
+    os.environ["MONGO_COLLECTION"] = COLECAO_BENCHMARK
+
+    from model.cache import CacheLRU
+    from model.tarefa_model import TarefaModel
+
+    model = TarefaModel()
+    # Sem cache, cada leitura chega ao armazenamento
+    model.cache = CacheLRU(max_entradas=0)
+    return model
+
+
+def executar(armazenamento, tamanho, mongo_uri):
+    """Mede as operações do model em um armazenamento já populado com `tamanho` tarefas."""
+    aleatorio = random.Random(tamanho)
+    with tempfile.TemporaryDirectory() as pasta:
+        model = _criar_model(armazenamento, pasta, mongo_uri)
+        if armazenamento == "mongo":
+            if not model.mongo_context.aguardar_conexao():
+                return {"ignorado": f"sem conexão com o MongoDB em {mongo_uri}"}
+            from model.armazenamento_mongo import colecao_exclusoes
+            model.colecao.delete_many({})
+            colecao_exclusoes(model.colecao).delete_many({})
+            model.local.esvaziar()
+
+        operacoes = {}
+        arquivo = os.path.join(pasta, "tarefas.jsonl")
+        _gerar_arquivo(arquivo, tamanho, aleatorio)
+        _, segundos = _cronometrar(model.importar, arquivo)
+        operacoes["inserir_em_lote"] = {"amostras": 1, "segundos": segundos, "operacoes_por_segundo": tamanho / segundos}
+        # Sem conexão as escritas também vão para o diário offline; a carga não deve contar nele
+        model.diario.substituir([])
+
+        operacoes["listar"] = _resumir([_cronometrar(model.listar)[1] for _ in range(REPETICOES_LISTAGEM)], tamanho)
+        pendentes = model.armazenamento.contar("Pendente")
+        operacoes["listar_status"] = _resumir(
+            [_cronometrar(model.listar, "Pendente")[1] for _ in range(REPETICOES_LISTAGEM)], pendentes
+        )
+        operacoes["contar_por_status"] = _resumir(
+            [_cronometrar(model.contar_por_status)[1] for _ in range(REPETICOES_LISTAGEM)]
+        )
+
+        duracoes, cursor = [], None
+        for _ in range(AMOSTRAS_PONTUAIS // 10):
+            pagina, segundos = _cronometrar(model.listar_pagina, None, 200, cursor, False, True)
+            duracoes.append(segundos)
+            cursor = pagina["proximo_cursor"]
+            if cursor is None:
+                break
+        operacoes["listar_pagina"] = _resumir(duracoes)
+
+        # Tarefas sorteadas para as operações pontuais e, à parte, para as operações em massa
+        ids = [str(i) for i in model._ler('listar_ids', None)]
+        em_massa = aleatorio.sample(ids, min(2 * TAREFAS_EM_MASSA, len(ids) // 2))
+        sorteados = set(em_massa)
+        restantes = [i for i in ids if i not in sorteados]
+        amostra = aleatorio.sample(restantes, min(AMOSTRAS_PONTUAIS, len(restantes)))
+        operacoes["buscar_por_id"] = _resumir([_cronometrar(model.buscar_por_id, i)[1] for i in amostra])
+        operacoes["atualizar"] = _resumir(
+            [_cronometrar(model.atualizar, i, "Editada", "Descrição editada", "Concluída")[1] for i in amostra]
+        )
+        operacoes["adicionar"] = _resumir(
+            [_cronometrar(model.adicionar, f"Nova {i}", "Descrição", "Pendente")[1] for i in range(len(amostra))]
+        )
+
+        if armazenamento != "mongo":
+            _, segundos = _cronometrar(model.preparar_busca)
+            operacoes["criar_indice_busca"] = {"amostras": 1, "segundos": segundos}
+        termos = [" ".join(aleatorio.sample(PALAVRAS, 2)) for _ in range(AMOSTRAS_PONTUAIS // 10)]
+        operacoes["buscar_texto"] = _resumir([_cronometrar(model.buscar, t)[1] for t in termos])
+
+        metade = len(em_massa) // 2
+        _, segundos = _cronometrar(model.atualizar_status_muitos, "Concluída", em_massa[:metade])
+        operacoes["atualizar_status_em_massa"] = _resumir([segundos], metade)
+        _, segundos = _cronometrar(model.excluir_muitos, em_massa[metade:])
+        operacoes["excluir_em_massa"] = _resumir([segundos], len(em_massa) - metade)
+        operacoes["excluir"] = _resumir([_cronometrar(model.excluir, i)[1] for i in amostra])
+
+        resultado = {"operacoes": operacoes}
+        if armazenamento == "mongo":
+            # Uso do pool de conexões compartilhado durante as medições
+            resultado["conexao"] = model.mongo_context.estatisticas()
+            from model.armazenamento_mongo import colecao_exclusoes
+            colecao_exclusoes(model.colecao).drop()
+            model.colecao.drop()
+        model.encerrar()
+    resultado["rss_pico_mb"] = _pico_rss_mb()
+    return resultado
+
+
+def _executar_em_processo(armazenamento, tamanho, mongo_uri):
+    """Roda uma combinação em um processo novo e retorna o resultado lido do JSON que ele gravou."""
+    with tempfile.TemporaryDirectory() as pasta:
+        saida = os.path.join(pasta, "resultado.json")
+        comando = [
+            sys.executable, os.path.abspath(__file__), "--executar", armazenamento, str(tamanho),
+            "--saida-parcial", saida, "--mongo-uri", mongo_uri
+        ]
+        processo = subprocess.run(comando, cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        if processo.returncode != 0 or not os.path.exists(saida):
+            return {"erro": (processo.stderr or processo.stdout).strip().splitlines()[-1:] or ["falha sem mensagem"]}
+        with open(saida, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+
+def _porta_livre():
+    """Porta TCP livre na máquina local."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _iniciar_mongod(pasta):
+    """Inicia um mongod descartável (sem autenticação, dados na pasta temporária) e retorna (processo, uri)."""
+    executavel = shutil.which("mongod")
+    if executavel is None:
+        raise SystemExit("❌ --iniciar-mongod: executável mongod não encontrado no PATH")
+    porta = _porta_livre()
+    processo = subprocess.Popen(
+        [executavel, "--dbpath", pasta, "--port", str(porta), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    return processo, f"mongodb://127.0.0.1:{porta}/"
+
+
+def _exibir(resultado):
+    """Mostra um resultado no console."""
+    titulo = f"{resultado['armazenamento']} / {resultado['tarefas']} tarefas"
+    if "operacoes" not in resultado:
+        print(f"⚠️ {titulo}: {resultado.get('ignorado') or resultado.get('erro')}")
+        return
+    rss = resultado.get("rss_pico_mb")
+    print(f"\n📊 {titulo} (pico de RSS: {f'{rss:.0f} MB' if rss is not None else 'n/d'})")
+    for nome, medida in resultado["operacoes"].items():
+        linha = f"  {nome:<26} {medida['segundos']:9.3f} s"
+        if "operacoes_por_segundo" in medida:
+            linha += f" {medida['operacoes_por_segundo']:12.0f} op/s"
+        if "p50_ms" in medida:
+            linha += f"   p50 {medida['p50_ms']:8.3f} ms   p99 {medida['p99_ms']:8.3f} ms"
+        print(linha)
+
+
+def _comparar(atual, caminho_anterior):
+    """Mostra a variação de vazão de cada operação em relação a uma execução anterior."""
+    with open(caminho_anterior, encoding="utf-8") as arquivo:
+        anterior = {(r["armazenamento"], r["tarefas"]): r for r in json.load(arquivo)["resultados"]}
+    print(f"\n=== Comparação com {caminho_anterior} (vazão atual / anterior) ===")
+    for resultado in atual["resultados"]:
+        base = anterior.get((resultado["armazenamento"], resultado["tarefas"]))
+        if base is None or "operacoes" not in base or "operacoes" not in resultado:
+            continue
+        print(f"  {resultado['armazenamento']} / {resultado['tarefas']} tarefas")
+        for nome, medida in resultado["operacoes"].items():
+            antes = base["operacoes"].get(nome, {}).get("operacoes_por_segundo")
+            if antes and medida.get("operacoes_por_segundo"):
+                razao = medida["operacoes_por_segundo"] / antes
+                marcador = "🔻" if razao < 0.9 else "🔺" if razao > 1.1 else "  "
+                print(f"    {marcador} {nome:<26} {razao:6.2f}x")
+
+
+def benchmark_armazenamento(armazenamentos, tamanhos, mongo_uri, saida, iniciar_mongod=False, comparar=None):
+    """Executa todas as combinações, grava o JSON e o compara com uma execução anterior, se pedido."""
+    print("=== Benchmark do Armazenamento de Tarefas ===")
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": [],
+    }
+    mongod, pasta_mongod = None, None
+    try:
+        if iniciar_mongod and "mongo" in armazenamentos:
+            pasta_mongod = tempfile.mkdtemp(prefix="benchmark_mongod_")
+            mongod, mongo_uri = _iniciar_mongod(pasta_mongod)
+            print(f"🚀 mongod temporário em {mongo_uri}")
+        for armazenamento in armazenamentos:
+            for tamanho in tamanhos:
+                print(f"⏳ {armazenamento} / {tamanho} tarefas...")
+                resultado = {"armazenamento": armazenamento, "tarefas": tamanho}
+                resultado.update(_executar_em_processo(armazenamento, tamanho, mongo_uri))
+                relatorio["resultados"].append(resultado)
+                _exibir(resultado)
+    finally:
+        if mongod is not None:
+            mongod.terminate()
+            mongod.wait()
+            shutil.rmtree(pasta_mongod, ignore_errors=True)
+
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados gravados em {saida}")
+    if comparar:
+        _comparar(relatorio, comparar)
+    return relatorio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do TarefaModel por armazenamento e volume de tarefas")
+    parser.add_argument("--armazenamentos", nargs="+", choices=ARMAZENAMENTOS, default=["memoria", "sqlite"])
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=list(TAMANHOS_PADRAO))
+    parser.add_argument("--mongo-uri", default=os.getenv("MONGO_URI") or "mongodb://localhost:27017/")
+    parser.add_argument("--iniciar-mongod", action="store_true", help="inicia um mongod temporário para o benchmark")
+    parser.add_argument("--saida", default=f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    parser.add_argument("--comparar", metavar="JSON", help="resultado anterior para comparar a vazão")
+    # Uso interno: execução de uma combinação no processo filho
+    parser.add_argument("--executar", nargs=2, metavar=("ARMAZENAMENTO", "TAMANHO"), help=argparse.SUPPRESS)
+    parser.add_argument("--saida-parcial", help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.executar:
+        armazenamento, tamanho = argumentos.executar
+        resultado = executar(armazenamento, int(tamanho), argumentos.mongo_uri)
+        with open(argumentos.saida_parcial, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo)
+    else:
+        benchmark_armazenamento(
+            argumentos.armazenamentos, argumentos.tamanhos, argumentos.mongo_uri, argumentos.saida,
+            argumentos.iniciar_mongod, argumentos.comparar
+        )
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark da renderização da TarefaView em um display virtual (Xvfb)
+
+Para cada quantidade de tarefas sintéticas, um processo novo abre a TarefaView (sem MongoDB,
+com o controller síncrono) e mede: tempo até o primeiro e o último card de exibir_tarefas,
+latência de _alternar_modo_visualizacao e de _recriar_interface, quantidade de widgets vivos
+e memória residente (RSS). A inicialização também é medida: o main.py é aberto algumas vezes
+até a janela ficar visível e a primeira lista ser pintada, e o tempo de importação dos módulos
+da interface é detalhado com `python -X importtime`. O resultado é gravado em JSON; com
+--comparar, latências que pioraram além da tolerância fazem o script terminar com código 1
+(para uso em CI).
+
+Uso:
+    python benchmark_interface.py                                   # 100, 1.000, 10.000 e 50.000 tarefas
+    python benchmark_interface.py --tamanhos 100 50000 --saida ui.json
+    python benchmark_interface.py --comparar ui_anterior.json --tolerancia 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+TAMANHOS_PADRAO = (100, 1000, 10_000, 50_000)
+
+# Repetições de cada medida (a primeira exibição, com criação de cards, é medida à parte)
+REPETICOES = 5
+# Tempo máximo (s) de espera por uma renderização antes de considerar a medida travada
+LIMITE_ESPERA = 60
+# Pausa (s) após medidas com animação, para o fade-in terminar antes da próxima
+PAUSA_ANIMACAO = 0.4
+# Aberturas do main.py medidas na inicialização
+REPETICOES_INICIALIZACAO = 3
+# Módulos mais lentos listados no relatório de importação
+MODULOS_IMPORTACAO = 15
+
+PALAVRAS = (
+    "relatório reunião cliente orçamento revisar enviar planilha contrato projeto entrega "
+    "equipe prazo código teste documentação servidor backup fatura agenda pesquisa"
+).split()
+
+
+def _percentil(amostras, p):
+    """Percentil p (0-100) pelo método do posto mais próximo."""
+    ordenadas = sorted(amostras)
+    posicao = max(0, min(len(ordenadas) - 1, int(round(p / 100 * len(ordenadas) + 0.5)) - 1))
+    return ordenadas[posicao]
+
+
+def _resumir(amostras_ms):
+    """p50, p99 e máximo de uma lista de latências em ms."""
+    return {
+        "amostras": len(amostras_ms),
+        "p50_ms": _percentil(amostras_ms, 50),
+        "p99_ms": _percentil(amostras_ms, 99),
+        "max_ms": max(amostras_ms),
+    }
+
+
+def _pico_rss_mb():
+    """Pico de memória residente do processo em MB (None onde o módulo resource não existe)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def _rss_atual_mb():
+    """Memória residente atual em MB (via /proc, no Linux), ou None se indisponível."""
+    try:
+        with open("/proc/self/statm") as arquivo:
+            paginas = int(arquivo.read().split()[1])
+        return paginas * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _gerar_tarefas(quantidade, aleatorio):
+    """Tarefas sintéticas no formato que o controller entrega à view."""
+    tarefas = []
+    for i in range(quantidade):
+        tarefas.append({
+            "_id": f"{i:024x}",
+            "titulo": " ".join(aleatorio.choices(PALAVRAS, k=4)).capitalize() + f" {i}",
+            "descricao": " ".join(aleatorio.choices(PALAVRAS, k=25)),
+            "status": "Concluída" if aleatorio.random() < 0.5 else "Pendente",
+        })
+    return tarefas
+
+
+def _contar_widgets(widget):
+    """Quantidade de widgets vivos na árvore a partir do widget (inclusive)."""
+    return 1 + sum(_contar_widgets(filho) for filho in widget.winfo_children())
+
+
+class Medidor:
+    """Conduz a mainloop do Tk até uma condição e anota quando o primeiro card é vinculado."""
+    def __init__(self, view):
+        self.view = view
+        self.root = view.root
+        self.primeiro_card = None
+        self._lista_instrumentada = None
+
+    def _instrumentar(self):
+        """Registra o instante do primeiro card vinculado na lista virtual atual.
+
+        A lista é recriada por _recriar_interface, então a instrumentação é refeita quando muda.
+        """
+        lista = getattr(self.view, "lista_virtual", None)
+        if lista is None or lista is self._lista_instrumentada:
+            return
+        original = lista._vincular_indice
+
+        def vincular(indice):
+            original(indice)
+            if self.primeiro_card is None and lista._pool is not None and indice in lista._pool.por_indice:
+                self.primeiro_card = time.perf_counter()
+
+        lista._vincular_indice = vincular
+        self._lista_instrumentada = lista
+
+    def renderizado(self):
+        """Indica se não há renderização em lotes nem consulta do controller pendentes."""
+        return not self.view.lista_virtual.agendador.ocupado() and not self.view.controller.executor.ocupado()
+
+    def aguardar(self, condicao):
+        """Processa eventos do Tk até a condição ser verdadeira."""
+        limite = time.perf_counter() + LIMITE_ESPERA
+        while not condicao():
+            if time.perf_counter() > limite:
+                raise TimeoutError("a interface não terminou de renderizar a tempo")
+            self.root.update()
+            self._instrumentar()
+        self.root.update_idletasks()
+
+    def pausar(self, segundos):
+        """Mantém a mainloop girando pelo tempo informado (ex.: fim de animações)."""
+        fim = time.perf_counter() + segundos
+        self.aguardar(lambda: time.perf_counter() >= fim)
+
+    def medir(self, acao, condicao=None):
+        """Executa a ação e retorna (ms até o primeiro card, ms até o último card)."""
+        self._instrumentar()
+        self.primeiro_card = None
+        inicio = time.perf_counter()
+        acao()
+        self._instrumentar()  # a ação pode ter recriado a lista virtual
+        self.aguardar(condicao or self.renderizado)
+        fim = time.perf_counter()
+        primeiro = self.primeiro_card if self.primeiro_card is not None else fim
+        if self.view._animacoes_ativas():
+            self.pausar(PAUSA_ANIMACAO)
+        return (primeiro - inicio) * 1000, (fim - inicio) * 1000
+
+
+def _configurar_ambiente():
+    """Aplicação sem MongoDB, sem diário em disco e com o controller síncrono.
+
+    As variáveis são definidas antes de importar a view, que carrega o model e o controller.
+    """
+    os.environ["MONGO_URI"] = ""
+    os.environ["ARMAZENAMENTO_LOCAL"] = "memoria"
+    os.environ["DIARIO_OFFLINE_CAMINHO"] = ""
+    os.environ["MONITORAR_ALTERACOES"] = "false"
+    os.environ["ESCRITA_ADIADA"] = "false"
+    os.environ["MODO_ASSINCRONO"] = "false"
+
+
+def executar(tamanho):
+    """Mede a TarefaView com `tamanho` tarefas sintéticas."""
+    _configurar_ambiente()
+    from tkinter import Tk
+    from view.tarefa_view import TarefaView
+
+    tarefas = _gerar_tarefas(tamanho, random.Random(tamanho))
+    root = Tk()
+    view = TarefaView(root)
+    medidor = Medidor(view)
+    # A interface é construída em etapas pela mainloop
+    medidor.aguardar(lambda: view.interface_pronta and medidor.renderizado())
+    rss_inicial = _rss_atual_mb()
+    medidas = {}
+
+    # Primeira exibição: inclui a criação dos cards do pool
+    primeiro, ultimo = medidor.medir(lambda: view.exibir_tarefas(tarefas, total=tamanho))
+    medidas["exibir_tarefas_inicial"] = {"primeiro_card_ms": primeiro, "ultimo_card_ms": ultimo}
+
+    # Exibições seguintes: os cards já existem e só são re-vinculados
+    primeiros, ultimos = [], []
+    for i in range(REPETICOES):
+        lista = tarefas[i % 2:] if i % 2 else tarefas  # outra lista, para todos os cards mudarem
+        primeiro, ultimo = medidor.medir(lambda: view.exibir_tarefas(lista, total=len(lista)))
+        primeiros.append(primeiro)
+        ultimos.append(ultimo)
+    medidas["exibir_tarefas"] = {"primeiro_card": _resumir(primeiros), "ultimo_card": _resumir(ultimos)}
+    view.exibir_tarefas(tarefas, total=tamanho)
+    medidor.aguardar(medidor.renderizado)
+    widgets_lista = _contar_widgets(root)
+
+    latencias = []
+    for _ in range(2 * REPETICOES):
+        modo = view.modo_visualizacao
+        latencias.append(medidor.medir(
+            view._alternar_modo_visualizacao,
+            lambda: view.modo_visualizacao != modo and medidor.renderizado()
+        )[1])
+    medidas["alternar_modo_visualizacao"] = _resumir(latencias)
+    widgets_modos = _contar_widgets(root)  # pools dos dois modos materializados
+
+    latencias = [medidor.medir(view._recriar_interface)[1] for _ in range(REPETICOES)]
+    medidas["recriar_interface"] = _resumir(latencias)
+    widgets_recriada = _contar_widgets(root)
+
+    resultado = {
+        "medidas": medidas,
+        "widgets": {"lista": widgets_lista, "lista_e_grid": widgets_modos, "apos_recriar": widgets_recriada},
+        "rss_inicial_mb": rss_inicial,
+        "rss_final_mb": _rss_atual_mb(),
+        "rss_pico_mb": _pico_rss_mb(),
+    }
+    view._ao_fechar()
+    return resultado
+
+
+def _executar_em_processo(tamanho, ambiente):
+    """Roda uma quantidade de tarefas em um processo novo e retorna o resultado do JSON gravado."""
+    with tempfile.TemporaryDirectory() as pasta:
+        saida = os.path.join(pasta, "resultado.json")
+        comando = [sys.executable, os.path.abspath(__file__), "--executar", str(tamanho), "--saida-parcial", saida]
+        processo = subprocess.run(
+            comando, cwd=os.path.dirname(os.path.abspath(__file__)), env=ambiente, capture_output=True, text=True
+        )
+        if processo.returncode != 0 or not os.path.exists(saida):
+            return {"erro": (processo.stderr or processo.stdout).strip().splitlines()[-1:] or ["falha sem mensagem"]}
+        with open(saida, encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+
+def _relatorio_importacao(ambiente, modulo="view.tarefa_view"):
+    """Tempo de importação do módulo (e de cada dependência) medido com `python -X importtime`.
+
+    Retorna o total e os módulos de maior tempo acumulado, com a profundidade na árvore de
+    importação, e se o pymongo foi carregado (não deve ser, com a conexão em segundo plano).
+    """
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=ambiente, capture_output=True, text=True
+    )
+    modulos = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        modulos.append({
+            "modulo": nome.strip(),
+            "profundidade": (len(nome) - len(nome.lstrip()) - 1) // 2,
+            "proprio_ms": int(proprio) / 1000,
+            "acumulado_ms": int(acumulado) / 1000,
+        })
+    return {
+        "total_ms": sum(m["acumulado_ms"] for m in modulos if m["profundidade"] == 0),
+        "pymongo_carregado": any(m["modulo"] == "pymongo" for m in modulos),
+        "modulos": sorted(modulos, key=lambda m: -m["acumulado_ms"])[:MODULOS_IMPORTACAO],
+    }
+
+
+def _medir_abertura(ambiente):
+    """Abre o main.py e retorna os marcos da inicialização (ms desde a criação do processo)."""
+    with tempfile.TemporaryDirectory() as pasta:
+        metricas = os.path.join(pasta, "metricas.jsonl")
+        processo = subprocess.Popen(
+            [sys.executable, "main.py"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            env=dict(ambiente, ARQUIVO_METRICAS_INICIO=metricas), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            limite = time.perf_counter() + LIMITE_ESPERA
+            marcos = {}
+            while "primeira_lista_pintada" not in marcos:
+                if processo.poll() is not None or time.perf_counter() > limite:
+                    return None
+                time.sleep(0.05)
+                if os.path.exists(metricas):
+                    with open(metricas, encoding="utf-8") as arquivo:
+                        for linha in arquivo:
+                            registro = json.loads(linha)
+                            marcos[registro["evento"]] = registro["ms_desde_processo"] or registro["ms_desde_main"]
+            return marcos
+        finally:
+            processo.terminate()
+            processo.wait()
+
+
+def medir_inicializacao(ambiente, repeticoes=REPETICOES_INICIALIZACAO):
+    """Tempo até a janela visível e até a primeira lista pintada, e o relatório de importação."""
+    aberturas = [marcos for marcos in (_medir_abertura(ambiente) for _ in range(repeticoes)) if marcos]
+    resultado = {"importacao": _relatorio_importacao(ambiente)}
+    for evento in ("janela_visivel", "primeira_lista_pintada"):
+        amostras = [marcos[evento] for marcos in aberturas if marcos.get(evento) is not None]
+        if amostras:
+            resultado[evento] = _resumir(amostras)
+    return resultado
+
+
+def _iniciar_xvfb():
+    """Inicia um Xvfb em um display livre e retorna (processo, display)."""
+    executavel = shutil.which("Xvfb")
+    if executavel is None:
+        raise SystemExit("❌ Sem DISPLAY e sem Xvfb no PATH: instale o Xvfb ou execute em uma sessão gráfica")
+    numero = next(n for n in range(99, 200) if not os.path.exists(f"/tmp/.X11-unix/X{n}") and not os.path.exists(f"/tmp/.X{n}-lock"))
+    display = f":{numero}"
+    processo = subprocess.Popen(
+        [executavel, display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # Aguarda o socket do display aparecer
+    limite = time.perf_counter() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{numero}"):
+        if processo.poll() is not None or time.perf_counter() > limite:
+            processo.kill()
+            raise SystemExit(f"❌ Xvfb não iniciou no display {display}")
+        time.sleep(0.05)
+    return processo, display
+
+
+def _exibir(resultado):
+    """Mostra um resultado no console."""
+    titulo = f"{resultado['tarefas']} tarefas"
+    if "medidas" not in resultado:
+        print(f"⚠️ {titulo}: {resultado.get('erro')}")
+        return
+    medidas = resultado["medidas"]
+    rss = resultado.get("rss_pico_mb")
+    print(f"\n📊 {titulo} (pico de RSS: {f'{rss:.0f} MB' if rss is not None else 'n/d'})")
+    inicial = medidas["exibir_tarefas_inicial"]
+    print(f"  {'exibir_tarefas (inicial)':<28} primeiro card {inicial['primeiro_card_ms']:8.1f} ms   último card {inicial['ultimo_card_ms']:8.1f} ms")
+    exibir = medidas["exibir_tarefas"]
+    print(f"  {'exibir_tarefas':<28} primeiro card {exibir['primeiro_card']['p50_ms']:8.1f} ms   último card {exibir['ultimo_card']['p50_ms']:8.1f} ms (p50)")
+    for nome in ("alternar_modo_visualizacao", "recriar_interface"):
+        print(f"  {nome:<28} p50 {medidas[nome]['p50_ms']:8.1f} ms   p99 {medidas[nome]['p99_ms']:8.1f} ms")
+    widgets = resultado["widgets"]
+    print(f"  widgets: {widgets['lista']} (lista), {widgets['lista_e_grid']} (lista e grid), {widgets['apos_recriar']} (após recriar)")
+
+
+def _exibir_inicializacao(inicializacao):
+    """Mostra os tempos de inicialização e os módulos mais lentos de importar."""
+    print("\n🚀 Inicialização")
+    for evento in ("janela_visivel", "primeira_lista_pintada"):
+        if evento in inicializacao:
+            print(f"  {evento:<28} p50 {inicializacao[evento]['p50_ms']:8.1f} ms")
+    importacao = inicializacao["importacao"]
+    print(f"  {'importação da interface':<28}     {importacao['total_ms']:8.1f} ms"
+          f" (pymongo {'carregado' if importacao['pymongo_carregado'] else 'adiado'})")
+    for modulo in importacao["modulos"][:5]:
+        print(f"    {'  ' * modulo['profundidade']}{modulo['modulo']:<40} {modulo['acumulado_ms']:8.1f} ms")
+
+
+def _latencias(resultado):
+    """Latências comparáveis de um resultado, como {nome: ms}."""
+    medidas = resultado["medidas"]
+    return {
+        "exibir_tarefas_inicial.ultimo_card": medidas["exibir_tarefas_inicial"]["ultimo_card_ms"],
+        "exibir_tarefas.primeiro_card": medidas["exibir_tarefas"]["primeiro_card"]["p50_ms"],
+        "exibir_tarefas.ultimo_card": medidas["exibir_tarefas"]["ultimo_card"]["p50_ms"],
+        "alternar_modo_visualizacao": medidas["alternar_modo_visualizacao"]["p50_ms"],
+        "recriar_interface": medidas["recriar_interface"]["p50_ms"],
+    }
+
+
+def _comparar(atual, caminho_anterior, tolerancia):
+    """Compara as latências p50 com uma execução anterior e retorna as regressões acima da tolerância."""
+    with open(caminho_anterior, encoding="utf-8") as arquivo:
+        anterior = {r["tarefas"]: r for r in json.load(arquivo)["resultados"]}
+    with open(caminho_anterior, encoding="utf-8") as arquivo:
+        inicializacao_anterior = json.load(arquivo).get("inicializacao") or {}
+    print(f"\n=== Comparação com {caminho_anterior} (latência atual / anterior) ===")
+    regressoes = []
+    inicializacao = atual.get("inicializacao") or {}
+    for evento in ("janela_visivel", "primeira_lista_pintada"):
+        if evento in inicializacao and evento in inicializacao_anterior:
+            razao = inicializacao[evento]["p50_ms"] / inicializacao_anterior[evento]["p50_ms"]
+            print(f"  {'  ' if razao <= 1 + tolerancia else '🔻'} inicialização / {evento:<24} {razao:6.2f}x")
+            if razao > 1 + tolerancia:
+                regressoes.append(f"inicialização / {evento}: {razao:.2f}x")
+    for resultado in atual["resultados"]:
+        base = anterior.get(resultado["tarefas"])
+        if base is None or "medidas" not in base or "medidas" not in resultado:
+            continue
+        print(f"  {resultado['tarefas']} tarefas")
+        antes = _latencias(base)
+        for nome, ms in _latencias(resultado).items():
+            if not antes.get(nome):
+                continue
+            razao = ms / antes[nome]
+            marcador = "🔻" if razao > 1 + tolerancia else "🔺" if razao < 1 - tolerancia else "  "
+            print(f"    {marcador} {nome:<36} {razao:6.2f}x")
+            if razao > 1 + tolerancia:
+                regressoes.append(f"{resultado['tarefas']} tarefas / {nome}: {razao:.2f}x")
+        if resultado["widgets"]["apos_recriar"] > base["widgets"]["apos_recriar"]:
+            regressoes.append(f"{resultado['tarefas']} tarefas / widgets após recriar: "
+                              f"{base['widgets']['apos_recriar']} -> {resultado['widgets']['apos_recriar']}")
+    return regressoes
+
+
+def benchmark_interface(tamanhos, saida, comparar=None, tolerancia=0.25, inicializacao=True):
+    """Executa todos os tamanhos, grava o JSON e retorna as regressões em relação a uma execução anterior."""
+    print("=== Benchmark da Interface de Tarefas ===")
+    relatorio = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": [],
+    }
+    ambiente = dict(os.environ)
+    xvfb = None
+    try:
+        if not ambiente.get("DISPLAY"):
+            xvfb, ambiente["DISPLAY"] = _iniciar_xvfb()
+            print(f"🖥️ Xvfb no display {ambiente['DISPLAY']}")
+        if inicializacao:
+            print("⏳ Inicialização...")
+            relatorio["inicializacao"] = medir_inicializacao(ambiente)
+            _exibir_inicializacao(relatorio["inicializacao"])
+        for tamanho in tamanhos:
+            print(f"⏳ {tamanho} tarefas...")
+            resultado = {"tarefas": tamanho}
+            resultado.update(_executar_em_processo(tamanho, ambiente))
+            relatorio["resultados"].append(resultado)
+            _exibir(resultado)
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados gravados em {saida}")
+    regressoes = _comparar(relatorio, comparar, tolerancia) if comparar else []
+    for regressao in regressoes:
+        print(f"❌ Regressão: {regressao}")
+    return relatorio, regressoes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark da renderização da TarefaView por quantidade de tarefas")
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=list(TAMANHOS_PADRAO))
+    parser.add_argument("--saida", default=f"benchmark_interface_{datetime.now():%Y%m%d_%H%M%S}.json")
+    parser.add_argument("--comparar", metavar="JSON", help="resultado anterior; regressões encerram com código 1")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="piora relativa aceita nas latências p50 (padrão: 0.25)")
+    parser.add_argument("--sem-inicializacao", action="store_true", help="não mede a abertura do main.py")
+    # Uso interno: execução de um tamanho no processo filho
+    parser.add_argument("--executar", type=int, metavar="TAMANHO", help=argparse.SUPPRESS)
+    parser.add_argument("--saida-parcial", help=argparse.SUPPRESS)
+    argumentos = parser.parse_args()
+
+    if argumentos.executar is not None:
+        resultado = executar(argumentos.executar)
+        with open(argumentos.saida_parcial, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo)
+    else:
+        _, regressoes = benchmark_interface(
+            argumentos.tamanhos, argumentos.saida, argumentos.comparar, argumentos.tolerancia,
+            not argumentos.sem_inicializacao
+        )
+        sys.exit(1 if regressoes else 0)
@@ -0,0 +1,153 @@
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import time
+
+from utils.rastreamento import rastreador
+
+# Intervalos (ms) de verificação da fila de resultados na thread do Tk
+INTERVALO_OCUPADO_MS = 15
+INTERVALO_OCIOSO_MS = 100
+
+
+class ExecutorTarefas:
+    """Executa as chamadas ao model em uma thread de trabalho e entrega os resultados na thread do Tk.
+
+    Os resultados voltam por uma fila thread-safe consumida via root.after, então os
+    callbacks sempre rodam na mainloop. Uma única thread de trabalho garante que as
+    operações sejam aplicadas (e seus resultados entregues) na ordem em que foram submetidas.
+    """
+    def __init__(self, root):
+        self.root = root
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tarefas-io")
+        self._fila = queue.SimpleQueue()
+        self._geracoes = {}  # chave -> geração da submissão mais recente
+        self._futuros = {}   # chave -> future da submissão mais recente
+        self._em_andamento = 0
+        self._encerrado = False
+        self.ao_mudar_ocupado = None
+        self._id_after = self.root.after(INTERVALO_OCIOSO_MS, self._processar_fila)
+
+    def submeter(self, funcao, *args, ao_concluir=None, ao_falhar=None, chave=None):
+        """Agenda funcao(*args) na thread de trabalho.
+
+        Com uma chave, uma nova submissão substitui a anterior de mesma chave: se ela ainda
+        não começou é cancelada, e se já estiver em execução seu resultado é descartado.
+        """
+        geracao = None
+        if chave is not None:
+            geracao = self._geracoes.get(chave, 0) + 1
+            self._geracoes[chave] = geracao
+            anterior = self._futuros.get(chave)
+            if anterior is not None and anterior.cancel():
+                self._alterar_em_andamento(-1)
+        if rastreador is not None:
+            ao_concluir, ao_falhar = _rastrear_entrega(funcao, ao_concluir, ao_falhar)
+
+        def executar():
+            try:
+                resultado = funcao(*args)
+            except Exception as erro:
+                self._fila.put(("resultado", chave, geracao, ao_falhar, erro))
+            else:
+                self._fila.put(("resultado", chave, geracao, ao_concluir, resultado))
+
+        self._alterar_em_andamento(1)
+        futuro = self._pool.submit(executar)
+        if chave is not None:
+            self._futuros[chave] = futuro
+        return futuro
+
+    def publicar(self, callback, *args):
+        """Agenda um callback para a thread do Tk; pode ser chamado de qualquer thread."""
+        self._fila.put(("publicacao", None, None, callback, args))
+
+    def ocupado(self):
+        """Indica se há operações submetidas ainda sem resultado entregue."""
+        return self._em_andamento > 0
+
+    def encerrar(self):
+        """Interrompe a verificação da fila e libera a thread de trabalho."""
+        self._encerrado = True
+        try:
+            self.root.after_cancel(self._id_after)
+        except Exception:
+            pass  # A janela já foi destruída
+        self._pool.shutdown(wait=False)
+
+    def _alterar_em_andamento(self, delta):
+        """Atualiza o contador de operações pendentes e avisa quando o estado ocupado muda."""
+        estava_ocupado = self.ocupado()
+        self._em_andamento += delta
+        if self.ocupado() != estava_ocupado and self.ao_mudar_ocupado is not None:
+            self.ao_mudar_ocupado(self.ocupado())
+
+    def _processar_fila(self):
+        """Entrega na thread do Tk os resultados prontos e reagenda a própria verificação."""
+        if self._encerrado:
+            return
+        try:
+            while True:
+                try:
+                    tipo, chave, geracao, callback, valor = self._fila.get_nowait()
+                except queue.Empty:
+                    break
+                if tipo == "publicacao":
+                    callback(*valor)
+                    continue
+                self._alterar_em_andamento(-1)
+                if chave is not None and geracao != self._geracoes.get(chave):
+                    continue  # Resultado substituído por uma submissão mais recente
+                if chave is not None:
+                    self._futuros.pop(chave, None)
+                if callback is not None:
+                    callback(valor)
+        finally:
+            # Um erro em um callback não pode interromper a entrega dos próximos resultados
+            intervalo = INTERVALO_OCUPADO_MS if self.ocupado() else INTERVALO_OCIOSO_MS
+            self._id_after = self.root.after(intervalo, self._processar_fila)
+
+
+def _rastrear_entrega(funcao, *callbacks):
+    """Envolve os callbacks para registrar o trecho da submissão até a entrega do resultado na thread do Tk."""
+    inicio = time.perf_counter()
+    nome = f"executor.{getattr(funcao, '__name__', 'tarefa')}"
+
+    def envolver(callback):
+        def entregar(valor):
+            try:
+                if callback is not None:
+                    callback(valor)
+            finally:
+                rastreador.registrar(nome, "executor", inicio, time.perf_counter() - inicio, assincrono=True)
+        return entregar
+    return [envolver(callback) for callback in callbacks]
+
+
+class ExecutorSincrono:
+    """Mesma interface do ExecutorTarefas, mas executa tudo imediatamente na thread atual."""
+    def __init__(self):
+        self.ao_mudar_ocupado = None
+
+    def submeter(self, funcao, *args, ao_concluir=None, ao_falhar=None, chave=None):
+        """Executa funcao(*args) e chama o callback correspondente ao resultado."""
+        try:
+            resultado = funcao(*args)
+        except Exception as erro:
+            if ao_falhar is None:
+                raise
+            ao_falhar(erro)
+        else:
+            if ao_concluir is not None:
+                ao_concluir(resultado)
+
+    def publicar(self, callback, *args):
+        """Executa o callback imediatamente."""
+        callback(*args)
+
+    def ocupado(self):
+        """Nunca há operações pendentes no modo síncrono."""
+        return False
+
+    def encerrar(self):
+        """Nada a liberar no modo síncrono."""
+        pass
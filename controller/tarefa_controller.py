@@ -1,28 +1,209 @@
-from model.tarefa_model import TarefaModel
+from model.tarefa_model import TarefaModel, TAMANHO_PAGINA, LIMITE_BUSCA
+from controller.executor import ExecutorTarefas, ExecutorSincrono
+from utils.rastreamento import rastrear
 from tkinter import messagebox
+import os
 
 class TarefaController:
-    def __init__(self, view):
-        """Inicializa o controller com a view e o model."""
+    def __init__(self, view, assincrono=None):
+        """Inicializa o controller com a view e o model.
+
+        No modo assíncrono (padrão, controlado por MODO_ASSINCRONO no .env) todo acesso ao
+        model roda em uma thread de trabalho e a mainloop do Tk nunca fica bloqueada.
+        """
         self.model = TarefaModel()
         self.view = view
         self.id_tarefa_selecionada = None
+        self.filtro_status = None
+        self.texto_busca = ""  # com texto, a lista exibe o resultado da busca (sem paginação)
+        self.cursor_proxima_pagina = None  # None quando todas as páginas do filtro foram carregadas
+        self.versao_exibida = None  # versão (ETag) do model que corresponde à lista exibida
+        self.versao_resumo = None  # versão do model que corresponde às contagens exibidas no resumo
+        self._carregando_pagina = False
+        if assincrono is None:
+            assincrono = os.getenv('MODO_ASSINCRONO', 'true').lower() in ('1', 'true', 'sim')
+        self.executor = ExecutorTarefas(view.root) if assincrono else ExecutorSincrono()
+        self.executor.ao_mudar_ocupado = getattr(view, 'definir_ocupado', None)
+        # A conexão com o MongoDB termina em segundo plano; a lista é recarregada na thread do Tk
+        self.model.ao_trocar_armazenamento = lambda: self.executor.publicar(self._recarregar)
+        # Alterações feitas por outros clientes chegam pelo monitor do model e são aplicadas aos poucos
+        self.model.ao_alterar_tarefas = lambda eventos: self.executor.publicar(self._aplicar_alteracoes, eventos)
+
+    def encerrar(self):
+        """Libera a thread de trabalho e o armazenamento local ao fechar a aplicação.
+
+        O fechamento do model entra na fila depois das escritas pendentes, que são concluídas
+        antes de o processo terminar.
+        """
+        self.executor.submeter(self.model.encerrar)
+        self.executor.encerrar()
+
+    def _exibir_erro(self, erro):
+        """Informa ao usuário uma falha ocorrida no acesso aos dados."""
+        messagebox.showerror("Erro", f"Não foi possível concluir a operação:\n{erro}")
 
+    @rastrear("controller")
     def carregar_tarefas(self, filtro_status=None):
-        """Carrega as tarefas do model e envia para a view exibir."""
-        tarefas = self.model.listar(filtro_status)
-        self.view.exibir_tarefas(tarefas)
+        """Carrega a primeira página de tarefas do model e envia para a view exibir.
+
+        Se o filtro é o exibido e nada mudou no model desde a última listagem, a lista (e as
+        páginas já carregadas) é mantida sem consultar as tarefas nem redesenhar. Com uma
+        busca ativa, o filtro é aplicado ao resultado da busca.
+        """
+        if self.texto_busca:
+            self.filtro_status = filtro_status
+            self.buscar_tarefas(self.texto_busca)
+            return
+        versao = self.versao_exibida if filtro_status == self.filtro_status else None
+        self.filtro_status = filtro_status
+        if versao is None:
+            self.cursor_proxima_pagina = None
+        self._carregando_pagina = True
+
+        def concluir(pagina):
+            self._carregando_pagina = False
+            if pagina is None:
+                return
+            self.cursor_proxima_pagina = pagina["proximo_cursor"]
+            self.versao_exibida = pagina["versao"]
+            self.view.exibir_tarefas(pagina["tarefas"], total=pagina["total"])
+            self.atualizar_resumo()
+
+        # Filtros repetidos substituem a listagem (ou página) anterior ainda em andamento
+        self.executor.submeter(
+            self.model.listar_pagina, filtro_status, TAMANHO_PAGINA, None, True, True, versao,
+            ao_concluir=concluir, ao_falhar=self._falha_pagina, chave="listar"
+        )
+
+    @rastrear("controller")
+    def buscar_tarefas(self, texto):
+        """Exibe as tarefas que correspondem ao texto no filtro atual; texto vazio volta à lista."""
+        self.texto_busca = texto.strip()
+        if not self.texto_busca:
+            self._recarregar()
+            return
+        self.cursor_proxima_pagina = None
+        self.versao_exibida = None
+        self._carregando_pagina = True
+
+        def concluir(tarefas):
+            self._carregando_pagina = False
+            self.view.exibir_tarefas(tarefas)
+
+        # Cada tecla substitui a busca anterior ainda não concluída
+        self.executor.submeter(
+            self.model.buscar, self.texto_busca, self.filtro_status, LIMITE_BUSCA, True,
+            ao_concluir=concluir, ao_falhar=self._falha_pagina, chave="listar"
+        )
+
+    @rastrear("controller")
+    def preparar_busca(self):
+        """Prepara o índice de busca em segundo plano (ao focar o campo de busca)."""
+        self.executor.submeter(self.model.preparar_busca, ao_falhar=self._exibir_erro, chave="preparar_busca")
+
+    @rastrear("controller")
+    def carregar_mais_tarefas(self):
+        """Carrega a próxima página do filtro atual, se houver, e a acrescenta à view."""
+        if self._carregando_pagina or self.cursor_proxima_pagina is None:
+            return
+        self._carregando_pagina = True
+
+        def concluir(pagina):
+            self._carregando_pagina = False
+            self.cursor_proxima_pagina = pagina["proximo_cursor"]
+            self.view.acrescentar_tarefas(pagina["tarefas"])
+
+        self.executor.submeter(
+            self.model.listar_pagina, self.filtro_status, TAMANHO_PAGINA, self.cursor_proxima_pagina, False, True,
+            ao_concluir=concluir, ao_falhar=self._falha_pagina, chave="listar"
+        )
+
+    @rastrear("controller")
+    def atualizar_resumo(self):
+        """Atualiza o painel de resumo com as contagens por status, se mudaram desde a última exibição.
+
+        As contagens vêm do model sem listar as tarefas; chamado depois de cada alteração.
+        """
+        def concluir(contagem):
+            if contagem is None:
+                return
+            self.versao_resumo = contagem["versao"]
+            self.view.exibir_resumo(contagem)
+
+        def falhar(erro):
+            # O resumo é informativo: a falha não interrompe o uso com uma mensagem
+            print(f"Não foi possível atualizar o resumo das tarefas: {erro}")
+
+        # Várias alterações seguidas: só a última contagem é feita
+        self.executor.submeter(
+            self.model.contar_por_status, self.versao_resumo, ao_concluir=concluir, ao_falhar=falhar, chave="resumo"
+        )
+
+    def _falha_pagina(self, erro):
+        """Libera novas tentativas de paginação após uma falha na listagem."""
+        self._carregando_pagina = False
+        self._exibir_erro(erro)
+
+    def _corresponde_ao_filtro(self, status):
+        """Indica se uma tarefa com o status informado aparece no filtro atual."""
+        return self.filtro_status is None or status == self.filtro_status
+
+    def _recarregar(self):
+        """Recarrega a lista inteira; usado quando a atualização incremental não é possível."""
+        self.versao_exibida = None
+        self.carregar_tarefas(self.filtro_status)
+
+    def _exibir_tarefa_gravada(self, tarefa):
+        """Atualiza o card da tarefa ou a acrescenta à lista, se ela pertencer ao filtro atual.
+
+        Uma tarefa nova (maior _id) só é acrescentada se todas as páginas já foram carregadas;
+        caso contrário ela chegará com a última página. Durante uma busca, só as tarefas do
+        resultado são atualizadas.
+        """
+        lista_completa = self.cursor_proxima_pagina is None and not self._carregando_pagina and not self.texto_busca
+        if not self._corresponde_ao_filtro(tarefa["status"]):
+            self.view.remover_tarefa_exibida(tarefa["_id"])
+        elif not self.view.atualizar_tarefa_exibida(tarefa) and lista_completa:
+            self.view.inserir_tarefa(tarefa)
 
+    @rastrear("controller")
+    def _aplicar_alteracoes(self, eventos):
+        """Aplica na view as alterações recebidas do MongoDB, sem recarregar a lista.
+
+        As tarefas que saem da lista (excluídas ou fora do filtro) são removidas juntas, ao
+        final, para que um lote grande de alterações não reposicione a lista a cada uma.
+        """
+        remover = set()
+        for tipo, dado in eventos:
+            if tipo == "excluida":
+                remover.add(str(dado))
+            elif self._corresponde_ao_filtro(dado["status"]):
+                remover.discard(str(dado["_id"]))
+                self._exibir_tarefa_gravada(dado)
+            else:
+                remover.add(str(dado["_id"]))
+        if remover:
+            self.view.remover_tarefas_exibidas(remover)
+        self.atualizar_resumo()
+
+    @rastrear("controller")
     def adicionar_tarefa(self, titulo, descricao, status):
         """Adiciona uma nova tarefa usando o model e atualiza a view."""
         if not titulo:
             messagebox.showwarning("Aviso", "O título da tarefa não pode estar vazio.")
             return
-        self.model.adicionar(titulo, descricao, status)
-        self.carregar_tarefas()
-        self.view.limpar_campos()
-        messagebox.showinfo("Sucesso", "Tarefa adicionada com sucesso!")
 
+        def concluir(resultado):
+            # Monta a tarefa localmente: a inserção é o único acesso ao banco (a notificação da
+            # mesma inserção pode chegar antes e já ter criado o card)
+            self._exibir_tarefa_gravada({"_id": resultado.inserted_id, "titulo": titulo, "descricao": descricao, "status": status})
+            self.atualizar_resumo()
+            self.view.limpar_campos()
+            messagebox.showinfo("Sucesso", "Tarefa adicionada com sucesso!")
+
+        self.executor.submeter(self.model.adicionar, titulo, descricao, status, ao_concluir=concluir, ao_falhar=self._exibir_erro)
+
+    @rastrear("controller")
     def atualizar_tarefa(self, id_tarefa, titulo, descricao, status):
         """Atualiza uma tarefa existente pelo id usando o model e atualiza a view."""
         if not id_tarefa:
@@ -31,12 +212,24 @@ class TarefaController:
         if not titulo:
             messagebox.showwarning("Aviso", "O título da tarefa não pode estar vazio.")
             return
-        self.model.atualizar(id_tarefa, titulo, descricao, status)
-        self.carregar_tarefas()
-        self.view.limpar_campos()
-        self.id_tarefa_selecionada = None
-        messagebox.showinfo("Sucesso", "Tarefa atualizada com sucesso!")
 
+        def concluir(resultado):
+            if resultado.matched_count == 0:
+                self._recarregar()
+            elif self._corresponde_ao_filtro(status):
+                tarefa = {"_id": id_tarefa, "titulo": titulo, "descricao": descricao, "status": status}
+                if not self.view.atualizar_tarefa_exibida(tarefa):
+                    self._recarregar()
+            elif not self.view.remover_tarefa_exibida(id_tarefa):
+                self._recarregar()
+            self.atualizar_resumo()
+            self.view.limpar_campos()
+            self.id_tarefa_selecionada = None
+            messagebox.showinfo("Sucesso", "Tarefa atualizada com sucesso!")
+
+        self.executor.submeter(self.model.atualizar, id_tarefa, titulo, descricao, status, ao_concluir=concluir, ao_falhar=self._exibir_erro)
+
+    @rastrear("controller")
     def excluir_tarefa(self, id_tarefa):
         """Exclui uma tarefa pelo id usando o model e atualiza a view."""
         if not id_tarefa:
@@ -44,19 +237,85 @@ class TarefaController:
             return
         confirmar = messagebox.askyesno("Confirmar Exclusão", "Deseja realmente excluir esta tarefa?")
         if confirmar:
-            self.model.excluir(id_tarefa)
-            self.carregar_tarefas()
-            self.view.limpar_campos()
-            self.id_tarefa_selecionada = None
-            messagebox.showinfo("Sucesso", "Tarefa excluída com sucesso!")
+            def concluir(resultado):
+                if resultado.deleted_count == 0 or not self.view.remover_tarefa_exibida(id_tarefa):
+                    self._recarregar()
+                self.atualizar_resumo()
+                self.view.limpar_campos()
+                self.id_tarefa_selecionada = None
+                messagebox.showinfo("Sucesso", "Tarefa excluída com sucesso!")
+
+            self.executor.submeter(self.model.excluir, id_tarefa, ao_concluir=concluir, ao_falhar=self._exibir_erro)
 
+    @rastrear("controller")
+    def alterar_status_tarefas(self, status, ids=None):
+        """Muda o status das tarefas marcadas (ou, sem ids, de todas as do filtro atual) de uma vez.
+
+        O model aplica a alteração em uma única operação e a view é atualizada uma única vez: os
+        cards que continuam no filtro mudam de status e os demais saem da lista. Na alteração
+        por filtro feita no servidor o model não informa os ids, e a lista é recarregada.
+        """
+        if ids is not None and not ids:
+            messagebox.showwarning("Aviso", "Nenhuma tarefa marcada.")
+            return
+
+        def concluir(resultado):
+            if resultado.ids is None:
+                self._recarregar()
+            elif self._corresponde_ao_filtro(status):
+                self.view.atualizar_status_exibidas(resultado.ids, status)
+            else:
+                self.view.remover_tarefas_exibidas(resultado.ids)
+            self.atualizar_resumo()
+            self.view.limpar_marcacao()
+            messagebox.showinfo("Sucesso", f"{resultado.modified_count} tarefa(s) marcada(s) como {status}.")
+
+        self.executor.submeter(
+            self.model.atualizar_status_muitos, status, ids, self.filtro_status,
+            ao_concluir=concluir, ao_falhar=self._exibir_erro
+        )
+
+    @rastrear("controller")
+    def excluir_tarefas(self, ids=None):
+        """Exclui as tarefas marcadas (ou, sem ids, todas as do filtro atual) de uma vez."""
+        if ids is not None and not ids:
+            messagebox.showwarning("Aviso", "Nenhuma tarefa marcada.")
+            return
+        alvo = f"{len(ids)} tarefa(s)" if ids is not None else "todas as tarefas do filtro atual"
+        if not messagebox.askyesno("Confirmar Exclusão", f"Deseja realmente excluir {alvo}?"):
+            return
+
+        def concluir(resultado):
+            if resultado.ids is None:
+                self._recarregar()
+            else:
+                self.view.remover_tarefas_exibidas(resultado.ids)
+            self.atualizar_resumo()
+            if resultado.ids is None or self.id_tarefa_selecionada in resultado.ids:
+                self.view.limpar_campos()
+                self.id_tarefa_selecionada = None
+            self.view.limpar_marcacao()
+            messagebox.showinfo("Sucesso", f"{resultado.deleted_count} tarefa(s) excluída(s) com sucesso!")
+
+        self.executor.submeter(
+            self.model.excluir_muitos, ids, self.filtro_status, ao_concluir=concluir, ao_falhar=self._exibir_erro
+        )
+
+    @rastrear("controller")
     def aplicar_filtro(self, filtro_status):
         """Aplica filtro de status nas tarefas."""
         self.carregar_tarefas(filtro_status)
 
+    @rastrear("controller")
     def selecionar_tarefa(self, id_tarefa):
-        """Seleciona uma tarefa pelo id e preenche os campos na view."""
-        tarefa = self.model.buscar_por_id(id_tarefa)
-        if tarefa:
-            self.id_tarefa_selecionada = id_tarefa
-            self.view.preencher_campos(tarefa)
+        """Seleciona uma tarefa pelo id e preenche os campos na view.
+
+        A lista traz apenas resumos; o documento completo (descrição inteira) é buscado aqui.
+        """
+        def concluir(tarefa):
+            if tarefa:
+                self.id_tarefa_selecionada = id_tarefa
+                self.view.preencher_campos(tarefa)
+
+        # Cliques rápidos em vários cards: só a última seleção é aplicada
+        self.executor.submeter(self.model.buscar_por_id, id_tarefa, ao_concluir=concluir, ao_falhar=self._exibir_erro, chave="buscar")
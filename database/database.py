@@ -1,40 +1,266 @@
 import os
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure
+import sys
+import threading
+import time
 from dotenv import load_dotenv
 
 # Carrega as variáveis de ambiente do arquivo .env
 load_dotenv()
 
+# O pymongo (e o bson) só é importado na thread de conexão, quando há um MONGO_URI configurado:
+# a janela abre sem esperar por ele e, sem MongoDB, ele nunca é carregado.
+
+
+def erros_conexao():
+    """Exceção ConnectionFailure do pymongo, para usar em cláusulas except.
+
+    Enquanto o pymongo não foi importado retorna () (não captura nada): sem ele carregado,
+    nenhuma falha de conexão pode ter ocorrido.
+    """
+    return getattr(sys.modules.get('pymongo.errors'), 'ConnectionFailure', ())
+
+
+def _lista(valor):
+    return [item.strip() for item in valor.split(',') if item.strip()]
+
+
+# Variáveis do .env -> opções do MongoClient; as vazias ficam com o padrão do pymongo
+OPCOES_CLIENTE = {
+    'MONGO_POOL_MAX': ('maxPoolSize', int),
+    'MONGO_POOL_MIN': ('minPoolSize', int),
+    'MONGO_POOL_MAX_OCIOSO_MS': ('maxIdleTimeMS', int),
+    'MONGO_ESPERA_POOL_MS': ('waitQueueTimeoutMS', int),
+    'MONGO_COMPRESSORES': ('compressors', _lista),
+    'MONGO_PREFERENCIA_LEITURA': ('readPreference', str),
+    'MONGO_TIMEOUT_MS': ('serverSelectionTimeoutMS', int),
+    'MONGO_TIMEOUT_CONEXAO_MS': ('connectTimeoutMS', int),
+    'MONGO_TIMEOUT_SOCKET_MS': ('socketTimeoutMS', int),
+    'MONGO_HEARTBEAT_MS': ('heartbeatFrequencyMS', int),
+}
+PADROES_OPCOES = {'MONGO_TIMEOUT_MS': '5000'}  # timeout reduzido para falhar mais rápido
+
+
+def opcoes_cliente():
+    """Opções do MongoClient configuradas no .env (ver OPCOES_CLIENTE)."""
+    opcoes = {}
+    for variavel, (opcao, converter) in OPCOES_CLIENTE.items():
+        valor = os.getenv(variavel, PADROES_OPCOES.get(variavel, '')).strip()
+        if valor:
+            opcoes[opcao] = converter(valor)
+    return opcoes
+
+
+class GerenciadorConexao:
+    """Dono do único MongoClient (com seu pool de conexões) usado pelo processo para um MONGO_URI.
+
+    A conexão é estabelecida em segundo plano: o construtor retorna imediatamente e os
+    ouvintes registrados são avisados quando o ping ao servidor for bem-sucedido. Enquanto o
+    servidor não responde, e depois de marcar_desconectado(), novas tentativas são feitas a
+    cada MONGO_INTERVALO_RECONEXAO_S segundos com o mesmo cliente; os ouvintes são avisados a
+    cada reconexão. Use obter_gerenciador() em vez de criar instâncias diretamente.
+    """
+    def __init__(self, mongo_uri):
+        self.mongo_uri = mongo_uri
+        self.opcoes = opcoes_cliente()
+        self.intervalo_reconexao_s = float(os.getenv('MONGO_INTERVALO_RECONEXAO_S', '10'))
+
+        self.cliente = None
+        self.conectado = False
+        self._estatisticas = None  # EstatisticasConexao, criada junto com o cliente
+        self._ouvintes = []
+        self._trava = threading.Lock()
+        self._tentativa_concluida = threading.Event()
+        self._reconectando = False
+
+        if not self.mongo_uri:
+            # MONGO_URI vazio: a aplicação usa apenas o armazenamento local
+            print("MONGO_URI não configurado. A aplicação funcionará sem persistência de dados.")
+            self._tentativa_concluida.set()
+            return
+
+        self._iniciar_tentativas()
+
+    def _iniciar_tentativas(self):
+        """Dispara a thread que tenta conectar até o servidor responder."""
+        with self._trava:
+            if self._reconectando:
+                return
+            self._reconectando = True
+        threading.Thread(target=self._conectar, name="mongo-conexao", daemon=True).start()
+
+    def _conectar(self):
+        """Testa a conexão em segundo plano, repetindo até conseguir, e avisa os ouvintes."""
+        from pymongo import MongoClient
+        from pymongo.errors import ServerSelectionTimeoutError, ConnectionFailure, ConfigurationError
+        from database.monitoramento import EstatisticasConexao, criar_ouvintes
+        while True:
+            try:
+                if self.cliente is None:
+                    estatisticas = EstatisticasConexao()
+                    self.cliente = MongoClient(self.mongo_uri, event_listeners=criar_ouvintes(estatisticas), **self.opcoes)
+                    self._estatisticas = estatisticas
+                # Testa a conexão
+                self.cliente.admin.command('ping')
+                break
+            except ConfigurationError as e:
+                # URI ou opções inválidas: novas tentativas não adiantam
+                print(f"Erro ao conectar com MongoDB: {e}")
+                print("A aplicação funcionará sem persistência de dados.")
+                with self._trava:
+                    self._reconectando = False
+                self._tentativa_concluida.set()
+                return
+            except (ServerSelectionTimeoutError, ConnectionFailure) as e:
+                print(f"Erro ao conectar com MongoDB: {e}")
+                print(f"A aplicação seguirá com o armazenamento local; nova tentativa em {self.intervalo_reconexao_s:g} s.")
+                self._tentativa_concluida.set()
+                time.sleep(self.intervalo_reconexao_s)
+
+        with self._trava:
+            self.conectado = True
+            self._reconectando = False
+            ouvintes = list(self._ouvintes)
+        print("Conectado ao MongoDB.")
+        try:
+            for ouvinte in ouvintes:
+                self._avisar(ouvinte)
+        finally:
+            self._tentativa_concluida.set()
+
+    def _avisar(self, ouvinte):
+        """Chama o ouvinte com o cliente; uma falha nele não interrompe os demais nem a conexão."""
+        try:
+            ouvinte(self.cliente)
+        except Exception as e:
+            print(f"Erro ao ativar o MongoDB em um ouvinte da conexão: {e!r}")
+
+    def marcar_desconectado(self):
+        """Registra que o servidor deixou de responder e volta a tentar a conexão em segundo plano.
+
+        Com vários models no mesmo cliente, só o primeiro aviso dispara a reconexão.
+        """
+        with self._trava:
+            if not self.conectado:
+                return
+            self.conectado = False
+        print("Conexão com o MongoDB perdida; tentando reconectar em segundo plano.")
+        self._iniciar_tentativas()
+
+    def adicionar_ouvinte(self, ouvinte):
+        """Registra um callback(cliente) chamado a cada vez que a conexão for estabelecida.
+
+        O callback roda na thread de conexão; se a conexão já existir, é chamado logo em uma
+        thread própria, nunca na de quem registrou (ex.: a da interface), pois a ativação do
+        MongoDB reproduz o diário e sincroniza a réplica.
+        """
+        with self._trava:
+            conectado = self.conectado
+            self._ouvintes.append(ouvinte)
+        if conectado:
+            threading.Thread(target=self._avisar, args=(ouvinte,), name="mongo-ouvinte", daemon=True).start()
+
+    def remover_ouvinte(self, ouvinte):
+        """Deixa de avisar o callback nas próximas conexões."""
+        with self._trava:
+            if ouvinte in self._ouvintes:
+                self._ouvintes.remove(ouvinte)
+
+    def aguardar_conexao(self, timeout=None):
+        """Bloqueia até a tentativa de conexão terminar e retorna se ela foi bem-sucedida."""
+        self._tentativa_concluida.wait(timeout)
+        return self.conectado
+
+    def estatisticas(self):
+        """Estado da conexão, opções do cliente e contadores do pool de conexões e do heartbeat.
+
+        Os contadores só existem depois que o cliente foi criado (ver database.monitoramento).
+        """
+        estatisticas = {"conectado": self.conectado, "opcoes": dict(self.opcoes), "ouvintes": len(self._ouvintes)}
+        if self._estatisticas is not None:
+            estatisticas.update(self._estatisticas.resumo())
+        return estatisticas
+
+
+_gerenciadores = {}
+_trava_gerenciadores = threading.Lock()
+
+
+def obter_gerenciador(mongo_uri=None):
+    """Gerenciador de conexão compartilhado do processo para o MONGO_URI (o do .env por padrão)."""
+    if mongo_uri is None:
+        mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
+    with _trava_gerenciadores:
+        gerenciador = _gerenciadores.get(mongo_uri)
+        if gerenciador is None:
+            gerenciador = _gerenciadores[mongo_uri] = GerenciadorConexao(mongo_uri)
+        return gerenciador
+
+
 class MongoContext:
-    """Inicializa a conexão com o banco de dados MongoDB e define a coleção de tarefas."""
+    """Acesso de um model à sua coleção de tarefas pelo cliente compartilhado do processo.
+
+    Todos os MongoContext (e os workers em segundo plano que usam suas coleções) compartilham
+    o MongoClient e o pool de conexões do GerenciadorConexao do mesmo MONGO_URI; cada um só
+    escolhe o banco e a coleção.
+    """
     def __init__(self):
         # Obtém configurações do ambiente ou usa valores padrão
         self.mongo_uri = os.getenv('MONGO_URI', 'mongodb://localhost:27017/')
         self.database_name = os.getenv('MONGO_DATABASE', 'gerenciador_tarefas_db')
         self.collection_name = os.getenv('MONGO_COLLECTION', 'tarefas')
-        
-        try:
-            # Inicializa a conexão com timeout reduzido para falhar mais rápido
-            self.cliente = MongoClient(self.mongo_uri, serverSelectionTimeoutMS=5000)
-            # Testa a conexão
-            self.cliente.admin.command('ping')
-            self.bd = self.cliente[self.database_name]
-            self.colecao = self.bd[self.collection_name]
-            self.connected = True
-            print(f"Conectado ao MongoDB: {self.database_name}")
-        except (ServerSelectionTimeoutError, ConnectionFailure) as e:
-            print(f"Erro ao conectar com MongoDB: {e}")
-            print("A aplicação funcionará sem persistência de dados.")
-            self.cliente = None
-            self.bd = None
-            self.colecao = None
-            self.connected = False
+        self.gerenciador = obter_gerenciador(self.mongo_uri)
+        self._ouvintes = {}  # callback(colecao) -> callback(cliente) registrado no gerenciador
+
+    @property
+    def cliente(self):
+        return self.gerenciador.cliente
+
+    @property
+    def bd(self):
+        cliente = self.gerenciador.cliente
+        return cliente[self.database_name] if cliente is not None else None
+
+    @property
+    def colecao(self):
+        bd = self.bd
+        return bd[self.collection_name] if bd is not None else None
+
+    @property
+    def connected(self):
+        return self.gerenciador.conectado
+
+    def marcar_desconectado(self):
+        """Registra que o servidor deixou de responder (ver GerenciadorConexao.marcar_desconectado)."""
+        self.gerenciador.marcar_desconectado()
+
+    def adicionar_ouvinte_conexao(self, ouvinte):
+        """Registra um callback(colecao) chamado a cada vez que a conexão for estabelecida.
+
+        O callback roda em segundo plano (ver GerenciadorConexao.adicionar_ouvinte).
+        """
+        def ao_conectar(cliente):
+            ouvinte(cliente[self.database_name][self.collection_name])
+        self._ouvintes[ouvinte] = ao_conectar
+        self.gerenciador.adicionar_ouvinte(ao_conectar)
+
+    def aguardar_conexao(self, timeout=None):
+        """Bloqueia até a tentativa de conexão terminar e retorna se ela foi bem-sucedida."""
+        return self.gerenciador.aguardar_conexao(timeout)
+
+    def estatisticas(self):
+        """Estatísticas do cliente compartilhado (ver GerenciadorConexao.estatisticas)."""
+        return self.gerenciador.estatisticas()
+
+    def encerrar(self):
+        """Remove os ouvintes deste contexto; o cliente compartilhado continua aberto."""
+        for ao_conectar in self._ouvintes.values():
+            self.gerenciador.remover_ouvinte(ao_conectar)
+        self._ouvintes.clear()
 
     def get_colecao(self):
         """Retorna a coleção de tarefas do banco de dados."""
         return self.colecao if self.connected else None
-    
+
     def is_connected(self):
         """Verifica se a conexão com o banco está ativa."""
         return self.connected
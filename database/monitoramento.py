@@ -0,0 +1,139 @@
+import threading
+import time
+
+from pymongo import monitoring
+
+from utils.rastreamento import rastreador
+
+# Importado apenas pela thread de conexão (depende do pymongo, que é carregado sob demanda)
+
+
+class EstatisticasConexao:
+    """Contadores do pool de conexões e do heartbeat do MongoClient, atualizados pelos ouvintes."""
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.conexoes_criadas = 0
+        self.conexoes_fechadas = 0
+        self.retiradas = 0
+        self.devolvidas = 0
+        self.falhas_retirada = 0
+        self.espera_total_s = 0.0  # tempo somado esperando uma conexão livre do pool
+        self.pools_limpos = 0
+        self.heartbeats = 0
+        self.falhas_heartbeat = 0
+        self.ultimo_heartbeat_ms = None
+        self.ultima_falha_heartbeat = None
+
+    def incrementar(self, **deltas):
+        """Soma os valores informados aos contadores de mesmo nome."""
+        with self._trava:
+            for nome, delta in deltas.items():
+                setattr(self, nome, getattr(self, nome) + delta)
+
+    def definir(self, **valores):
+        """Substitui os valores informados."""
+        with self._trava:
+            for nome, valor in valores.items():
+                setattr(self, nome, valor)
+
+    def resumo(self):
+        """Contadores atuais, com as conexões abertas e em uso derivadas deles."""
+        with self._trava:
+            return {
+                "conexoes_abertas": self.conexoes_criadas - self.conexoes_fechadas,
+                "conexoes_em_uso": self.retiradas - self.devolvidas,
+                "conexoes_criadas": self.conexoes_criadas,
+                "conexoes_fechadas": self.conexoes_fechadas,
+                "retiradas": self.retiradas,
+                "falhas_retirada": self.falhas_retirada,
+                "espera_media_ms": self.espera_total_s / self.retiradas * 1000 if self.retiradas else 0.0,
+                "pools_limpos": self.pools_limpos,
+                "heartbeats": self.heartbeats,
+                "falhas_heartbeat": self.falhas_heartbeat,
+                "ultimo_heartbeat_ms": self.ultimo_heartbeat_ms,
+                "ultima_falha_heartbeat": self.ultima_falha_heartbeat,
+            }
+
+
+class OuvintePool(monitoring.ConnectionPoolListener):
+    """Conta as conexões criadas, fechadas, retiradas e devolvidas ao pool."""
+    def __init__(self, estatisticas):
+        self.estatisticas = estatisticas
+        self._inicio_retirada = threading.local()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.estatisticas.incrementar(pools_limpos=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.estatisticas.incrementar(conexoes_criadas=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.estatisticas.incrementar(conexoes_fechadas=1)
+
+    def connection_check_out_started(self, event):
+        self._inicio_retirada.valor = time.perf_counter()
+
+    def connection_check_out_failed(self, event):
+        self.estatisticas.incrementar(falhas_retirada=1)
+
+    def connection_checked_out(self, event):
+        inicio = getattr(self._inicio_retirada, "valor", None)
+        espera = time.perf_counter() - inicio if inicio is not None else 0.0
+        self.estatisticas.incrementar(retiradas=1, espera_total_s=espera)
+
+    def connection_checked_in(self, event):
+        self.estatisticas.incrementar(devolvidas=1)
+
+
+class OuvinteHeartbeat(monitoring.ServerHeartbeatListener):
+    """Registra a duração do último heartbeat e as falhas de monitoramento do servidor."""
+    def __init__(self, estatisticas):
+        self.estatisticas = estatisticas
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self.estatisticas.incrementar(heartbeats=1)
+        self.estatisticas.definir(ultimo_heartbeat_ms=event.duration * 1000)
+
+    def failed(self, event):
+        self.estatisticas.incrementar(falhas_heartbeat=1)
+        self.estatisticas.definir(ultima_falha_heartbeat=str(event.reply))
+
+
+class OuvinteComandosRastreados(monitoring.CommandListener):
+    """Registra cada comando enviado ao MongoDB (ida e volta ao servidor, com a decodificação
+    da resposta) como um trecho do rastreamento, na thread que fez a consulta."""
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        self._registrar(event)
+
+    def failed(self, event):
+        self._registrar(event)
+
+    def _registrar(self, event):
+        duracao = event.duration_micros / 1e6
+        rastreador.registrar(f"mongodb.{event.command_name}", "mongodb", time.perf_counter() - duracao, duracao)
+
+
+def criar_ouvintes(estatisticas):
+    """Ouvintes do MongoClient: estatísticas do pool e do heartbeat e, se ligado, o rastreamento."""
+    ouvintes = [OuvintePool(estatisticas), OuvinteHeartbeat(estatisticas)]
+    if rastreador is not None:
+        ouvintes.append(OuvinteComandosRastreados())
+    return ouvintes
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de diagnóstico: verifica, via explain(), se as consultas do model usam índices
+"""
+
+from model.tarefa_model import TarefaModel
+
+def diagnosticar_indices():
+    """Exibe o plano de cada formato de consulta e destaca as que fazem COLLSCAN"""
+    print("=== Diagnóstico de Índices MongoDB ===")
+
+    model = TarefaModel()
+    if not model.mongo_context.aguardar_conexao():
+        print("❌ Não foi possível conectar ao MongoDB")
+        return []
+
+    relatorio = model.diagnosticar_consultas()
+    for item in relatorio:
+        marcador = "❌ COLLSCAN" if item["collscan"] else "✅"
+        print(f"  {marcador} {item['consulta']}: {' <- '.join(item['estagios'])}")
+
+    varreduras = [item["consulta"] for item in relatorio if item["collscan"]]
+    if varreduras:
+        print(f"\n⚠️ Consultas sem índice: {', '.join(varreduras)}")
+    else:
+        print("\n🎉 Todas as consultas usam índices.")
+    return relatorio
+
+if __name__ == "__main__":
+    diagnosticar_indices()
@@ -1,9 +1,48 @@
+import time
+INICIO_MAIN = time.perf_counter()  # registrado antes dos imports pesados
+
+import json
+import os
 from tkinter import Tk
 from view.tarefa_view import TarefaView
 
 """Ponto de entrada da aplicação. Inicializa a interface gráfica principal."""
 
+def _segundos_desde_criacao_processo():
+    """Tempo desde a criação do processo (via /proc, no Linux), ou None se indisponível."""
+    try:
+        with open('/proc/self/stat') as arquivo:
+            inicio_ticks = int(arquivo.read().rsplit(')', 1)[1].split()[19])
+        with open('/proc/uptime') as arquivo:
+            uptime = float(arquivo.read().split()[0])
+        return uptime - inicio_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def registrar_tempo_inicializacao(evento="primeira_lista_pintada", descricao="Primeira lista pintada"):
+    """Exibe o tempo até um marco da inicialização e o grava em ARQUIVO_METRICAS_INICIO, se definido."""
+    desde_main_ms = (time.perf_counter() - INICIO_MAIN) * 1000
+    desde_processo = _segundos_desde_criacao_processo()
+    desde_processo_ms = desde_processo * 1000 if desde_processo is not None else None
+    print(f"{descricao} em {desde_main_ms:.0f} ms desde o início de main.py"
+          + (f" ({desde_processo_ms:.0f} ms desde a criação do processo)" if desde_processo_ms is not None else ""))
+
+    caminho = os.getenv('ARQUIVO_METRICAS_INICIO')
+    if caminho:
+        registro = {
+            "evento": evento,
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ms_desde_main": round(desde_main_ms, 1),
+            "ms_desde_processo": round(desde_processo_ms, 1) if desde_processo_ms is not None else None
+        }
+        with open(caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(json.dumps(registro) + "\n")
+
 if __name__ == "__main__":
     root = Tk()
-    app = TarefaView(root)
+    app = TarefaView(
+        root,
+        ao_primeira_lista=registrar_tempo_inicializacao,
+        ao_janela_visivel=lambda: registrar_tempo_inicializacao("janela_visivel", "Janela visível")
+    )
     root.mainloop()
@@ -0,0 +1,463 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from heapq import nlargest
+from itertools import islice, takewhile
+from types import SimpleNamespace
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# Palavras frequentes demais para ajudar na busca (não são indexadas)
+PALAVRAS_VAZIAS = frozenset(
+    "a as ao aos o os e é de da das do dos em na nas no nos um uma uns umas para por com sem que se".split()
+)
+
+# Peso de uma ocorrência no título em relação a uma na descrição
+PESO_TITULO = 3
+
+# Tamanho mínimo da última palavra digitada para buscá-la também como prefixo
+TAMANHO_MINIMO_PREFIXO = 3
+
+
+class GeradorIds:
+    """Gera ids no formato de ObjectId (24 hex) estritamente crescentes dentro do processo.
+
+    Ids crescentes mantêm as tarefas em memória ordenadas por _id, o que permite paginar por
+    cursor com busca binária, e continuam válidos como ObjectId ao migrar para o MongoDB.
+    """
+    def __init__(self):
+        self._aleatorio = int.from_bytes(os.urandom(5), "big")
+        self._segundos = 0
+        self._prefixo = ""
+        self._contador = 0
+        self._trava = threading.Lock()
+
+    def novo(self):
+        """Retorna um novo id maior que todos os anteriores."""
+        with self._trava:
+            agora = int(time.time())
+            if agora > self._segundos:
+                self._definir_segundos(agora)
+            else:
+                self._contador += 1
+                if self._contador > 0xFFFFFF:
+                    self._definir_segundos(self._segundos + 1)
+            return f"{self._prefixo}{self._contador:06x}"
+
+    def _definir_segundos(self, segundos):
+        """Reinicia o contador e recalcula a parte fixa do id para o novo segundo."""
+        self._segundos, self._contador = segundos, 0
+        self._prefixo = f"{segundos:08x}{self._aleatorio:010x}"
+
+
+class ListaOrdenada:
+    """Lista ordenada dividida em blocos, com inserção e remoção em O(log n) na prática.
+
+    Uma lista Python única exige deslocar metade dos elementos a cada inserção no meio; com
+    blocos de tamanho limitado, o deslocamento fica restrito a um bloco.
+    """
+    TAMANHO_BLOCO = 1000
+
+    def __init__(self):
+        self._blocos = []
+        self._maximos = []  # último (maior) valor de cada bloco
+        self._tamanho = 0
+
+    def __len__(self):
+        return self._tamanho
+
+    def __iter__(self):
+        for bloco in self._blocos:
+            yield from bloco
+
+    def adicionar(self, valor):
+        """Insere o valor na posição ordenada."""
+        self._tamanho += 1
+        if not self._blocos:
+            self._blocos.append([valor])
+            self._maximos.append(valor)
+            return
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._blocos):
+            # Caso comum: ids crescentes entram no fim do último bloco
+            i -= 1
+            self._blocos[i].append(valor)
+        else:
+            insort(self._blocos[i], valor)
+        bloco = self._blocos[i]
+        self._maximos[i] = bloco[-1]
+        if len(bloco) > 2 * self.TAMANHO_BLOCO:
+            metade = len(bloco) // 2
+            self._blocos[i:i + 1] = [bloco[:metade], bloco[metade:]]
+            self._maximos[i:i + 1] = [bloco[metade - 1], bloco[-1]]
+
+    def remover(self, valor):
+        """Remove o valor, retornando se ele estava presente."""
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._blocos):
+            return False
+        bloco = self._blocos[i]
+        j = bisect_left(bloco, valor)
+        if bloco[j] != valor:
+            return False
+        del bloco[j]
+        self._tamanho -= 1
+        if bloco:
+            self._maximos[i] = bloco[-1]
+        else:
+            del self._blocos[i]
+            del self._maximos[i]
+        return True
+
+    def iterar_apos(self, valor=None):
+        """Percorre em ordem os valores maiores que `valor` (todos, se None)."""
+        if valor is None:
+            yield from self
+            return
+        i = bisect_right(self._maximos, valor)
+        if i == len(self._blocos):
+            return
+        bloco = self._blocos[i]
+        yield from islice(bloco, bisect_right(bloco, valor), None)
+        for k in range(i + 1, len(self._blocos)):
+            yield from self._blocos[k]
+
+
+class RegistroTarefa:
+    """Registro compacto de uma tarefa em memória (sem o dicionário por instância)."""
+    __slots__ = ("_id", "titulo", "descricao", "status")
+
+    def __init__(self, _id, titulo, descricao, status):
+        self._id = _id
+        self.titulo = titulo
+        self.descricao = descricao
+        self.status = status
+
+    def como_dict(self, resumo=None):
+        """Cópia da tarefa como dicionário; com `resumo`, a descrição é truncada."""
+        descricao = self.descricao if resumo is None else self.descricao[:resumo]
+        return {"_id": self._id, "titulo": self.titulo, "descricao": descricao, "status": self.status}
+
+
+def _tabela_sem_acentos():
+    """Tabela para str.translate que troca letras latinas acentuadas pela letra base."""
+    tabela = {c: None for c in range(0x300, 0x370)}  # acentos combinados avulsos
+    for c in range(0xC0, 0x250):
+        base = unicodedata.normalize("NFKD", chr(c))
+        base = "".join(b for b in base if not unicodedata.combining(b))
+        if base != chr(c):
+            tabela[c] = base
+    return tabela
+
+
+_SEM_ACENTOS = _tabela_sem_acentos()
+
+
+def normalizar_texto(texto):
+    """Texto em minúsculas e sem acentos ("Ação" -> "acao")."""
+    return texto.lower().translate(_SEM_ACENTOS)
+
+
+def tokenizar(texto):
+    """Palavras normalizadas do texto, na ordem em que aparecem."""
+    return re.findall(r"\w+", normalizar_texto(texto))
+
+
+class IndiceTexto:
+    """Índice invertido de titulo e descricao: palavra -> {_id: peso}.
+
+    O peso soma as ocorrências da palavra, com as do título valendo PESO_TITULO. As palavras
+    ficam também em uma ListaOrdenada, para que a última palavra digitada seja buscada como
+    prefixo (busca enquanto se digita) percorrendo apenas as palavras com esse prefixo.
+    """
+    def __init__(self):
+        self._postagens = {}  # palavra -> {_id: peso}
+        self._palavras = ListaOrdenada()
+        self._palavras_por_id = {}  # _id -> palavras indexadas da tarefa
+
+    def indexar(self, id_tarefa, titulo, descricao):
+        """Indexa (ou reindexa) o texto de uma tarefa."""
+        self.remover(id_tarefa)
+        pesos = Counter()
+        for palavra in tokenizar(titulo):
+            pesos[palavra] += PESO_TITULO
+        pesos.update(tokenizar(descricao))
+        palavras = tuple(p for p in pesos if p not in PALAVRAS_VAZIAS)
+        for palavra in palavras:
+            postagem = self._postagens.get(palavra)
+            if postagem is None:
+                postagem = self._postagens[palavra] = {}
+                self._palavras.adicionar(palavra)
+            postagem[id_tarefa] = pesos[palavra]
+        self._palavras_por_id[id_tarefa] = palavras
+
+    def remover(self, id_tarefa):
+        """Retira a tarefa do índice."""
+        for palavra in self._palavras_por_id.pop(id_tarefa, ()):
+            postagem = self._postagens[palavra]
+            del postagem[id_tarefa]
+            if not postagem:
+                del self._postagens[palavra]
+                self._palavras.remover(palavra)
+
+    def buscar(self, texto):
+        """Pontuação de cada tarefa que contém todas as palavras do texto (a última como prefixo)."""
+        palavras = tokenizar(texto)
+        if not palavras:
+            return {}
+        ultima = palavras.pop()
+        pesos = [self._postagens.get(p, {}) for p in palavras if p not in PALAVRAS_VAZIAS]
+        pesos.append(self._pesos_prefixo(ultima) if len(ultima) >= TAMANHO_MINIMO_PREFIXO else self._postagens.get(ultima, {}))
+        # Começa pela palavra mais rara: cada interseção só percorre o resultado parcial
+        pesos.sort(key=len)
+        pontuacoes = dict(pesos[0])
+        for outros in pesos[1:]:
+            pontuacoes = {i: p + outros[i] for i, p in pontuacoes.items() if i in outros}
+        return pontuacoes
+
+    def _pesos_prefixo(self, prefixo):
+        """Maior peso, por tarefa, entre as palavras que começam com o prefixo."""
+        palavras = list(takewhile(lambda p: p.startswith(prefixo), self._palavras.iterar_apos(prefixo)))
+        if prefixo in self._postagens:
+            palavras.append(prefixo)
+        if len(palavras) <= 1:
+            return self._postagens[palavras[0]] if palavras else {}
+        postagens = sorted((self._postagens[p] for p in palavras), key=len, reverse=True)
+        resultado = dict(postagens[0])
+        for postagem in postagens[1:]:
+            for id_tarefa, peso in postagem.items():
+                if peso > resultado.get(id_tarefa, 0):
+                    resultado[id_tarefa] = peso
+        return resultado
+
+
+class ArmazenamentoMemoria:
+    """Armazenamento de tarefas em memória, usado quando não há conexão com o MongoDB.
+
+    As tarefas ficam em um mapa _id -> RegistroTarefa, que dá acesso pontual em O(1). A ordem
+    por _id é mantida em uma ListaOrdenada (as tarefas vindas do MongoDB não chegam em ordem
+    de criação local) e um índice secundário por status guarda os ids de cada status, para
+    filtrar e paginar por cursor percorrendo apenas as tarefas do resultado. O índice de texto
+    da busca só é criado quando a busca é usada, para não pesar nas escritas de quem não busca.
+
+    Cada escrita incrementa um contador de versão; cada status guarda o valor do contador na
+    última escrita que o afetou, o que permite saber se o resultado de um filtro mudou.
+    """
+    def __init__(self):
+        self._registros = {}  # _id -> RegistroTarefa
+        self._ordem = ListaOrdenada()  # todos os _id em ordem crescente
+        self._por_status = {}  # status -> ListaOrdenada com os _id das tarefas
+        self._ids = GeradorIds()
+        self._versao = 0
+        self._versoes_status = {}  # status -> versão da última escrita que alterou o status
+        self._esvaziado_em = 0  # versão do último esvaziar (vale para todos os status)
+        self._indice_texto = None  # IndiceTexto, criado na primeira busca e mantido a partir daí
+        self._metadados = {}  # chave -> valor (ex.: revisão do MongoDB copiada para a réplica)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def contar(self, filtro_status=None):
+        """Quantidade de tarefas, podendo filtrar por status."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            return len(self._por_status.get(filtro_status, ()))
+        return len(self._registros)
+
+    def contar_por_status(self):
+        """Quantidade total e por status, lida dos tamanhos do índice por status.
+
+        Os tamanhos são mantidos a cada escrita, então a contagem não percorre as tarefas.
+        """
+        por_status = {"Pendente": 0, "Concluída": 0}
+        por_status.update((status, len(ids)) for status, ids in self._por_status.items() if ids)
+        return {"total": len(self._registros), "por_status": por_status}
+
+    def preparar_busca(self):
+        """Cria o índice de texto, se ainda não existir (a primeira busca faria o mesmo)."""
+        if self._indice_texto is None:
+            inicio = time.perf_counter()
+            indice = IndiceTexto()
+            for registro in self._registros.values():
+                indice.indexar(registro._id, registro.titulo, registro.descricao)
+            self._indice_texto = indice
+            print(f"Índice de busca criado: {len(self._registros)} tarefas em {time.perf_counter() - inicio:.2f} s")
+
+    def buscar(self, texto, filtro_status=None, limite=100, resumo=None):
+        """Tarefas que contêm todas as palavras do texto, da mais relevante para a menos.
+
+        A busca ignora maiúsculas e acentos, e a última palavra também casa como prefixo.
+        """
+        self.preparar_busca()
+        pontuacoes = self._indice_texto.buscar(texto)
+        registros = self._registros
+        if filtro_status in ["Pendente", "Concluída"]:
+            pontuacoes = {i: p for i, p in pontuacoes.items() if registros[i].status == filtro_status}
+        # Empates ficam com as tarefas mais recentes (maior _id) primeiro
+        melhores = nlargest(limite, zip(pontuacoes.values(), pontuacoes.keys()))
+        return [registros[i].como_dict(resumo) for _, i in melhores]
+
+    def versao(self, filtro_status=None):
+        """Versão do resultado do filtro: muda sempre que uma escrita altera esse resultado."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            return self._versoes_status.get(filtro_status, self._esvaziado_em)
+        return self._versao
+
+    def _marcar_alteracao(self, *status):
+        """Avança a versão geral e a dos status afetados por uma escrita."""
+        self._versao += 1
+        for s in status:
+            self._versoes_status[s] = self._versao
+
+    def listar(self, filtro_status=None):
+        """Lista todas as tarefas, podendo filtrar por status."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            registros = self._registros
+            return [registros[i].como_dict() for i in self._por_status.get(filtro_status, ())]
+        registros = self._registros
+        return [registros[i].como_dict() for i in self._ordem]
+
+    def listar_pagina(self, filtro_status=None, tamanho_pagina=100, apos=None, contar_total=False, resumo=None):
+        """Lista uma página de tarefas ordenadas por _id, a partir do cursor `apos` (exclusivo).
+
+        Com `resumo` (quantidade de caracteres), retorna cópias com a descrição truncada.
+        """
+        if filtro_status not in ["Pendente", "Concluída"]:
+            filtro_status = None
+        if filtro_status is None:
+            ids = self._ordem.iterar_apos(apos)
+        else:
+            ids = self._por_status.get(filtro_status, ListaOrdenada()).iterar_apos(apos)
+        # Busca um item a mais para saber se existe próxima página
+        ids_pagina = list(islice(ids, tamanho_pagina + 1))
+        ha_mais = len(ids_pagina) > tamanho_pagina
+        pagina = [self._registros[i].como_dict(resumo) for i in ids_pagina[:tamanho_pagina]]
+        return {
+            "tarefas": pagina,
+            "proximo_cursor": pagina[-1]["_id"] if ha_mais else None,
+            "total": self.contar(filtro_status) if contar_total else None
+        }
+
+    def adicionar(self, titulo, descricao, status):
+        """Adiciona uma nova tarefa à memória."""
+        id_tarefa = self._ids.novo()
+        self._registros[id_tarefa] = RegistroTarefa(id_tarefa, titulo, descricao, status)
+        self._ordem.adicionar(id_tarefa)
+        self._indice_status(status).adicionar(id_tarefa)
+        self._marcar_alteracao(status)
+        if self._indice_texto is not None:
+            self._indice_texto.indexar(id_tarefa, titulo, descricao)
+        return SimpleNamespace(inserted_id=id_tarefa)
+
+    def gravar(self, tarefa):
+        """Insere a tarefa com o _id informado ou substitui a existente (usado na réplica local)."""
+        id_tarefa = str(tarefa["_id"])
+        if self.atualizar(id_tarefa, tarefa["titulo"], tarefa["descricao"], tarefa["status"]).matched_count:
+            return
+        self._registros[id_tarefa] = RegistroTarefa(id_tarefa, tarefa["titulo"], tarefa["descricao"], tarefa["status"])
+        self._ordem.adicionar(id_tarefa)
+        self._indice_status(tarefa["status"]).adicionar(id_tarefa)
+        self._marcar_alteracao(tarefa["status"])
+        if self._indice_texto is not None:
+            self._indice_texto.indexar(id_tarefa, tarefa["titulo"], tarefa["descricao"])
+
+    def adicionar_muitos(self, tarefas):
+        """Grava várias tarefas preservando os _id informados."""
+        for tarefa in tarefas:
+            self.gravar(tarefa)
+
+    def _indice_status(self, status):
+        """ListaOrdenada de ids do status, criada no primeiro uso."""
+        ids = self._por_status.get(status)
+        if ids is None:
+            ids = self._por_status[status] = ListaOrdenada()
+        return ids
+
+    def atualizar(self, id_tarefa, titulo, descricao, status):
+        """Atualiza uma tarefa existente pelo id."""
+        registro = self._registros.get(id_tarefa)
+        if registro is None:
+            return SimpleNamespace(matched_count=0, modified_count=0)
+        self._marcar_alteracao(registro.status, status)
+        if registro.status != status:
+            self._por_status[registro.status].remover(id_tarefa)
+            self._indice_status(status).adicionar(id_tarefa)
+            registro.status = status
+        if self._indice_texto is not None and (registro.titulo != titulo or registro.descricao != descricao):
+            self._indice_texto.indexar(id_tarefa, titulo, descricao)
+        registro.titulo = titulo
+        registro.descricao = descricao
+        return SimpleNamespace(matched_count=1, modified_count=1)
+
+    def listar_ids(self, filtro_status=None):
+        """_id das tarefas (podendo filtrar por status), em ordem crescente."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            return list(self._por_status.get(filtro_status, ()))
+        return list(self._ordem)
+
+    def atualizar_status_muitos(self, ids, status):
+        """Muda o status das tarefas informadas; as que já estão no status não são contadas."""
+        modificadas = 0
+        for id_tarefa in ids:
+            registro = self._registros.get(str(id_tarefa))
+            if registro is not None and registro.status != status:
+                self.atualizar(registro._id, registro.titulo, registro.descricao, status)
+                modificadas += 1
+        return SimpleNamespace(matched_count=modificadas, modified_count=modificadas)
+
+    def excluir_muitos(self, ids):
+        """Exclui as tarefas informadas."""
+        return SimpleNamespace(deleted_count=sum(self.excluir(str(i)).deleted_count for i in ids))
+
+    def excluir(self, id_tarefa):
+        """Exclui uma tarefa da memória pelo id."""
+        registro = self._registros.pop(id_tarefa, None)
+        if registro is None:
+            return SimpleNamespace(deleted_count=0)
+        self._ordem.remover(id_tarefa)
+        self._por_status[registro.status].remover(id_tarefa)
+        self._marcar_alteracao(registro.status)
+        if self._indice_texto is not None:
+            self._indice_texto.remover(id_tarefa)
+        return SimpleNamespace(deleted_count=1)
+
+    def esvaziar(self):
+        """Remove todas as tarefas (usado antes de recarregar a réplica a partir do MongoDB)."""
+        self._registros.clear()
+        self._ordem = ListaOrdenada()
+        self._por_status.clear()
+        self._versao += 1
+        self._versoes_status.clear()
+        self._esvaziado_em = self._versao
+        if self._indice_texto is not None:
+            self._indice_texto = IndiceTexto()
+
+    def substituir(self, lotes):
+        """Substitui todas as tarefas pelas dos lotes (listas de tarefas com _id).
+
+        Os lotes são carregados em um armazenamento novo, que só toma o lugar do atual depois
+        de lidos até o fim: se a leitura falhar no meio, as tarefas anteriores são mantidas.
+        """
+        novo = ArmazenamentoMemoria()
+        for lote in lotes:
+            novo.adicionar_muitos(lote)
+        self._registros, self._ordem, self._por_status = novo._registros, novo._ordem, novo._por_status
+        self._versao += 1
+        self._versoes_status.clear()
+        self._esvaziado_em = self._versao
+        # O índice de busca é recriado na próxima busca
+        self._indice_texto = None
+
+    def ler_metadado(self, chave):
+        """Valor guardado com gravar_metadado, ou None."""
+        return self._metadados.get(chave)
+
+    def gravar_metadado(self, chave, valor):
+        """Guarda um valor de controle da réplica (perdido ao sair, junto com as tarefas)."""
+        self._metadados[chave] = valor
+
+    def buscar_por_id(self, id_tarefa):
+        """Busca uma tarefa pelo id."""
+        registro = self._registros.get(id_tarefa)
+        return registro.como_dict() if registro is not None else None
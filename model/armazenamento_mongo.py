@@ -0,0 +1,308 @@
+from types import SimpleNamespace
+
+from bson import ObjectId, Timestamp
+from pymongo import IndexModel, ASCENDING, TEXT, UpdateOne
+from pymongo.errors import PyMongoError, BulkWriteError, OperationFailure
+
+# Código de erro do MongoDB para violação de índice único (ex.: _id repetido)
+CODIGO_CHAVE_DUPLICADA = 11000
+
+# Toda escrita grava em "revisao" um timestamp gerado pelo servidor, crescente entre clientes,
+# usado pelo MonitorAlteracoes para buscar apenas o que mudou
+REVISAO = {"$currentDate": {"revisao": {"$type": "timestamp"}}}
+
+# _id por update_many/delete_many nas operações em massa: o $in fica bem abaixo do limite de
+# 16 MB de um comando mesmo ao aplicar a operação a todas as tarefas de um filtro
+TAMANHO_LOTE_EM_MASSA = 10000
+
+# Tempo que o registro de uma exclusão é mantido para os clientes que consultam alterações
+RETENCAO_EXCLUSOES_S = 7 * 24 * 3600
+
+
+def colecao_exclusoes(colecao):
+    """Coleção auxiliar com o _id e a revisão das tarefas excluídas."""
+    return colecao.database[f"{colecao.name}_exclusoes"]
+
+
+def revisao_atual(colecao):
+    """Maior revisão gravada na coleção ou nas exclusões: muda a cada escrita de qualquer cliente.
+
+    Cada consulta lê uma única entrada do índice de revisão.
+    """
+    revisoes = [Timestamp(0, 0)]
+    for alvo in (colecao, colecao_exclusoes(colecao)):
+        documento = alvo.find_one({"revisao": {"$exists": True}}, {"revisao": 1}, sort=[("revisao", -1)])
+        if documento is not None:
+            revisoes.append(documento["revisao"])
+    return max(revisoes)
+
+
+def registrar_alteracoes(colecao, gravados=(), excluidos=()):
+    """Marca a revisão de tarefas gravadas sem $currentDate (inserções) e registra exclusões."""
+    gravados, excluidos = list(gravados), list(excluidos)
+    if gravados:
+        colecao.update_many({"_id": {"$in": gravados}}, REVISAO)
+    if excluidos:
+        marca = {"$currentDate": {"revisao": {"$type": "timestamp"}, "excluida_em": True}}
+        colecao_exclusoes(colecao).bulk_write([UpdateOne({"_id": i}, marca, upsert=True) for i in excluidos], ordered=False)
+
+
+class ArmazenamentoMongo:
+    """Operações de tarefas sobre uma coleção do MongoDB."""
+
+    # Índices exigidos pelas consultas abaixo. O composto (status, _id) atende tanto o filtro
+    # por status quanto a paginação por cursor dentro de um status; _id já é indexado.
+    INDICES = [
+        IndexModel([("status", ASCENDING), ("_id", ASCENDING)], name="status_id"),
+        IndexModel([("revisao", ASCENDING), ("_id", ASCENDING)], name="revisao_id"),
+        # Busca textual: sem acentos e com radicais do português; o título pesa mais no ranking
+        IndexModel(
+            [("titulo", TEXT), ("descricao", TEXT)], name="busca_texto",
+            default_language="portuguese", weights={"titulo": 3, "descricao": 1}
+        ),
+    ]
+    INDICES_EXCLUSOES = [
+        IndexModel([("revisao", ASCENDING), ("_id", ASCENDING)], name="revisao_id"),
+        IndexModel([("excluida_em", ASCENDING)], name="excluida_em_ttl", expireAfterSeconds=RETENCAO_EXCLUSOES_S),
+    ]
+
+    def __init__(self, colecao):
+        self.colecao = colecao
+
+    def garantir_indices(self):
+        """Cria os índices declarados em INDICES; índices já existentes não são alterados."""
+        try:
+            criados = self.colecao.create_indexes(self.INDICES)
+            criados += colecao_exclusoes(self.colecao).create_indexes(self.INDICES_EXCLUSOES)
+            print(f"Índices garantidos na coleção '{self.colecao.name}': {', '.join(criados)}")
+        except PyMongoError as e:
+            print(f"Não foi possível criar os índices da coleção: {e}")
+
+    def formatos_consulta(self):
+        """Formatos de consulta usados pelo model, como (nome, filtro, ordenação)."""
+        cursor = ObjectId()
+        return [
+            ("listar_pagina", {}, [("_id", ASCENDING)]),
+            ("listar_pagina_cursor", {"_id": {"$gt": cursor}}, [("_id", ASCENDING)]),
+            ("listar_status", {"status": "Pendente"}, None),
+            ("listar_pagina_status", {"status": "Pendente"}, [("_id", ASCENDING)]),
+            ("listar_pagina_status_cursor", {"status": "Pendente", "_id": {"$gt": cursor}}, [("_id", ASCENDING)]),
+            ("buscar_por_id", {"_id": cursor}, None),
+            ("em_massa", {"_id": {"$in": [cursor]}}, None),
+            ("buscar", {"$text": {"$search": "tarefa"}}, None),
+            ("alteracoes_desde", {"revisao": {"$gt": Timestamp(0, 0)}}, [("revisao", ASCENDING), ("_id", ASCENDING)]),
+        ]
+
+    def diagnosticar_consultas(self):
+        """Executa explain() em cada formato de consulta e indica quais fazem COLLSCAN."""
+        relatorio = []
+        for nome, filtro, ordenacao in self.formatos_consulta():
+            cursor = self.colecao.find(filtro).limit(1)
+            if ordenacao:
+                cursor = cursor.sort(ordenacao)
+            plano = cursor.explain().get("queryPlanner", {}).get("winningPlan", {})
+            estagios = _estagios_do_plano(plano)
+            relatorio.append({"consulta": nome, "estagios": estagios, "collscan": "COLLSCAN" in estagios})
+        return relatorio
+
+    def versao(self, filtro_status=None):
+        """Versão da coleção (ver revisao_atual); a mesma para todos os filtros."""
+        return revisao_atual(self.colecao)
+
+    def contar_por_status(self):
+        """Quantidade total e por status em uma agregação $group no servidor.
+
+        Só o campo status é usado, então o índice status_id responde sem ler os documentos. Se
+        o índice não existir (garantir_indices pode não ter conseguido criá-lo), a agregação é
+        feita sem ele.
+        """
+        etapas = [{"$group": {"_id": "$status", "quantidade": {"$sum": 1}}}]
+        try:
+            grupos = list(self.colecao.aggregate(etapas, hint="status_id"))
+        except OperationFailure:
+            grupos = list(self.colecao.aggregate(etapas))
+        por_status = {"Pendente": 0, "Concluída": 0}
+        por_status.update((grupo["_id"], grupo["quantidade"]) for grupo in grupos)
+        return {"total": sum(por_status.values()), "por_status": por_status}
+
+    def listar(self, filtro_status=None):
+        """Lista todas as tarefas, podendo filtrar por status."""
+        consulta = {}
+        if filtro_status in ["Pendente", "Concluída"]:
+            consulta = {"status": filtro_status}
+        return list(self.colecao.find(consulta))
+
+    def buscar(self, texto, filtro_status=None, limite=100, resumo=None):
+        """Tarefas que contêm as palavras do texto, pelo índice textual, da mais relevante para a menos.
+
+        O índice textual casa palavras inteiras (e suas variações), não prefixos.
+        """
+        if not texto.strip():
+            return []
+        consulta = {"$text": {"$search": texto}}
+        if filtro_status in ["Pendente", "Concluída"]:
+            consulta["status"] = filtro_status
+        projecao = {"titulo": 1, "status": 1, "descricao": 1, "relevancia": {"$meta": "textScore"}}
+        if resumo is not None:
+            projecao["descricao"] = {"$substrCP": ["$descricao", 0, resumo]}
+        cursor = self.colecao.find(consulta, projecao).sort([("relevancia", {"$meta": "textScore"}), ("_id", -1)]).limit(limite)
+        tarefas = list(cursor)
+        for tarefa in tarefas:
+            del tarefa["relevancia"]
+        return tarefas
+
+    def listar_pagina(self, filtro_status=None, tamanho_pagina=100, apos=None, contar_total=False, resumo=None):
+        """Lista uma página de tarefas ordenadas por _id, a partir do cursor `apos` (exclusivo).
+
+        Com `resumo` (quantidade de caracteres), a descrição é truncada no próprio servidor.
+        """
+        consulta = {}
+        if filtro_status in ["Pendente", "Concluída"]:
+            consulta = {"status": filtro_status}
+        consulta_pagina = dict(consulta)
+        if apos is not None:
+            consulta_pagina["_id"] = {"$gt": ObjectId(apos)}
+        # Busca um documento a mais para saber se existe próxima página
+        projecao = None
+        if resumo is not None:
+            projecao = {"titulo": 1, "status": 1, "descricao": {"$substrCP": ["$descricao", 0, resumo]}}
+        pagina = list(self.colecao.find(consulta_pagina, projecao).sort("_id", 1).limit(tamanho_pagina + 1))
+        ha_mais = len(pagina) > tamanho_pagina
+        pagina = pagina[:tamanho_pagina]
+        return {
+            "tarefas": pagina,
+            "proximo_cursor": str(pagina[-1]["_id"]) if ha_mais else None,
+            "total": self.colecao.count_documents(consulta) if contar_total else None
+        }
+
+    def iterar(self, filtro_status=None, tamanho_lote=1000):
+        """Percorre as tarefas em ordem de _id por um cursor no servidor, `tamanho_lote` por ida."""
+        consulta = {"status": filtro_status} if filtro_status in ["Pendente", "Concluída"] else {}
+        return self.colecao.find(consulta, {"revisao": 0}).sort("_id", 1).batch_size(tamanho_lote)
+
+    def adicionar(self, titulo, descricao, status):
+        """Adiciona uma nova tarefa à coleção (upsert de um _id novo, para gravar a revisão junto)."""
+        id_tarefa = ObjectId()
+        self.colecao.update_one(
+            {"_id": id_tarefa}, {"$set": {"titulo": titulo, "descricao": descricao, "status": status}, **REVISAO}, upsert=True
+        )
+        return SimpleNamespace(inserted_id=id_tarefa)
+
+    def adicionar_muitos(self, tarefas):
+        """Insere várias tarefas de uma vez, preservando os _id já atribuídos (ex.: vindos da memória).
+
+        Tarefas cujo _id já existe na coleção (ex.: migração interrompida antes de esvaziar o
+        armazenamento local) ou se repete no lote são ignoradas. Retorna um SimpleNamespace com
+        `inserted_count` (o nInserted do servidor) e `recusadas` (posições, em `tarefas`, das
+        ignoradas).
+        """
+        documentos = [dict(t, _id=ObjectId(t["_id"])) if "_id" in t else dict(t) for t in tarefas]
+        if not documentos:
+            return SimpleNamespace(inserted_count=0, recusadas=[])
+        try:
+            inseridas, recusadas = len(self.colecao.insert_many(documentos, ordered=False).inserted_ids), []
+        except BulkWriteError as e:
+            erros = e.details.get("writeErrors", [])
+            if any(erro.get("code") != CODIGO_CHAVE_DUPLICADA for erro in erros):
+                raise
+            inseridas, recusadas = e.details.get("nInserted", 0), [erro["index"] for erro in erros]
+        ignorar = set(recusadas)
+        registrar_alteracoes(self.colecao, gravados=[d["_id"] for i, d in enumerate(documentos) if i not in ignorar])
+        return SimpleNamespace(inserted_count=inseridas, recusadas=recusadas)
+
+    def listar_ids(self, filtro_status=None):
+        """_id das tarefas (podendo filtrar por status), em ordem crescente; lidos só do índice."""
+        consulta = {"status": filtro_status} if filtro_status in ["Pendente", "Concluída"] else {}
+        return [d["_id"] for d in self.colecao.find(consulta, {"_id": 1}).sort("_id", 1)]
+
+    def atualizar_status_muitos(self, ids, status):
+        """Muda o status das tarefas informadas com um update_many por lote de _id.
+
+        As tarefas que já estão no status não são tocadas (nem ganham nova revisão).
+        """
+        encontradas = modificadas = 0
+        for lote in _em_lotes(ids):
+            resultado = self.colecao.update_many(
+                {"_id": {"$in": lote}, "status": {"$ne": status}}, {"$set": {"status": status}, **REVISAO}
+            )
+            encontradas += resultado.matched_count
+            modificadas += resultado.modified_count
+        return SimpleNamespace(matched_count=encontradas, modified_count=modificadas)
+
+    def excluir_muitos(self, ids):
+        """Exclui as tarefas informadas com um delete_many por lote de _id, registrando as exclusões."""
+        excluidas = 0
+        for lote in _em_lotes(ids):
+            resultado = self.colecao.delete_many({"_id": {"$in": lote}})
+            if resultado.deleted_count:
+                registrar_alteracoes(self.colecao, excluidos=lote)
+            excluidas += resultado.deleted_count
+        return SimpleNamespace(deleted_count=excluidas)
+
+    def atualizar_status_filtro(self, filtro_status, status):
+        """Muda o status de todas as tarefas do filtro com um único update_many no servidor.
+
+        Nenhum _id é trazido ao cliente; as tarefas alteradas ganham nova revisão e chegam aos
+        outros clientes (e à réplica local) pelo acompanhamento de alterações.
+        """
+        # As tarefas que já estão no status não são tocadas (nem ganham nova revisão)
+        condicao = {"$ne": status}
+        if filtro_status in ["Pendente", "Concluída"]:
+            condicao["$eq"] = filtro_status
+        return self.colecao.update_many({"status": condicao}, {"$set": {"status": status}, **REVISAO})
+
+    def excluir_filtro(self, filtro_status):
+        """Exclui todas as tarefas do filtro com um único delete_many no servidor.
+
+        As exclusões são registradas antes, também no servidor: um $merge copia os _id do
+        filtro para a coleção de exclusões, que depois recebe a revisão. Tarefas criadas por
+        outro cliente entre as duas etapas são excluídas sem registro (os outros clientes só as
+        deixam de ver ao recarregar).
+        """
+        consulta = {"status": filtro_status} if filtro_status in ["Pendente", "Concluída"] else {}
+        exclusoes = colecao_exclusoes(self.colecao)
+        self.colecao.aggregate([
+            {"$match": consulta},
+            {"$project": {"_id": 1, "excluida_em": "$$NOW"}},
+            {"$merge": {"into": exclusoes.name, "whenMatched": "replace", "whenNotMatched": "insert"}},
+        ])
+        exclusoes.update_many({"revisao": None}, REVISAO)
+        return self.colecao.delete_many(consulta)
+
+    def atualizar(self, id_tarefa, titulo, descricao, status):
+        """Atualiza uma tarefa existente pelo id."""
+        return self.colecao.update_one(
+            {"_id": ObjectId(id_tarefa)}, {"$set": {"titulo": titulo, "descricao": descricao, "status": status}, **REVISAO}
+        )
+
+    def excluir(self, id_tarefa):
+        """Exclui uma tarefa da coleção pelo id."""
+        resultado = self.colecao.delete_one({"_id": ObjectId(id_tarefa)})
+        if resultado.deleted_count:
+            registrar_alteracoes(self.colecao, excluidos=[ObjectId(id_tarefa)])
+        return resultado
+
+    def buscar_por_id(self, id_tarefa):
+        """Busca uma tarefa pelo id."""
+        return self.colecao.find_one({"_id": ObjectId(id_tarefa)})
+
+
+def _em_lotes(ids):
+    """Divide os ids em listas de ObjectId com até TAMANHO_LOTE_EM_MASSA elementos."""
+    ids = [ObjectId(i) for i in ids]
+    for inicio in range(0, len(ids), TAMANHO_LOTE_EM_MASSA):
+        yield ids[inicio:inicio + TAMANHO_LOTE_EM_MASSA]
+
+
+def _estagios_do_plano(plano):
+    """Coleta recursivamente os nomes dos estágios de um plano retornado por explain()."""
+    estagios = []
+    if isinstance(plano, dict):
+        if "stage" in plano:
+            estagios.append(plano["stage"])
+        for valor in plano.values():
+            estagios.extend(_estagios_do_plano(valor))
+    elif isinstance(plano, list):
+        for item in plano:
+            estagios.extend(_estagios_do_plano(item))
+    return estagios
@@ -0,0 +1,258 @@
+from types import SimpleNamespace
+import sqlite3
+
+from model.armazenamento_memoria import GeradorIds, tokenizar, TAMANHO_MINIMO_PREFIXO
+
+
+class ArmazenamentoSqlite:
+    """Armazenamento de tarefas em um arquivo SQLite local, usado quando não há MongoDB.
+
+    O banco roda em modo WAL com synchronous=NORMAL: cada escrita é um append no log, sem
+    fsync por transação, o que sustenta milhares de escritas por segundo. A conexão é usada
+    a partir da thread de trabalho; o acesso é serializado pela trava do TarefaModel.
+
+    A busca usa uma tabela FTS5 (sem acentos, com ranking bm25) mantida por gatilhos. Como a
+    tabela de tarefas não tem rowid, busca_chaves associa cada _id ao rowid da FTS5.
+    """
+
+    ESQUEMA = [
+        """CREATE TABLE IF NOT EXISTS tarefas (
+            _id TEXT PRIMARY KEY,
+            titulo TEXT NOT NULL,
+            descricao TEXT NOT NULL,
+            status TEXT NOT NULL
+        ) WITHOUT ROWID""",
+        # Atende o filtro por status e a paginação por cursor dentro de um status; _id é a chave
+        "CREATE INDEX IF NOT EXISTS idx_tarefas_status_id ON tarefas (status, _id)",
+        # Valores de controle da réplica (ex.: revisão do MongoDB copiada por último)
+        "CREATE TABLE IF NOT EXISTS metadados (chave TEXT PRIMARY KEY, valor TEXT NOT NULL) WITHOUT ROWID",
+    ]
+
+    ESQUEMA_BUSCA = [
+        "CREATE TABLE IF NOT EXISTS busca_chaves (id INTEGER PRIMARY KEY, _id TEXT NOT NULL UNIQUE)",
+        """CREATE VIRTUAL TABLE IF NOT EXISTS tarefas_busca
+            USING fts5(titulo, descricao, tokenize = 'unicode61 remove_diacritics 2')""",
+        # INSERT OR REPLACE não dispara o gatilho de exclusão: a inserção remove a entrada antiga
+        """CREATE TRIGGER IF NOT EXISTS tarefas_busca_inserir AFTER INSERT ON tarefas BEGIN
+            INSERT OR IGNORE INTO busca_chaves (_id) VALUES (new._id);
+            DELETE FROM tarefas_busca WHERE rowid = (SELECT id FROM busca_chaves WHERE _id = new._id);
+            INSERT INTO tarefas_busca (rowid, titulo, descricao)
+                SELECT id, new.titulo, new.descricao FROM busca_chaves WHERE _id = new._id;
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tarefas_busca_atualizar AFTER UPDATE OF titulo, descricao ON tarefas BEGIN
+            UPDATE tarefas_busca SET titulo = new.titulo, descricao = new.descricao
+                WHERE rowid = (SELECT id FROM busca_chaves WHERE _id = new._id);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS tarefas_busca_excluir AFTER DELETE ON tarefas BEGIN
+            DELETE FROM tarefas_busca WHERE rowid = (SELECT id FROM busca_chaves WHERE _id = old._id);
+            DELETE FROM busca_chaves WHERE _id = old._id;
+        END""",
+    ]
+
+    # Pesos do bm25 para titulo e descricao
+    PESOS_BUSCA = (3.0, 1.0)
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        self.conexao.execute("PRAGMA journal_mode=WAL")
+        self.conexao.execute("PRAGMA synchronous=NORMAL")
+        with self.conexao:
+            for comando in self.ESQUEMA:
+                self.conexao.execute(comando)
+            self._criar_busca()
+        self._ids = GeradorIds()
+
+    def _criar_busca(self):
+        """Cria a tabela de busca e seus gatilhos, indexando as tarefas de arquivos anteriores a ela."""
+        existia = self.conexao.execute("SELECT 1 FROM sqlite_master WHERE name = 'tarefas_busca'").fetchone()
+        for comando in self.ESQUEMA_BUSCA:
+            self.conexao.execute(comando)
+        if not existia:
+            self.conexao.execute("INSERT INTO busca_chaves (_id) SELECT _id FROM tarefas")
+            self.conexao.execute(
+                "INSERT INTO tarefas_busca (rowid, titulo, descricao) "
+                "SELECT k.id, t.titulo, t.descricao FROM tarefas t JOIN busca_chaves k ON k._id = t._id"
+            )
+
+    def fechar(self):
+        """Grava o log WAL no arquivo principal e fecha a conexão."""
+        self.conexao.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self.conexao.close()
+
+    def contar(self, filtro_status=None):
+        """Quantidade de tarefas, podendo filtrar por status."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            return self.conexao.execute("SELECT COUNT(*) FROM tarefas WHERE status = ?", (filtro_status,)).fetchone()[0]
+        return self.conexao.execute("SELECT COUNT(*) FROM tarefas").fetchone()[0]
+
+    def contar_por_status(self):
+        """Quantidade total e por status em uma única consulta GROUP BY, respondida pelo índice (status, _id)."""
+        por_status = {"Pendente": 0, "Concluída": 0}
+        por_status.update(self.conexao.execute("SELECT status, COUNT(*) FROM tarefas GROUP BY status"))
+        return {"total": sum(por_status.values()), "por_status": por_status}
+
+    def versao(self, filtro_status=None):
+        """Versão do conteúdo: a quantidade de linhas alteradas por esta conexão, que só cresce.
+
+        É a mesma para todos os filtros (qualquer escrita a avança).
+        """
+        return self.conexao.total_changes
+
+    def buscar(self, texto, filtro_status=None, limite=100, resumo=None):
+        """Tarefas que contêm todas as palavras do texto, da mais relevante para a menos.
+
+        A busca ignora maiúsculas e acentos, e a última palavra também casa como prefixo.
+        """
+        palavras = tokenizar(texto)
+        if not palavras:
+            return []
+        termos = [f'"{p}"' for p in palavras]
+        if len(palavras[-1]) >= TAMANHO_MINIMO_PREFIXO:
+            termos[-1] += "*"
+        descricao = "t.descricao" if resumo is None else f"substr(t.descricao, 1, {int(resumo)}) AS descricao"
+        sql = (
+            f"SELECT t._id, t.titulo, {descricao}, t.status FROM tarefas_busca b "
+            "JOIN busca_chaves k ON k.id = b.rowid JOIN tarefas t ON t._id = k._id "
+            "WHERE tarefas_busca MATCH ?"
+        )
+        parametros = [" ".join(termos)]
+        if filtro_status in ["Pendente", "Concluída"]:
+            sql += " AND t.status = ?"
+            parametros.append(filtro_status)
+        sql += f" ORDER BY bm25(tarefas_busca, {self.PESOS_BUSCA[0]}, {self.PESOS_BUSCA[1]}), t._id DESC LIMIT ?"
+        parametros.append(limite)
+        return [dict(linha) for linha in self.conexao.execute(sql, parametros)]
+
+    def listar(self, filtro_status=None):
+        """Lista todas as tarefas, podendo filtrar por status."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            linhas = self.conexao.execute("SELECT * FROM tarefas WHERE status = ? ORDER BY _id", (filtro_status,))
+        else:
+            linhas = self.conexao.execute("SELECT * FROM tarefas ORDER BY _id")
+        return [dict(linha) for linha in linhas]
+
+    def listar_pagina(self, filtro_status=None, tamanho_pagina=100, apos=None, contar_total=False, resumo=None):
+        """Lista uma página de tarefas ordenadas por _id, a partir do cursor `apos` (exclusivo).
+
+        Com `resumo` (quantidade de caracteres), a descrição é truncada na própria consulta.
+        """
+        condicoes, parametros = [], []
+        if filtro_status in ["Pendente", "Concluída"]:
+            condicoes.append("status = ?")
+            parametros.append(filtro_status)
+        else:
+            filtro_status = None
+        if apos is not None:
+            condicoes.append("_id > ?")
+            parametros.append(str(apos))
+        descricao = "descricao" if resumo is None else f"substr(descricao, 1, {int(resumo)}) AS descricao"
+        sql = f"SELECT _id, titulo, {descricao}, status FROM tarefas"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        # Busca um item a mais para saber se existe próxima página
+        sql += " ORDER BY _id LIMIT ?"
+        parametros.append(tamanho_pagina + 1)
+        pagina = [dict(linha) for linha in self.conexao.execute(sql, parametros)]
+        ha_mais = len(pagina) > tamanho_pagina
+        pagina = pagina[:tamanho_pagina]
+        return {
+            "tarefas": pagina,
+            "proximo_cursor": pagina[-1]["_id"] if ha_mais else None,
+            "total": self.contar(filtro_status) if contar_total else None
+        }
+
+    def adicionar(self, titulo, descricao, status):
+        """Adiciona uma nova tarefa ao arquivo local."""
+        id_tarefa = self._ids.novo()
+        with self.conexao:
+            self.conexao.execute(
+                "INSERT INTO tarefas (_id, titulo, descricao, status) VALUES (?, ?, ?, ?)",
+                (id_tarefa, titulo, descricao, status)
+            )
+        return SimpleNamespace(inserted_id=id_tarefa)
+
+    def gravar(self, tarefa):
+        """Insere a tarefa com o _id informado ou substitui a existente (usado na réplica local)."""
+        self.adicionar_muitos([tarefa])
+
+    def adicionar_muitos(self, tarefas):
+        """Grava várias tarefas em uma única transação, preservando os _id informados."""
+        with self.conexao:
+            self._gravar_muitos(tarefas)
+
+    def _gravar_muitos(self, tarefas):
+        """Grava as tarefas na transação em andamento."""
+        self.conexao.executemany(
+            "INSERT OR REPLACE INTO tarefas (_id, titulo, descricao, status) VALUES (?, ?, ?, ?)",
+            ((str(t["_id"]), t["titulo"], t["descricao"], t["status"]) for t in tarefas)
+        )
+
+    def substituir(self, lotes):
+        """Substitui todas as tarefas pelas dos lotes (listas de tarefas com _id) em uma única transação.
+
+        Se a leitura dos lotes falhar no meio, a transação é desfeita e o arquivo continua com
+        as tarefas anteriores.
+        """
+        with self.conexao:
+            self.conexao.execute("DELETE FROM tarefas")
+            for lote in lotes:
+                self._gravar_muitos(lote)
+
+    def ler_metadado(self, chave):
+        """Valor guardado com gravar_metadado, ou None."""
+        linha = self.conexao.execute("SELECT valor FROM metadados WHERE chave = ?", (chave,)).fetchone()
+        return linha[0] if linha is not None else None
+
+    def gravar_metadado(self, chave, valor):
+        """Guarda um valor de controle da réplica, mantido no arquivo."""
+        with self.conexao:
+            self.conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor) VALUES (?, ?)", (chave, valor))
+
+    def atualizar(self, id_tarefa, titulo, descricao, status):
+        """Atualiza uma tarefa existente pelo id."""
+        with self.conexao:
+            cursor = self.conexao.execute(
+                "UPDATE tarefas SET titulo = ?, descricao = ?, status = ? WHERE _id = ?",
+                (titulo, descricao, status, str(id_tarefa))
+            )
+        return SimpleNamespace(matched_count=cursor.rowcount, modified_count=cursor.rowcount)
+
+    def excluir(self, id_tarefa):
+        """Exclui uma tarefa do arquivo local pelo id."""
+        with self.conexao:
+            cursor = self.conexao.execute("DELETE FROM tarefas WHERE _id = ?", (str(id_tarefa),))
+        return SimpleNamespace(deleted_count=cursor.rowcount)
+
+    def listar_ids(self, filtro_status=None):
+        """_id das tarefas (podendo filtrar por status), em ordem crescente; lidos só do índice."""
+        if filtro_status in ["Pendente", "Concluída"]:
+            linhas = self.conexao.execute("SELECT _id FROM tarefas WHERE status = ? ORDER BY _id", (filtro_status,))
+        else:
+            linhas = self.conexao.execute("SELECT _id FROM tarefas ORDER BY _id")
+        return [linha[0] for linha in linhas]
+
+    def atualizar_status_muitos(self, ids, status):
+        """Muda o status das tarefas informadas em uma única transação (as que já estão nele ficam como estão)."""
+        with self.conexao:
+            cursor = self.conexao.executemany(
+                "UPDATE tarefas SET status = ? WHERE _id = ? AND status != ?", ((status, str(i), status) for i in ids)
+            )
+        return SimpleNamespace(matched_count=cursor.rowcount, modified_count=cursor.rowcount)
+
+    def excluir_muitos(self, ids):
+        """Exclui as tarefas informadas em uma única transação."""
+        with self.conexao:
+            cursor = self.conexao.executemany("DELETE FROM tarefas WHERE _id = ?", ((str(i),) for i in ids))
+        return SimpleNamespace(deleted_count=cursor.rowcount)
+
+    def esvaziar(self):
+        """Remove todas as tarefas (usado antes de recarregar a réplica a partir do MongoDB)."""
+        with self.conexao:
+            self.conexao.execute("DELETE FROM tarefas")
+
+    def buscar_por_id(self, id_tarefa):
+        """Busca uma tarefa pelo id."""
+        linha = self.conexao.execute("SELECT * FROM tarefas WHERE _id = ?", (str(id_tarefa),)).fetchone()
+        return dict(linha) if linha is not None else None
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import os
+import sys
+import time
+
+# Limites do cache de leituras do TarefaModel (CACHE_ENTRADAS=0 desativa o cache)
+CACHE_ENTRADAS = int(os.getenv('CACHE_ENTRADAS', '1024'))
+CACHE_MB = float(os.getenv('CACHE_MB', '64'))
+# Validade de cada entrada em segundos (0 = sem expiração); limita o atraso em relação a
+# escritas de outros clientes quando o acompanhamento de alterações está desligado
+CACHE_TTL_S = float(os.getenv('CACHE_TTL_S', '60'))
+
+AUSENTE = object()
+
+
+def estimar_bytes(valor):
+    """Tamanho aproximado em memória de resultados do model (tarefas, listas e páginas)."""
+    tamanho = sys.getsizeof(valor)
+    if isinstance(valor, dict):
+        tamanho += sum(estimar_bytes(v) for v in valor.values())
+    elif isinstance(valor, (list, tuple)):
+        tamanho += sum(estimar_bytes(v) for v in valor)
+    return tamanho
+
+
+class CacheLRU:
+    """Cache chave -> valor limitado por quantidade de entradas e por bytes, com validade opcional.
+
+    Ao passar de um dos limites, as entradas usadas há mais tempo são descartadas primeiro.
+    O acesso é serializado pela trava do TarefaModel.
+    """
+
+    def __init__(self, max_entradas=CACHE_ENTRADAS, max_bytes=int(CACHE_MB * 1024 * 1024), ttl_s=CACHE_TTL_S):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._entradas = OrderedDict()  # chave -> (valor, bytes, expira_em), da menos à mais recente
+        self._bytes = 0
+        self.acertos = self.falhas = self.despejos = self.expiradas = self.invalidacoes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obter(self, chave, validar=None):
+        """Valor guardado para a chave, ou AUSENTE (entrada inexistente ou expirada).
+
+        `validar(valor)`, se informado, confirma se o valor ainda vale (ex.: mesma versão do
+        armazenamento); se não valer, a entrada é descartada como expirada.
+        """
+        entrada = self._entradas.get(chave)
+        if entrada is not None and (
+            (entrada[2] is not None and entrada[2] <= time.monotonic()) or (validar is not None and not validar(entrada[0]))
+        ):
+            self._descartar(chave)
+            self.expiradas += 1
+            entrada = None
+        if entrada is None:
+            self.falhas += 1
+            return AUSENTE
+        self._entradas.move_to_end(chave)
+        self.acertos += 1
+        return entrada[0]
+
+    def guardar(self, chave, valor):
+        """Guarda o valor, descartando as entradas menos usadas se passar dos limites."""
+        if self.max_entradas <= 0:
+            return
+        if chave in self._entradas:
+            self._descartar(chave)
+        tamanho = estimar_bytes(valor)
+        if tamanho > self.max_bytes:
+            return
+        expira_em = time.monotonic() + self.ttl_s if self.ttl_s > 0 else None
+        self._entradas[chave] = (valor, tamanho, expira_em)
+        self._bytes += tamanho
+        while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+            self._descartar(next(iter(self._entradas)))
+            self.despejos += 1
+
+    def invalidar(self, chave):
+        """Descarta a entrada da chave, se houver."""
+        if chave in self._entradas:
+            self._descartar(chave)
+            self.invalidacoes += 1
+
+    def invalidar_onde(self, condicao):
+        """Descarta as entradas cujas chaves satisfazem condicao(chave)."""
+        for chave in [c for c in self._entradas if condicao(c)]:
+            self._descartar(chave)
+            self.invalidacoes += 1
+
+    def limpar(self):
+        """Descarta todas as entradas (os contadores são mantidos)."""
+        self.invalidacoes += len(self._entradas)
+        self._entradas.clear()
+        self._bytes = 0
+
+    def _descartar(self, chave):
+        """Remove a entrada e desconta seu tamanho."""
+        _, tamanho, _ = self._entradas.pop(chave)
+        self._bytes -= tamanho
+
+    def estatisticas(self):
+        """Contadores para dimensionar o cache."""
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+            "despejos": self.despejos,
+            "expiradas": self.expiradas,
+            "invalidacoes": self.invalidacoes,
+            "entradas": len(self._entradas),
+            "bytes": self._bytes,
+        }
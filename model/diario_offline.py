@@ -0,0 +1,186 @@
+import json
+import os
+import time
+
+# O diário é usado sem conexão; o pymongo (e o bson) só é importado na reprodução no MongoDB
+
+# Operações do diário enviadas ao MongoDB por bulk_write na reprodução
+TAMANHO_LOTE_REPRODUCAO = int(os.getenv('DIARIO_LOTE_REPRODUCAO', '1000'))
+
+CAMPOS_TAREFA = ("titulo", "descricao", "status")
+
+
+class DiarioOffline:
+    """Diário das escritas feitas sem conexão, a reproduzir no MongoDB quando ela voltar.
+
+    Cada entrada é {"operacao": "inserir" | "atualizar" | "excluir", "_id", "campos", "antes"},
+    onde "antes" guarda a tarefa como estava na réplica local antes da escrita (None para
+    inserções) e serve para detectar conflitos com alterações feitas no servidor nesse meio
+    tempo (sem "antes", a escrita é aplicada sem verificação). Com um caminho, as entradas
+    também são acrescentadas a um arquivo JSONL e sobrevivem ao fechamento da aplicação.
+    """
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho
+        self._entradas = []
+        self._arquivo = None
+        if caminho:
+            if os.path.exists(caminho):
+                with open(caminho, encoding="utf-8") as arquivo:
+                    self._entradas = [json.loads(linha) for linha in arquivo if linha.strip()]
+            self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def registrar(self, operacao, id_tarefa, campos=None, antes=None, verificar=True):
+        """Acrescenta uma escrita ao diário; verificar=False quando o estado anterior é desconhecido."""
+        entrada = {"operacao": operacao, "_id": str(id_tarefa), "campos": campos}
+        if verificar:
+            entrada["antes"] = antes
+        self._entradas.append(entrada)
+        if self._arquivo is not None:
+            self._arquivo.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            self._arquivo.flush()
+
+    def registrar_muitos(self, escritas):
+        """Acrescenta várias escritas (operacao, _id, campos, antes) de uma vez, gravando o arquivo uma só vez."""
+        novas = [
+            {"operacao": operacao, "_id": str(id_tarefa), "campos": campos, "antes": antes}
+            for operacao, id_tarefa, campos, antes in escritas
+        ]
+        self._entradas.extend(novas)
+        if self._arquivo is not None:
+            self._arquivo.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in novas)
+            self._arquivo.flush()
+
+    def entradas(self):
+        """Cópia das entradas na ordem em que foram registradas."""
+        return list(self._entradas)
+
+    def substituir(self, entradas):
+        """Mantém no diário apenas as entradas informadas (as ainda não reproduzidas)."""
+        self._entradas = list(entradas)
+        if self._arquivo is not None:
+            self._arquivo.close()
+            with open(self.caminho, "w", encoding="utf-8") as arquivo:
+                arquivo.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in self._entradas)
+            self._arquivo = open(self.caminho, "a", encoding="utf-8")
+
+    def fechar(self):
+        """Fecha o arquivo do diário."""
+        if self._arquivo is not None:
+            self._arquivo.close()
+            self._arquivo = None
+
+
+def reproduzir_diario(diario, colecao, tamanho_lote=TAMANHO_LOTE_REPRODUCAO):
+    """Aplica o diário no MongoDB, em ordem e em lotes de bulk_write, e o esvazia.
+
+    Antes da primeira escrita de cada _id, a tarefa no servidor é comparada com o estado
+    "antes" registrado offline; se divergir (alterada ou excluída por outro cliente, ou _id já
+    existente), todas as escritas dessa tarefa são descartadas e reportadas como conflito,
+    prevalecendo a versão do servidor. Retorna um relatório com contagens, conflitos e vazão.
+    Se a conexão cair no meio, as entradas não reproduzidas permanecem no diário.
+    """
+    from pymongo.errors import PyMongoError
+    entradas = diario.entradas()
+    inicio = time.perf_counter()
+    verificados, conflitos = set(), {}
+    aplicadas = 0
+    for posicao in range(0, len(entradas), tamanho_lote):
+        lote = entradas[posicao:posicao + tamanho_lote]
+        try:
+            aplicadas += _reproduzir_lote(lote, colecao, verificados, conflitos)
+        except PyMongoError:
+            diario.substituir(entradas[posicao:])
+            raise
+    diario.substituir([])
+    segundos = time.perf_counter() - inicio
+    relatorio = {
+        "operacoes": len(entradas),
+        "aplicadas": aplicadas,
+        "conflitos": [{"_id": i, "motivo": m} for i, m in conflitos.items()],
+        "segundos": segundos,
+        "operacoes_por_segundo": len(entradas) / segundos if segundos > 0 else 0.0,
+    }
+    if entradas:
+        print(
+            f"Diário offline reproduzido: {aplicadas}/{len(entradas)} operações em {segundos:.2f} s "
+            f"({relatorio['operacoes_por_segundo']:.0f} op/s), {len(conflitos)} conflito(s)"
+        )
+        for conflito in relatorio["conflitos"]:
+            print(f"  Conflito na tarefa {conflito['_id']}: {conflito['motivo']}")
+    return relatorio
+
+
+def _reproduzir_lote(lote, colecao, verificados, conflitos):
+    """Verifica conflitos das tarefas vistas pela primeira vez e envia o lote; retorna as aplicadas."""
+    from bson import ObjectId
+    from pymongo import InsertOne, DeleteOne
+    from pymongo.errors import BulkWriteError
+    from model.armazenamento_mongo import registrar_alteracoes
+    novos = {e["_id"] for e in lote if e["_id"] not in verificados and e["_id"] not in conflitos}
+    no_servidor = {}
+    if novos:
+        consulta = {"_id": {"$in": [ObjectId(i) for i in novos]}}
+        no_servidor = {str(d["_id"]): d for d in colecao.find(consulta)}
+
+    escritas = []
+    for entrada in lote:
+        id_tarefa = entrada["_id"]
+        if id_tarefa in conflitos:
+            continue
+        if id_tarefa not in verificados:
+            verificados.add(id_tarefa)
+            motivo = _motivo_conflito(entrada, no_servidor.get(id_tarefa))
+            if motivo:
+                conflitos[id_tarefa] = motivo
+                continue
+        escritas.append((id_tarefa, _operacao_mongo(entrada)))
+
+    aplicadas = 0
+    inseridos = [ObjectId(i) for i, o in escritas if isinstance(o, InsertOne)]
+    excluidos = [ObjectId(i) for i, o in escritas if isinstance(o, DeleteOne)]
+    while escritas:
+        try:
+            colecao.bulk_write([operacao for _, operacao in escritas], ordered=True)
+            aplicadas += len(escritas)
+            break
+        except BulkWriteError as e:
+            # Em lote ordenado o envio para no primeiro erro: a tarefa vira conflito e o resto segue
+            erro = e.details["writeErrors"][0]
+            aplicadas += erro["index"]
+            id_falha = escritas[erro["index"]][0]
+            conflitos[id_falha] = erro.get("errmsg", "escrita recusada pelo servidor")
+            escritas = [(i, o) for i, o in escritas[erro["index"] + 1:] if i != id_falha]
+    # Inserções e exclusões não levam $currentDate: a revisão é registrada à parte
+    registrar_alteracoes(colecao, [i for i in inseridos if str(i) not in conflitos], excluidos)
+    return aplicadas
+
+
+def _motivo_conflito(entrada, documento):
+    """Compara a tarefa no servidor com o estado anterior registrado; None se não há conflito."""
+    if "antes" not in entrada:
+        return None
+    antes = entrada["antes"]
+    if antes is None:
+        return "_id já existe no servidor" if documento is not None else None
+    if documento is None:
+        return "excluída no servidor"
+    if any(documento.get(campo) != antes.get(campo) for campo in CAMPOS_TAREFA):
+        return "alterada no servidor"
+    return None
+
+
+def _operacao_mongo(entrada):
+    """Converte uma entrada do diário na operação de bulk_write correspondente."""
+    from bson import ObjectId
+    from pymongo import InsertOne, UpdateOne, DeleteOne
+    from model.armazenamento_mongo import REVISAO
+    id_tarefa = ObjectId(entrada["_id"])
+    if entrada["operacao"] == "inserir":
+        return InsertOne(dict(entrada["campos"], _id=id_tarefa))
+    if entrada["operacao"] == "atualizar":
+        return UpdateOne({"_id": id_tarefa}, {"$set": entrada["campos"], **REVISAO})
+    return DeleteOne({"_id": id_tarefa})
@@ -0,0 +1,271 @@
+from types import SimpleNamespace
+import atexit
+import os
+import threading
+
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import PyMongoError, BulkWriteError
+
+from model.armazenamento_mongo import REVISAO, registrar_alteracoes
+
+# Quantidade de operações pendentes que dispara o envio imediato do lote
+TAMANHO_LOTE_ESCRITA = int(os.getenv('ESCRITA_ADIADA_LOTE', '500'))
+
+# Tempo máximo (ms) que uma escrita fica pendente antes de ser enviada
+INTERVALO_ESCRITA_MS = int(os.getenv('ESCRITA_ADIADA_INTERVALO_MS', '1000'))
+
+
+class EscritaAdiada:
+    """Camada de escrita adiada (write-behind) na frente do ArmazenamentoMongo.
+
+    adicionar/atualizar/excluir apenas registram a operação e retornam na hora; as pendências
+    são agrupadas por _id (várias edições da mesma tarefa viram uma só, e inserir + excluir se
+    anulam) e enviadas em um único bulk_write quando o lote enche, quando o intervalo expira,
+    antes de qualquer leitura e ao encerrar. Os resultados das escritas são otimistas: uma
+    atualização de tarefa inexistente só é percebida pelo servidor no envio do lote.
+    """
+
+    def __init__(self, armazenamento, tamanho_lote=TAMANHO_LOTE_ESCRITA, intervalo_ms=INTERVALO_ESCRITA_MS):
+        self.armazenamento = armazenamento
+        self.tamanho_lote = tamanho_lote
+        self.intervalo_ms = intervalo_ms
+        self._pendentes = {}  # ObjectId -> ("inserir", documento) | ("atualizar", campos) | ("excluir", None)
+        self._trava = threading.RLock()
+        self._temporizador = None
+        self.operacoes_recebidas = 0
+        self.idas_ao_servidor = 0
+        self.operacoes_recusadas = 0
+        # callback(recusadas) chamado, fora da trava, com as operações recusadas pelo servidor
+        self.ao_recusar = None
+        atexit.register(self.descarregar)
+
+    def estatisticas(self):
+        """Operações recebidas, lotes enviados ao servidor e operações ainda pendentes."""
+        with self._trava:
+            return {
+                "operacoes_recebidas": self.operacoes_recebidas,
+                "idas_ao_servidor": self.idas_ao_servidor,
+                "recusadas": self.operacoes_recusadas,
+                "pendentes": len(self._pendentes),
+            }
+
+    def _registrar(self, id_tarefa, operacao):
+        """Guarda a operação pendente e agenda o envio por tamanho ou por tempo."""
+        self.operacoes_recebidas += 1
+        if operacao is None:
+            self._pendentes.pop(id_tarefa, None)
+        else:
+            self._pendentes[id_tarefa] = operacao
+        if len(self._pendentes) >= self.tamanho_lote:
+            # A escrita já está na fila: uma falha no envio não chega a quem escreveu (que a
+            # repetiria no diário offline); o lote é reenviado pelo temporizador ou pela próxima leitura
+            self._descarregar_automatico()
+        elif self._pendentes and self._temporizador is None:
+            self._registrar_temporizador()
+
+    def _registrar_temporizador(self):
+        """Agenda o envio das pendências para daqui a intervalo_ms."""
+        self._temporizador = threading.Timer(self.intervalo_ms / 1000, self._descarregar_automatico)
+        self._temporizador.daemon = True
+        self._temporizador.start()
+
+    def descarregar(self):
+        """Envia agora todas as operações pendentes em um único bulk_write.
+
+        Retorna as operações recusadas pelo servidor (ex.: _id repetido), como
+        (operacao, _id, mensagem), que também são passadas a ao_recusar.
+        """
+        recusadas = self._enviar()
+        if recusadas and self.ao_recusar is not None:
+            self.ao_recusar(recusadas)
+        return recusadas
+
+    def _enviar(self):
+        """Envia as pendências e retorna as operações recusadas."""
+        with self._trava:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            if not self._pendentes:
+                return []
+            pendentes, self._pendentes = self._pendentes, {}
+            operacoes, ordem = [], []  # ordem[i] = (tipo, _id) de operacoes[i]
+            for id_tarefa, (tipo, dados) in pendentes.items():
+                if tipo == "inserir":
+                    operacoes.append(InsertOne(dados))
+                elif tipo == "atualizar":
+                    operacoes.append(UpdateOne({"_id": id_tarefa}, {"$set": dados, **REVISAO}))
+                else:
+                    operacoes.append(DeleteOne({"_id": id_tarefa}))
+                ordem.append((tipo, id_tarefa))
+            colecao = self.armazenamento.colecao
+            erros = []
+            try:
+                self.idas_ao_servidor += 1
+                colecao.bulk_write(operacoes, ordered=False)
+            except BulkWriteError as e:
+                # As demais operações do lote foram aplicadas; as recusadas não são repetidas
+                erros = e.details.get("writeErrors", [])
+            except PyMongoError as e:
+                # Falha de comunicação: o lote volta para a fila e é reenviado no próximo envio
+                print(f"Falha ao enviar escritas ao MongoDB, nova tentativa em seguida: {e}")
+                pendentes.update(self._pendentes)
+                self._pendentes = pendentes
+                raise
+            # As operações aplicadas, inclusive as de um lote com recusas, recebem a revisão
+            recusados = {erro["index"] for erro in erros}
+            aplicadas = [(tipo, i) for indice, (tipo, i) in enumerate(ordem) if indice not in recusados]
+            registrar_alteracoes(
+                colecao, [i for tipo, i in aplicadas if tipo == "inserir"], [i for tipo, i in aplicadas if tipo == "excluir"]
+            )
+            self.operacoes_recusadas += len(erros)
+            return [(ordem[erro["index"]][0], str(ordem[erro["index"]][1]), erro.get("errmsg", "")) for erro in erros]
+
+    def _descarregar_automatico(self):
+        """Envio disparado pelo temporizador ou pelo lote cheio; em caso de falha, reagenda uma nova tentativa."""
+        try:
+            self.descarregar()
+        except PyMongoError:
+            with self._trava:
+                if self._pendentes and self._temporizador is None:
+                    self._registrar_temporizador()
+
+    def retirar_pendentes(self):
+        """Remove e retorna as operações ainda não enviadas, como (operacao, _id, campos).
+
+        Usado ao perder a conexão, para que as pendências passem ao diário offline.
+        """
+        with self._trava:
+            if self._temporizador is not None:
+                self._temporizador.cancel()
+                self._temporizador = None
+            pendentes, self._pendentes = self._pendentes, {}
+        retiradas = []
+        for id_tarefa, (tipo, dados) in pendentes.items():
+            campos = None if dados is None else {c: v for c, v in dados.items() if c != "_id"}
+            retiradas.append((tipo, str(id_tarefa), campos))
+        return retiradas
+
+    def fechar(self):
+        """Envia as pendências e deixa de ser chamada na saída do processo."""
+        self.descarregar()
+        atexit.unregister(self.descarregar)
+
+    def adicionar(self, titulo, descricao, status):
+        """Registra a inserção com _id gerado no cliente."""
+        id_tarefa = ObjectId()
+        with self._trava:
+            self._registrar(id_tarefa, ("inserir", {"_id": id_tarefa, "titulo": titulo, "descricao": descricao, "status": status}))
+        return SimpleNamespace(inserted_id=id_tarefa)
+
+    def atualizar(self, id_tarefa, titulo, descricao, status):
+        """Registra a atualização, agrupando-a com outra pendente da mesma tarefa."""
+        id_tarefa = ObjectId(id_tarefa)
+        campos = {"titulo": titulo, "descricao": descricao, "status": status}
+        with self._trava:
+            tipo, dados = self._pendentes.get(id_tarefa, (None, None))
+            if tipo == "excluir":
+                return SimpleNamespace(matched_count=0, modified_count=0)
+            if tipo == "inserir":
+                # Ainda não chegou ao servidor: a inserção já leva os valores novos
+                self._registrar(id_tarefa, ("inserir", dict(dados, **campos)))
+            else:
+                self._registrar(id_tarefa, ("atualizar", campos))
+        return SimpleNamespace(matched_count=1, modified_count=1)
+
+    def excluir(self, id_tarefa):
+        """Registra a exclusão; uma tarefa ainda não enviada é apenas descartada."""
+        id_tarefa = ObjectId(id_tarefa)
+        with self._trava:
+            tipo, _ = self._pendentes.get(id_tarefa, (None, None))
+            if tipo == "excluir":
+                return SimpleNamespace(deleted_count=0)
+            self._registrar(id_tarefa, None if tipo == "inserir" else ("excluir", None))
+        return SimpleNamespace(deleted_count=1)
+
+    # As leituras enviam as pendências antes, para sempre refletirem as próprias escritas.
+    # O TarefaModel só as usa para o que precisa do servidor (páginas, busca, exportação):
+    # versão, contagem e tarefa por id vêm da réplica local, sem enviar o lote.
+
+    def listar(self, filtro_status=None):
+        """Lista todas as tarefas, podendo filtrar por status."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.listar(filtro_status)
+
+    def listar_pagina(self, filtro_status=None, tamanho_pagina=100, apos=None, contar_total=False, resumo=None):
+        """Lista uma página de tarefas ordenadas por _id (ver ArmazenamentoMongo.listar_pagina)."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.listar_pagina(filtro_status, tamanho_pagina, apos, contar_total, resumo)
+
+    def buscar(self, texto, filtro_status=None, limite=100, resumo=None):
+        """Busca textual (ver ArmazenamentoMongo.buscar)."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.buscar(texto, filtro_status, limite, resumo)
+
+    def iterar(self, filtro_status=None, tamanho_lote=1000):
+        """Percorre as tarefas por um cursor no servidor (ver ArmazenamentoMongo.iterar)."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.iterar(filtro_status, tamanho_lote)
+
+    def versao(self, filtro_status=None):
+        """Versão da coleção, já considerando as escritas pendentes."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.versao(filtro_status)
+
+    def contar_por_status(self):
+        """Quantidade total e por status, já considerando as escritas pendentes."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.contar_por_status()
+
+    def buscar_por_id(self, id_tarefa):
+        """Busca uma tarefa pelo id."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.buscar_por_id(id_tarefa)
+
+    def adicionar_muitos(self, tarefas):
+        """Insere várias tarefas de uma vez, já em lote, sem passar pela fila."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.adicionar_muitos(tarefas)
+
+    def listar_ids(self, filtro_status=None):
+        """_id das tarefas do filtro, já considerando as escritas pendentes."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.listar_ids(filtro_status)
+
+    def atualizar_status_muitos(self, ids, status):
+        """Muda o status de várias tarefas de uma vez, já em lote, sem passar pela fila."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.atualizar_status_muitos(ids, status)
+
+    def excluir_muitos(self, ids):
+        """Exclui várias tarefas de uma vez, já em lote, sem passar pela fila."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.excluir_muitos(ids)
+
+    def atualizar_status_filtro(self, filtro_status, status):
+        """Muda o status de todas as tarefas do filtro no servidor, depois das pendências."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.atualizar_status_filtro(filtro_status, status)
+
+    def excluir_filtro(self, filtro_status):
+        """Exclui todas as tarefas do filtro no servidor, depois das pendências."""
+        with self._trava:
+            self.descarregar()
+            return self.armazenamento.excluir_filtro(filtro_status)
+
+    def diagnosticar_consultas(self):
+        """Relatório de explain() das consultas do MongoDB."""
+        return self.armazenamento.diagnosticar_consultas()
@@ -0,0 +1,129 @@
+import os
+import threading
+
+from bson import Timestamp
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure, PyMongoError
+
+from model.armazenamento_mongo import colecao_exclusoes, revisao_atual
+
+# Intervalo (ms) entre consultas de alterações quando change streams não estão disponíveis
+INTERVALO_NOTIFICACOES_MS = int(os.getenv('NOTIFICACOES_INTERVALO_MS', '1000'))
+
+# Janela (s) relida a cada consulta para não perder escritas concorrentes com revisão menor
+MARGEM_REVISAO_S = 2
+
+# Alterações trazidas por página de consulta (e por lote do change stream)
+LIMITE_ALTERACOES = 1000
+
+# Ordem das consultas de revisão: (revisao, _id) é única, o que permite paginar sem repetir
+ORDEM_REVISAO = [("revisao", ASCENDING), ("_id", ASCENDING)]
+
+
+class MonitorAlteracoes:
+    """Acompanha as alterações feitas na coleção (por qualquer cliente) e as entrega em lotes.
+
+    Usa change streams quando o servidor permite (replica set); caso contrário consulta, a
+    cada intervalo, as tarefas e exclusões com "revisao" (timestamp gerado pelo servidor em
+    cada escrita) maior que a última vista, pelos índices de revisão: sem alterações, cada
+    consulta não lê nenhum documento. Cada lote é uma lista de ("gravada", tarefa) ou
+    ("excluida", _id) entregue a ao_alterar na thread do monitor.
+    """
+
+    def __init__(self, colecao, ao_alterar, intervalo_ms=INTERVALO_NOTIFICACOES_MS):
+        self.colecao = colecao
+        self.exclusoes = colecao_exclusoes(colecao)
+        self.ao_alterar = ao_alterar
+        self.intervalo_ms = intervalo_ms
+        self.modo = None  # "change_stream" ou "consulta", definido ao iniciar
+        self._parar = threading.Event()
+        self._vistas = {}  # (tipo, _id) -> revisão já entregue, dentro da janela de margem
+        self._ultima = revisao_atual(colecao)  # ponto de partida do monitor
+
+    def iniciar(self):
+        """Começa a acompanhar as alterações em uma thread própria."""
+        threading.Thread(target=self._executar, name="monitor-alteracoes", daemon=True).start()
+
+    def parar(self):
+        """Interrompe o acompanhamento."""
+        self._parar.set()
+
+    def _executar(self):
+        """Acompanha por change stream e, se indisponível ou interrompido, por consulta."""
+        try:
+            self._acompanhar_change_stream()
+            return
+        except OperationFailure:
+            # Servidor sem replica set: change streams indisponíveis
+            print("Change streams indisponíveis; alterações acompanhadas por consulta de revisão.")
+        except PyMongoError as e:
+            print(f"Change stream interrompido, alterações acompanhadas por consulta de revisão: {e}")
+        self.modo = "consulta"
+        self._acompanhar_por_consulta()
+
+    def _acompanhar_change_stream(self):
+        """Entrega os eventos do change stream da coleção até parar() ser chamado."""
+        with self.colecao.watch(full_document="updateLookup", max_await_time_ms=self.intervalo_ms) as fluxo:
+            self.modo = "change_stream"
+            while not self._parar.is_set() and fluxo.alive:
+                eventos = []
+                mudanca = fluxo.try_next()
+                while mudanca is not None and len(eventos) < LIMITE_ALTERACOES:
+                    if mudanca["operationType"] == "delete":
+                        eventos.append(("excluida", str(mudanca["documentKey"]["_id"])))
+                    elif mudanca.get("fullDocument") is not None:
+                        eventos.append(("gravada", _sem_revisao(mudanca["fullDocument"])))
+                    mudanca = fluxo.try_next()
+                if eventos:
+                    self.ao_alterar(eventos)
+
+    def _acompanhar_por_consulta(self):
+        """Consulta as alterações a cada intervalo até parar() ser chamado."""
+        while not self._parar.wait(self.intervalo_ms / 1000):
+            try:
+                eventos = self._consultar()
+            except PyMongoError as e:
+                # Sem conexão: o model volta à réplica local e cria outro monitor ao reconectar
+                print(f"Falha ao consultar alterações: {e}")
+                continue
+            if eventos:
+                self.ao_alterar(eventos)
+
+    def _consultar(self):
+        """Alterações com revisão posterior à última vista (menos a margem), ainda não entregues.
+
+        A janela é lida em páginas de LIMITE_ALTERACOES, cada uma continuando do (revisao, _id)
+        exato em que a anterior parou, até uma página vir incompleta: uma escrita em massa com
+        milhares de tarefas na mesma revisão não prende o monitor nas primeiras páginas.
+        """
+        desde = Timestamp(max(self._ultima.time - MARGEM_REVISAO_S, 0), 0)
+        eventos = []
+        consultas = ((self.colecao, "gravada"), (self.exclusoes, "excluida"))
+        for colecao, tipo in consultas:
+            cursor = None  # (revisao, _id) do último documento lido
+            while True:
+                consulta = {"revisao": {"$gt": desde}}
+                if cursor is not None:
+                    revisao, ultimo_id = cursor
+                    consulta = {"$or": [{"revisao": {"$gt": revisao}}, {"revisao": revisao, "_id": {"$gt": ultimo_id}}]}
+                documentos = list(colecao.find(consulta).sort(ORDEM_REVISAO).limit(LIMITE_ALTERACOES))
+                for documento in documentos:
+                    chave = (tipo, str(documento["_id"]))
+                    if self._vistas.get(chave) == documento["revisao"]:
+                        continue
+                    self._vistas[chave] = documento["revisao"]
+                    eventos.append(("gravada", _sem_revisao(documento)) if tipo == "gravada" else ("excluida", chave[1]))
+                    if documento["revisao"] > self._ultima:
+                        self._ultima = documento["revisao"]
+                if len(documentos) < LIMITE_ALTERACOES:
+                    break
+                cursor = (documentos[-1]["revisao"], documentos[-1]["_id"])
+        # Só é preciso lembrar das revisões que a próxima consulta ainda vai reler
+        limite = Timestamp(max(self._ultima.time - MARGEM_REVISAO_S, 0), 0)
+        self._vistas = {chave: revisao for chave, revisao in self._vistas.items() if revisao > limite}
+        return eventos
+
+
+def _sem_revisao(documento):
+    """Tarefa como exibida pela aplicação, sem o campo de controle "revisao"."""
+    return {campo: valor for campo, valor in documento.items() if campo != "revisao"}
@@ -1,85 +1,718 @@
-from database.database import MongoContext
-from bson import ObjectId
-import uuid
+from database.database import MongoContext, erros_conexao
+from model.armazenamento_memoria import ArmazenamentoMemoria, GeradorIds
+from model.armazenamento_sqlite import ArmazenamentoSqlite
+from model.cache import CacheLRU, AUSENTE
+from model.diario_offline import DiarioOffline
+from utils.rastreamento import rastrear, trecho
+from model.transferencia import (
+    EscritorTarefas, TAMANHO_LOTE_TRANSFERENCIA, formato_do_caminho, ler_registros, normalizar_tarefa
+)
+from types import SimpleNamespace
+import hashlib
+import threading
+import time
+import os
+
+# Quantidade padrão de tarefas por página na listagem paginada
+TAMANHO_PAGINA = int(os.getenv('TAMANHO_PAGINA', '200'))
+
+# Caracteres da descrição trazidos na listagem resumida (os cards exibem no máximo 100 + "...")
+TAMANHO_RESUMO_DESCRICAO = 101
+
+# Máximo de tarefas retornadas pela busca textual (as mais relevantes)
+LIMITE_BUSCA = 200
+
+# Réplica local usada sem conexão com o MongoDB: "memoria" (perdida ao sair) ou "sqlite"
+ARMAZENAMENTO_LOCAL = os.getenv('ARMAZENAMENTO_LOCAL', 'memoria').lower()
+SQLITE_CAMINHO = os.getenv('SQLITE_CAMINHO', 'tarefas.db')
+
+# Arquivo do diário de escritas offline; por padrão acompanha o SQLite e fica em memória no modo memória
+DIARIO_OFFLINE_CAMINHO = os.getenv(
+    'DIARIO_OFFLINE_CAMINHO', f"{SQLITE_CAMINHO}.diario.jsonl" if ARMAZENAMENTO_LOCAL == 'sqlite' else ''
+)
+
+# Agrupa as escritas no MongoDB em lotes (bulk_write) em vez de uma ida ao servidor por operação
+ESCRITA_ADIADA = os.getenv('ESCRITA_ADIADA', 'false').lower() in ('1', 'true', 'sim')
+
+# Tarefas copiadas do MongoDB para a réplica local por lote ao sincronizar
+TAMANHO_LOTE_REPLICA = 1000
+
+# Metadado da réplica com a origem e a revisão do MongoDB copiada por último (sincronização incremental)
+CHAVE_REVISAO_REPLICA = "revisao_mongodb"
+
+# Acompanha alterações feitas por outros clientes na mesma coleção
+MONITORAR_ALTERACOES = os.getenv('MONITORAR_ALTERACOES', 'true').lower() in ('1', 'true', 'sim')
 
 
 class TarefaModel:
     def __init__(self):
-        """Inicializa o acesso à coleção de tarefas no banco de dados ou memória."""
+        """Inicializa o acesso às tarefas, começando pela réplica local até o MongoDB responder.
+
+        Sem conexão, as escritas vão para a réplica local e para o diário offline; quando o
+        MongoDB responde (no início ou ao reconectar), o diário é reproduzido no servidor e a
+        réplica é recarregada. Conectado, as leituras vão ao MongoDB e as escritas também são
+        aplicadas na réplica, que continua servindo a interface se a conexão cair.
+        """
         self.mongo_context = MongoContext()
-        self.colecao = self.mongo_context.get_colecao()
-        
-        # Fallback para dados em memória quando não há conexão com MongoDB
-        if not self.mongo_context.is_connected():
-            self.tarefas_memoria = []
-            print("Usando armazenamento em memória para as tarefas.")
-
-    def listar(self, filtro_status=None):
-        """Lista todas as tarefas, podendo filtrar por status."""
-        if self.colecao is not None:
-            # Usa MongoDB
-            consulta = {}
-            if filtro_status in ["Pendente", "Concluída"]:
-                consulta = {"status": filtro_status}
-            return list(self.colecao.find(consulta))
+        self.ao_trocar_armazenamento = None  # callback() chamado ao conectar ou desconectar
+        self.ao_alterar_tarefas = None  # callback(eventos) com alterações vindas do MongoDB
+        self.ultimo_relatorio_reproducao = None
+        self._geracao = 0  # muda a cada troca entre MongoDB e réplica local (entra na versão)
+        self.cache = CacheLRU()  # leituras recentes, descartadas pelas escritas que as afetam
+        self._trava = threading.RLock()
+
+        self.local = self._criar_armazenamento_local()
+        self.diario = DiarioOffline(DIARIO_OFFLINE_CAMINHO or None)
+        self.remoto = None  # ArmazenamentoMongo (ou EscritaAdiada) enquanto conectado
+        self.monitor = None  # MonitorAlteracoes enquanto conectado
+        self.mongo_context.adicionar_ouvinte_conexao(self._ativar_mongodb)
+
+    def _criar_armazenamento_local(self):
+        """Cria a réplica local escolhida em ARMAZENAMENTO_LOCAL."""
+        if ARMAZENAMENTO_LOCAL == 'sqlite':
+            print(f"Usando armazenamento local em SQLite para as tarefas: {SQLITE_CAMINHO}")
+            return ArmazenamentoSqlite(SQLITE_CAMINHO)
+        print("Usando armazenamento em memória para as tarefas.")
+        return ArmazenamentoMemoria()
+
+    @property
+    def armazenamento(self):
+        """Armazenamento que atende as leituras: o MongoDB se conectado, senão a réplica local."""
+        return self.remoto if self.remoto is not None else self.local
+
+    def descarregar_escritas(self):
+        """Envia imediatamente as escritas adiadas ainda pendentes (sem efeito se não houver)."""
+        with self._trava:
+            descarregar = getattr(self.remoto, 'descarregar', None)
+            if descarregar is not None:
+                try:
+                    descarregar()
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+
+    def encerrar(self):
+        """Envia as escritas pendentes e fecha os armazenamentos ao sair da aplicação."""
+        with self._trava:
+            self.mongo_context.encerrar()
+            self._parar_monitor()
+            self.descarregar_escritas()
+            for armazenamento in (self.remoto, self.local, self.diario):
+                fechar = getattr(armazenamento, 'fechar', None)
+                if fechar is not None:
+                    fechar()
+
+    @property
+    def colecao(self):
+        """Coleção do MongoDB em uso, ou None no armazenamento local."""
+        return self.mongo_context.get_colecao()
+
+    def _ativar_mongodb(self, colecao):
+        """Reproduz o diário offline no MongoDB, recarrega a réplica local e passa a usar o servidor.
+
+        Roda na thread de conexão; os módulos que dependem do pymongo só são carregados aqui.
+        """
+        from model.armazenamento_mongo import ArmazenamentoMongo
+        from model.diario_offline import reproduzir_diario
+        from model.escrita_adiada import EscritaAdiada
+        from model.notificacoes import MonitorAlteracoes
+        from pymongo.errors import PyMongoError
+        with self._trava:
+            mongo = ArmazenamentoMongo(colecao)
+            try:
+                mongo.garantir_indices()
+                # O ponto de partida do monitor é lido antes da sincronização, para não perder nada
+                monitor = MonitorAlteracoes(colecao, self._aplicar_alteracoes_remotas) if MONITORAR_ALTERACOES else None
+                self.ultimo_relatorio_reproducao = reproduzir_diario(self.diario, colecao)
+                self._sincronizar_replica(colecao)
+            except PyMongoError as e:
+                # Caiu de novo durante a sincronização, ou o servidor recusou uma das operações:
+                # segue na réplica local e o que falta do diário fica para a próxima tentativa
+                print(f"Falha ao sincronizar com o MongoDB: {e}")
+                self.mongo_context.marcar_desconectado()
+                return
+            if ESCRITA_ADIADA:
+                self.remoto = EscritaAdiada(mongo)
+                self.remoto.ao_recusar = self._escritas_recusadas
+            else:
+                self.remoto = mongo
+            self._geracao += 1
+            self.cache.limpar()
+            self._parar_monitor()
+            self.monitor = monitor
+            if monitor is not None:
+                monitor.iniciar()
+        print("Armazenamento das tarefas sincronizado com o MongoDB.")
+        if self.ao_trocar_armazenamento is not None:
+            self.ao_trocar_armazenamento()
+
+    def _sincronizar_replica(self, colecao):
+        """Atualiza a réplica local com as tarefas do MongoDB.
+
+        Se a réplica já foi copiada desta coleção (a revisão copiada fica nos metadados dela),
+        só as tarefas gravadas e excluídas desde então são trazidas; senão, ou se a cópia é
+        mais antiga que a retenção das exclusões, a coleção inteira é copiada e só substitui a
+        réplica depois de lida até o fim. Uma falha no meio não deixa a réplica truncada.
+        """
+        from bson import Timestamp
+        from model.armazenamento_mongo import RETENCAO_EXCLUSOES_S, colecao_exclusoes, revisao_atual
+        from model.notificacoes import MARGEM_REVISAO_S
+        inicio = time.perf_counter()
+        # Lida antes da cópia: o que for gravado durante ela volta na próxima sincronização
+        revisao = revisao_atual(colecao)
+        origem = hashlib.sha1(f"{self.mongo_context.mongo_uri}|{colecao.full_name}".encode()).hexdigest()
+        copiada = _revisao_copiada(self.local.ler_metadado(CHAVE_REVISAO_REPLICA), origem)
+        if copiada is not None and copiada.time > time.time() - RETENCAO_EXCLUSOES_S:
+            # A margem cobre escritas concorrentes que receberam revisão menor que a copiada
+            desde = Timestamp(max(copiada.time - MARGEM_REVISAO_S, 0), 0)
+            excluidas = [d["_id"] for d in colecao_exclusoes(colecao).find({"revisao": {"$gt": desde}}, {"_id": 1})]
+            gravadas = 0
+            # As exclusões vêm antes: uma tarefa presente na coleção existe agora
+            self.local.excluir_muitos(excluidas)
+            for lote in _em_lotes(colecao.find({"revisao": {"$gt": desde}}).batch_size(TAMANHO_LOTE_REPLICA)):
+                self.local.adicionar_muitos(lote)
+                gravadas += len(lote)
+            descricao = f"{gravadas} gravadas e {len(excluidas)} excluídas desde a última sincronização"
         else:
-            # Usa memória
-            if filtro_status in ["Pendente", "Concluída"]:
-                return [t for t in self.tarefas_memoria if t["status"] == filtro_status]
-            return self.tarefas_memoria.copy()
+            self.local.substituir(_em_lotes(colecao.find().batch_size(TAMANHO_LOTE_REPLICA)))
+            descricao = f"{self.local.contar()} tarefas copiadas"
+        self.local.gravar_metadado(CHAVE_REVISAO_REPLICA, f"{origem} {revisao.time} {revisao.inc}")
+        print(f"Réplica local sincronizada: {descricao} em {time.perf_counter() - inicio:.2f} s")
 
-    def adicionar(self, titulo, descricao, status):
-        """Adiciona uma nova tarefa ao banco de dados ou memória."""
-        if self.colecao is not None:
-            # Usa MongoDB
-            return self.colecao.insert_one({"titulo": titulo, "descricao": descricao, "status": status})
+    def _escritas_recusadas(self, recusadas):
+        """Realinha a réplica com o servidor nas tarefas cujas escritas adiadas ele recusou.
+
+        A réplica já tinha aplicado essas escritas; as tarefas são relidas do MongoDB e a
+        correção é repassada ao controller como alterações (ver ao_alterar_tarefas).
+        """
+        from bson import ObjectId
+        for operacao, id_tarefa, mensagem in recusadas:
+            print(f"Escrita recusada pelo MongoDB ({operacao} {id_tarefa}): {mensagem}")
+        eventos = []
+        with self._trava:
+            colecao = self.colecao
+            if colecao is None:
+                return
+            try:
+                ids = [ObjectId(id_tarefa) for _, id_tarefa, _ in recusadas]
+                no_servidor = {str(d["_id"]): d for d in colecao.find({"_id": {"$in": ids}}, {"revisao": 0})}
+            except erros_conexao() as e:
+                # A próxima sincronização da réplica corrige essas tarefas
+                print(f"Não foi possível reler as tarefas recusadas: {e}")
+                return
+            for _, id_tarefa, _ in recusadas:
+                tarefa = no_servidor.get(id_tarefa)
+                self._invalidar_cache(id_tarefa, *self._status_afetados(id_tarefa, tarefa["status"] if tarefa else None))
+                if tarefa is None:
+                    self.local.excluir(id_tarefa)
+                    eventos.append(("excluida", id_tarefa))
+                else:
+                    self.local.gravar(tarefa)
+                    eventos.append(("gravada", tarefa))
+        if self.ao_alterar_tarefas is not None:
+            self.ao_alterar_tarefas(eventos)
+
+    def _parar_monitor(self):
+        """Interrompe o acompanhamento de alterações, se houver."""
+        if self.monitor is not None:
+            self.monitor.parar()
+            self.monitor = None
+
+    def _aplicar_alteracoes_remotas(self, eventos):
+        """Aplica na réplica local as alterações vistas no MongoDB e as repassa ao controller."""
+        with self._trava:
+            for tipo, dado in eventos:
+                if tipo == "excluida":
+                    self._invalidar_cache(dado, *self._status_afetados(dado))
+                    self.local.excluir(dado)
+                else:
+                    self._invalidar_cache(dado["_id"], *self._status_afetados(dado["_id"], dado["status"]))
+                    self.local.gravar(dado)
+        if self.ao_alterar_tarefas is not None:
+            self.ao_alterar_tarefas(eventos)
+
+    def _entrar_offline(self, erro):
+        """Passa a usar a réplica local e o diário depois de uma falha de conexão."""
+        print(f"Sem conexão com o MongoDB, usando a réplica local: {erro}")
+        remoto, self.remoto = self.remoto, None
+        if remoto is None:
+            return
+        self._geracao += 1
+        self.cache.limpar()
+        self._parar_monitor()
+        # Escritas adiadas que não chegaram ao servidor seguem pelo diário (já estão na réplica)
+        retirar_pendentes = getattr(remoto, 'retirar_pendentes', None)
+        if retirar_pendentes is not None:
+            for operacao, id_tarefa, campos in retirar_pendentes():
+                self.diario.registrar(operacao, id_tarefa, campos, verificar=False)
+        self.mongo_context.marcar_desconectado()
+        if self.ao_trocar_armazenamento is not None:
+            self.ao_trocar_armazenamento()
+
+    def _status_afetados(self, id_tarefa, status_novo=None):
+        """Status cujo resultado muda com uma escrita na tarefa: o atual (pela réplica) e o novo."""
+        antes = self.local.buscar_por_id(str(id_tarefa))
+        if antes is not None:
+            return (antes["status"], status_novo)
+        # Tarefa desconhecida na réplica: numa exclusão, qualquer filtro pode mudar
+        return ("Pendente", "Concluída") if status_novo is None else (status_novo,)
+
+    def _invalidar_cache(self, id_tarefa, *status):
+        """Descarta do cache a tarefa e os resultados (listagens e buscas) dos status afetados."""
+        if id_tarefa is not None:
+            self.cache.invalidar(("tarefa", str(id_tarefa)))
+        filtros = {None, *status}
+        self.cache.invalidar_onde(lambda chave: chave[0] != "tarefa" and chave[1] in filtros)
+
+    def estatisticas_cache(self):
+        """Acertos, falhas, despejos e ocupação do cache de leituras."""
+        with self._trava:
+            return self.cache.estatisticas()
+
+    def _escrita_adiada(self):
+        """Indica se as escritas vão ao MongoDB pela EscritaAdiada (com pendências na réplica).
+
+        Nesse modo, as leituras que a réplica local responde (versão, contagem, tarefa por id)
+        são feitas nela: ela já tem as escritas pendentes, e ler do MongoDB obrigaria a enviar
+        o lote a cada leitura, sem dar tempo de agrupar as edições.
+        """
+        return getattr(self.remoto, 'retirar_pendentes', None) is not None
+
+    def _ler_em_cache(self, chave, versao, metodo, *args, local=False):
+        """Leitura que passa pelo cache; com `versao`, só aproveita resultados dessa mesma versão.
+
+        Com local=True, a leitura é feita na réplica local mesmo com o MongoDB conectado.
+        """
+        validar = None if versao is None else (lambda guardado: guardado[0] == versao)
+        guardado = self.cache.obter(chave, validar)
+        if guardado is not AUSENTE:
+            return _copiar_resultado(guardado[1])
+        if local:
+            with trecho(f"local.{metodo}", "armazenamento"):
+                valor = getattr(self.local, metodo)(*args)
         else:
-            # Usa memória
-            nova_tarefa = {
-                "_id": str(uuid.uuid4()),
-                "titulo": titulo,
-                "descricao": descricao,
-                "status": status
-            }
-            self.tarefas_memoria.append(nova_tarefa)
-            return type('MockResult', (), {'inserted_id': nova_tarefa["_id"]})()
+            valor = self._ler(metodo, *args)
+        if valor is not None:
+            # O cache guarda uma cópia: quem chamou pode alterar o resultado (ex.: a view)
+            self.cache.guardar(chave, (versao, _copiar_resultado(valor)))
+        return valor
+
+    def _ler(self, metodo, *args):
+        """Executa uma leitura no MongoDB ou, sem conexão, na réplica local."""
+        if self.remoto is not None:
+            try:
+                with trecho(f"mongo.{metodo}", "armazenamento"):
+                    return getattr(self.remoto, metodo)(*args)
+            except erros_conexao() as e:
+                self._entrar_offline(e)
+        with trecho(f"local.{metodo}", "armazenamento"):
+            return getattr(self.local, metodo)(*args)
+
+    def diagnosticar_consultas(self):
+        """Relatório de explain() das consultas do MongoDB (lista vazia fora do MongoDB)."""
+        with self._trava:
+            if not hasattr(self.armazenamento, 'diagnosticar_consultas'):
+                return []
+            return self.armazenamento.diagnosticar_consultas()
+
+    @rastrear("model")
+    def versao(self, filtro_status=None):
+        """Versão (ETag) do resultado do filtro: igual enquanto o resultado não mudar.
+
+        Combina o filtro, o armazenamento em uso e a versão informada por ele (a revisão da
+        coleção no MongoDB, um contador de escritas na réplica local); é obtida sem listar.
+        Com a escrita adiada, é a versão da réplica, que acompanha as escritas pendentes e as
+        alterações recebidas dos outros clientes.
+        """
+        filtro_status = _normalizar_filtro(filtro_status)
+        with self._trava:
+            if self._escrita_adiada():
+                return (self._geracao, filtro_status, ("replica", self.local.versao(filtro_status)))
+            versao = self._ler('versao', filtro_status)
+            # A geração é lida depois: se a conexão cair durante a leitura, a versão já é a local
+            return (self._geracao, filtro_status, versao)
+
+    @rastrear("model")
+    def listar(self, filtro_status=None, versao=None):
+        """Lista todas as tarefas, podendo filtrar por status.
+
+        Com a `versao` da última listagem, retorna None se o resultado não mudou desde então.
+        """
+        filtro_status = _normalizar_filtro(filtro_status)
+        with self._trava:
+            versao_atual = self.versao(filtro_status)
+            if versao is not None and versao == versao_atual:
+                return None
+            return self._ler_em_cache(("listar", filtro_status), versao_atual, 'listar', filtro_status)
 
+    @rastrear("model")
+    def listar_pagina(self, filtro_status=None, tamanho_pagina=TAMANHO_PAGINA, apos=None, contar_total=False, resumo=False, versao=None):
+        """Lista uma página de tarefas ordenadas por _id.
+
+        Retorna um dicionário com "tarefas", "proximo_cursor" (a passar em `apos` para obter a
+        página seguinte, ou None na última página), "total" (apenas se contar_total=True) e
+        "versao" (ver versao()). Com resumo=True, cada tarefa traz apenas _id, titulo, status e
+        o início da descricao; o documento completo deve ser obtido com buscar_por_id.
+        Com a `versao` da listagem anterior, retorna None se o resultado não mudou desde então,
+        sem consultar as tarefas.
+        """
+        tamanho_resumo = TAMANHO_RESUMO_DESCRICAO if resumo else None
+        filtro_status = _normalizar_filtro(filtro_status)
+        chave = ("pagina", filtro_status, tamanho_pagina, None if apos is None else str(apos), contar_total, tamanho_resumo)
+        with self._trava:
+            # Lida antes da página: uma escrita no meio torna a versão antiga, nunca o contrário
+            versao_atual = self.versao(filtro_status)
+            if versao is not None and versao == versao_atual:
+                return None
+            pagina = self._ler_em_cache(chave, versao_atual, 'listar_pagina', filtro_status, tamanho_pagina, apos, contar_total, tamanho_resumo)
+            return dict(pagina, versao=versao_atual)
+
+    @rastrear("model")
+    def contar_por_status(self, versao=None):
+        """Quantidade total de tarefas e por status, sem listá-las.
+
+        Retorna um dicionário com "total", "por_status" ({status: quantidade}) e "versao" (ver
+        versao()). A contagem é feita pelo armazenamento em uso (agregação no MongoDB, tamanhos
+        dos índices na réplica local) e fica no cache até a próxima escrita. Com a `versao` da
+        contagem anterior, retorna None se nada mudou desde então.
+
+        Com a escrita adiada, a contagem vem da réplica local (ver _escrita_adiada).
+        """
+        with self._trava:
+            versao_atual = self.versao()
+            if versao is not None and versao == versao_atual:
+                return None
+            contagem = self._ler_em_cache(("contagem", None), versao_atual, 'contar_por_status', local=self._escrita_adiada())
+            return dict(contagem, por_status=dict(contagem["por_status"]), versao=versao_atual)
+
+    @rastrear("model")
+    def buscar(self, texto, filtro_status=None, limite=LIMITE_BUSCA, resumo=False):
+        """Busca tarefas pelo texto do título e da descrição, das mais relevantes para as menos.
+
+        No MongoDB usa o índice textual (palavras inteiras, em português); na réplica local, um
+        índice invertido sem acentos em que a última palavra também casa como prefixo.
+        """
+        tamanho_resumo = TAMANHO_RESUMO_DESCRICAO if resumo else None
+        filtro_status = _normalizar_filtro(filtro_status)
+        chave = ("buscar", filtro_status, texto.strip(), limite, tamanho_resumo)
+        with self._trava:
+            return self._ler_em_cache(chave, None, 'buscar', texto, filtro_status, limite, tamanho_resumo)
+
+    @rastrear("model")
+    def preparar_busca(self):
+        """Antecipa a criação do índice de busca local, para a primeira busca não esperar por ele."""
+        with self._trava:
+            if self.remoto is None and hasattr(self.local, 'preparar_busca'):
+                self.local.preparar_busca()
+
+    @rastrear("model")
+    def adicionar(self, titulo, descricao, status):
+        """Adiciona uma nova tarefa ao banco de dados ou, sem conexão, à réplica local."""
+        campos = {"titulo": titulo, "descricao": descricao, "status": status}
+        with self._trava:
+            self._invalidar_cache(None, status)
+            if self.remoto is not None:
+                try:
+                    resultado = self.remoto.adicionar(titulo, descricao, status)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    self.local.gravar(dict(campos, _id=resultado.inserted_id))
+                    return resultado
+            resultado = self.local.adicionar(titulo, descricao, status)
+            self.diario.registrar("inserir", resultado.inserted_id, campos)
+            return resultado
+
+    @rastrear("model")
     def atualizar(self, id_tarefa, titulo, descricao, status):
         """Atualiza uma tarefa existente pelo id."""
-        if self.colecao is not None:
-            # Usa MongoDB
-            return self.colecao.update_one({"_id": ObjectId(id_tarefa)}, {"$set": {"titulo": titulo, "descricao": descricao, "status": status}})
-        else:
-            # Usa memória
-            for tarefa in self.tarefas_memoria:
-                if tarefa["_id"] == id_tarefa:
-                    tarefa["titulo"] = titulo
-                    tarefa["descricao"] = descricao
-                    tarefa["status"] = status
-                    return type('MockResult', (), {'modified_count': 1})()
-            return type('MockResult', (), {'modified_count': 0})()
+        with self._trava:
+            self._invalidar_cache(id_tarefa, *self._status_afetados(id_tarefa, status))
+            if self.remoto is not None:
+                try:
+                    resultado = self.remoto.atualizar(id_tarefa, titulo, descricao, status)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    self.local.atualizar(str(id_tarefa), titulo, descricao, status)
+                    return resultado
+            antes = self.local.buscar_por_id(str(id_tarefa))
+            resultado = self.local.atualizar(str(id_tarefa), titulo, descricao, status)
+            if resultado.matched_count:
+                campos = {"titulo": titulo, "descricao": descricao, "status": status}
+                self.diario.registrar("atualizar", id_tarefa, campos, _sem_id(antes))
+            return resultado
 
+    @rastrear("model")
     def excluir(self, id_tarefa):
-        """Exclui uma tarefa do banco de dados ou memória pelo id."""
-        if self.colecao is not None:
-            # Usa MongoDB
-            return self.colecao.delete_one({"_id": ObjectId(id_tarefa)})
-        else:
-            # Usa memória
-            for i, tarefa in enumerate(self.tarefas_memoria):
-                if tarefa["_id"] == id_tarefa:
-                    del self.tarefas_memoria[i]
-                    return type('MockResult', (), {'deleted_count': 1})()
-            return type('MockResult', (), {'deleted_count': 0})()
+        """Exclui uma tarefa do banco de dados ou, sem conexão, da réplica local pelo id."""
+        with self._trava:
+            self._invalidar_cache(id_tarefa, *self._status_afetados(id_tarefa))
+            if self.remoto is not None:
+                try:
+                    resultado = self.remoto.excluir(id_tarefa)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    self.local.excluir(str(id_tarefa))
+                    return resultado
+            antes = self.local.buscar_por_id(str(id_tarefa))
+            resultado = self.local.excluir(str(id_tarefa))
+            if resultado.deleted_count:
+                self.diario.registrar("excluir", id_tarefa, antes=_sem_id(antes))
+            return resultado
+
+    def _ids_em_massa(self, ids, filtro_status):
+        """Ids (str) de uma operação em massa: os informados ou, sem ids, os do filtro na réplica.
+
+        Os ids do filtro vêm da réplica local, sem consultar o MongoDB: conectado, a operação
+        por filtro é feita no servidor e eles só servem para atualizar a réplica.
+        """
+        if ids is None:
+            ids = self.local.listar_ids(_normalizar_filtro(filtro_status))
+        return [str(i) for i in ids]
+
+    def _tarefas_na_replica(self, ids):
+        """Mapa id -> tarefa das que existem na réplica local (o estado antes da escrita)."""
+        tarefas = {}
+        for id_tarefa in ids:
+            tarefa = self.local.buscar_por_id(id_tarefa)
+            if tarefa is not None:
+                tarefas[id_tarefa] = tarefa
+        return tarefas
+
+    @rastrear("model")
+    def atualizar_status_muitos(self, status, ids=None, filtro_status=None):
+        """Muda o status de várias tarefas de uma vez: as dos `ids` ou, sem ids, todas as do filtro.
+
+        Conectado, a alteração vai ao MongoDB em update_many: um por lote de ids ou, sem ids,
+        um único sobre o filtro, sem trazer os ids ao cliente. Sem conexão, vai à réplica local
+        e ao diário offline. Retorna um SimpleNamespace com os `ids` das tarefas alteradas (as
+        que já tinham o status ficam de fora) e `modified_count`; na alteração por filtro no
+        MongoDB, `ids` é None e a lista deve ser recarregada.
+        """
+        with self._trava:
+            por_filtro = ids is None
+            ids = self._ids_em_massa(ids, filtro_status)
+            antes = self._tarefas_na_replica(ids)
+            alterados = [i for i, tarefa in antes.items() if tarefa["status"] != status]
+            self.cache.limpar()
+            if self.remoto is not None:
+                try:
+                    if por_filtro:
+                        resultado = self.remoto.atualizar_status_filtro(_normalizar_filtro(filtro_status), status)
+                    else:
+                        resultado = self.remoto.atualizar_status_muitos(ids, status)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    self.local.atualizar_status_muitos(alterados, status)
+                    return SimpleNamespace(ids=None if por_filtro else alterados, modified_count=resultado.modified_count)
+            self.local.atualizar_status_muitos(alterados, status)
+            self.diario.registrar_muitos(("atualizar", i, {"status": status}, _sem_id(antes[i])) for i in alterados)
+            return SimpleNamespace(ids=alterados, modified_count=len(alterados))
+
+    @rastrear("model")
+    def excluir_muitos(self, ids=None, filtro_status=None):
+        """Exclui várias tarefas de uma vez: as dos `ids` ou, sem ids, todas as do filtro.
+
+        Conectado, a exclusão vai ao MongoDB em delete_many (um por lote de ids ou, sem ids, um
+        único sobre o filtro), com as exclusões registradas para os outros clientes; sem
+        conexão, à réplica local e ao diário offline. Retorna um SimpleNamespace com os `ids`
+        excluídos e `deleted_count`; na exclusão por filtro no MongoDB, `ids` é None e a lista
+        deve ser recarregada.
+        """
+        with self._trava:
+            por_filtro = ids is None
+            ids = self._ids_em_massa(ids, filtro_status)
+            antes = self._tarefas_na_replica(ids)
+            self.cache.limpar()
+            if self.remoto is not None:
+                try:
+                    if por_filtro:
+                        resultado = self.remoto.excluir_filtro(_normalizar_filtro(filtro_status))
+                    else:
+                        resultado = self.remoto.excluir_muitos(ids)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    self.local.excluir_muitos(ids)
+                    return SimpleNamespace(ids=None if por_filtro else ids, deleted_count=resultado.deleted_count)
+            excluidos = list(antes)
+            self.local.excluir_muitos(excluidos)
+            self.diario.registrar_muitos(("excluir", i, None, _sem_id(antes[i])) for i in excluidos)
+            return SimpleNamespace(ids=excluidos, deleted_count=len(excluidos))
 
+    @rastrear("model")
     def buscar_por_id(self, id_tarefa):
-        """Busca uma tarefa pelo id."""
-        if self.colecao is not None:
-            # Usa MongoDB
-            return self.colecao.find_one({"_id": ObjectId(id_tarefa)})
-        else:
-            # Usa memória
-            for tarefa in self.tarefas_memoria:
-                if tarefa["_id"] == id_tarefa:
-                    return tarefa
-            return None
+        """Busca uma tarefa pelo id (com a escrita adiada, na réplica local: ver _escrita_adiada)."""
+        with self._trava:
+            local = self._escrita_adiada()
+            return self._ler_em_cache(("tarefa", str(id_tarefa)), None, 'buscar_por_id', str(id_tarefa) if local else id_tarefa, local=local)
+
+    @rastrear("model")
+    def importar(self, caminho, formato=None, tamanho_lote=TAMANHO_LOTE_TRANSFERENCIA, ao_progresso=None):
+        """Importa tarefas de um arquivo JSONL ou CSV, lendo-o em fluxo e gravando em lotes.
+
+        Cada lote vai ao MongoDB em um único insert_many (ou, sem conexão, à réplica local e ao
+        diário offline). Linhas sem título são ignoradas e tarefas cujo _id já existe são
+        mantidas como estão. `ao_progresso(importadas)` é chamado a cada lote gravado.
+        Retorna um relatório com as quantidades e a vazão.
+        """
+        formato = formato or formato_do_caminho(caminho)
+        # Ids no formato de ObjectId sem carregar o bson: valem na réplica e no MongoDB
+        gerador_ids = GeradorIds()
+        inicio = time.perf_counter()
+        relatorio = {"importadas": 0, "existentes": 0, "ignoradas": 0}
+        lote = []
+        with open(caminho, encoding="utf-8", newline="") as arquivo:
+            for numero, registro in ler_registros(arquivo, formato):
+                tarefa = normalizar_tarefa(registro)
+                if tarefa is None:
+                    relatorio["ignoradas"] += 1
+                    continue
+                if "_id" not in tarefa:
+                    tarefa["_id"] = gerador_ids.novo()
+                lote.append(tarefa)
+                if len(lote) >= tamanho_lote:
+                    self._importar_lote(lote, relatorio)
+                    lote = []
+                    if ao_progresso is not None:
+                        ao_progresso(relatorio["importadas"])
+            if lote:
+                self._importar_lote(lote, relatorio)
+                if ao_progresso is not None:
+                    ao_progresso(relatorio["importadas"])
+        relatorio["segundos"] = time.perf_counter() - inicio
+        relatorio["tarefas_por_segundo"] = relatorio["importadas"] / relatorio["segundos"] if relatorio["segundos"] else 0.0
+        print(
+            f"Importação concluída: {relatorio['importadas']} tarefas em {relatorio['segundos']:.2f} s "
+            f"({relatorio['tarefas_por_segundo']:.0f} tarefas/s), {relatorio['existentes']} já existente(s), "
+            f"{relatorio['ignoradas']} linha(s) inválida(s)"
+        )
+        return relatorio
+
+    def _importar_lote(self, lote, relatorio):
+        """Grava um lote de tarefas importadas no MongoDB e na réplica, ou na réplica e no diário.
+
+        No MongoDB, as importadas são as que o servidor inseriu (nInserted): as que ele recusou
+        por _id repetido contam como existentes e não vão para a réplica.
+        """
+        with self._trava:
+            novas, vistos = [], set()
+            for tarefa in lote:
+                # Um _id repetido no arquivo vale pela primeira ocorrência, como no insert_many
+                if tarefa["_id"] not in vistos and self.local.buscar_por_id(tarefa["_id"]) is None:
+                    novas.append(tarefa)
+                vistos.add(tarefa["_id"])
+            relatorio["existentes"] += len(lote) - len(novas)
+            if not novas:
+                return
+            self.cache.limpar()
+            if self.remoto is not None:
+                try:
+                    resultado = self.remoto.adicionar_muitos(novas)
+                except erros_conexao() as e:
+                    self._entrar_offline(e)
+                else:
+                    recusadas = set(resultado.recusadas)
+                    self.local.adicionar_muitos([t for i, t in enumerate(novas) if i not in recusadas])
+                    relatorio["importadas"] += resultado.inserted_count
+                    relatorio["existentes"] += len(recusadas)
+                    return
+            # Parte do lote pode ter chegado ao servidor: na reprodução, esses _id viram conflito
+            relatorio["importadas"] += len(novas)
+            self.local.adicionar_muitos(novas)
+            self.diario.registrar_muitos(("inserir", t["_id"], _sem_id(t), None) for t in novas)
+
+    @rastrear("model")
+    def exportar(self, caminho, filtro_status=None, formato=None, tamanho_lote=TAMANHO_LOTE_TRANSFERENCIA, ao_progresso=None):
+        """Exporta as tarefas (podendo filtrar por status) para um arquivo JSONL ou CSV, em ordem de _id.
+
+        As tarefas são lidas por cursor, `tamanho_lote` por vez, e escritas à medida que chegam,
+        sem montar a lista inteira em memória. `ao_progresso(exportadas)` é chamado a cada lote.
+        """
+        formato = formato or formato_do_caminho(caminho)
+        inicio = time.perf_counter()
+        exportadas = 0
+        with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+            escritor = EscritorTarefas(arquivo, formato)
+            for tarefa in self._iterar_tarefas(_normalizar_filtro(filtro_status), tamanho_lote):
+                escritor.escrever(tarefa)
+                exportadas += 1
+                if ao_progresso is not None and exportadas % tamanho_lote == 0:
+                    ao_progresso(exportadas)
+        segundos = time.perf_counter() - inicio
+        relatorio = {
+            "exportadas": exportadas,
+            "segundos": segundos,
+            "tarefas_por_segundo": exportadas / segundos if segundos else 0.0,
+        }
+        print(f"Exportação concluída: {exportadas} tarefas em {segundos:.2f} s ({relatorio['tarefas_por_segundo']:.0f} tarefas/s)")
+        return relatorio
+
+    def _iterar_tarefas(self, filtro_status, tamanho_lote):
+        """Percorre as tarefas em ordem de _id pelo cursor do MongoDB ou pelas páginas da réplica.
+
+        Se a conexão cair no meio, continua pela réplica local a partir do último _id lido.
+        """
+        ultimo = None
+        with self._trava:
+            remoto = self.remoto
+        if remoto is not None:
+            try:
+                for tarefa in remoto.iterar(filtro_status, tamanho_lote):
+                    ultimo = str(tarefa["_id"])
+                    yield tarefa
+                return
+            except erros_conexao() as e:
+                with self._trava:
+                    self._entrar_offline(e)
+        while True:
+            with self._trava:
+                pagina = self.local.listar_pagina(filtro_status, tamanho_lote, ultimo)
+            yield from pagina["tarefas"]
+            if pagina["proximo_cursor"] is None:
+                return
+            ultimo = pagina["proximo_cursor"]
+
+
+def _em_lotes(documentos, tamanho=TAMANHO_LOTE_REPLICA):
+    """Agrupa os documentos de um cursor em listas de até `tamanho`."""
+    lote = []
+    for documento in documentos:
+        lote.append(documento)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _revisao_copiada(valor, origem):
+    """Timestamp guardado nos metadados da réplica, se ela foi copiada da mesma origem."""
+    if not valor:
+        return None
+    partes = valor.split()
+    if len(partes) != 3 or partes[0] != origem:
+        return None
+    from bson import Timestamp
+    return Timestamp(int(partes[1]), int(partes[2]))
+
+
+def _normalizar_filtro(filtro_status):
+    """Filtro de status válido, ou None para todas as tarefas."""
+    return filtro_status if filtro_status in ["Pendente", "Concluída"] else None
+
+
+def _copiar_resultado(valor):
+    """Cópia de uma tarefa, lista de tarefas ou página, para o cache e quem chamou não se afetarem."""
+    if isinstance(valor, list):
+        return [dict(t) for t in valor]
+    if "tarefas" in valor:
+        return dict(valor, tarefas=[dict(t) for t in valor["tarefas"]])
+    return dict(valor)
+
+
+def _sem_id(tarefa):
+    """Campos da tarefa sem o _id, como registrados no diário offline."""
+    return {campo: valor for campo, valor in tarefa.items() if campo != "_id"}
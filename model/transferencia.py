@@ -0,0 +1,75 @@
+import csv
+import json
+import os
+import re
+
+CAMPOS_EXPORTADOS = ("_id", "titulo", "descricao", "status")
+STATUS_VALIDOS = ("Pendente", "Concluída")
+
+# Tarefas por lote na importação (um insert_many por lote) e na exportação (batch_size do cursor)
+TAMANHO_LOTE_TRANSFERENCIA = int(os.getenv('TRANSFERENCIA_LOTE', '1000'))
+
+
+def formato_do_caminho(caminho):
+    """Formato pelo nome do arquivo: "csv" para .csv, "jsonl" para os demais."""
+    return "csv" if caminho.lower().endswith(".csv") else "jsonl"
+
+
+def ler_registros(arquivo, formato):
+    """Percorre os registros do arquivo aberto, um por vez, como (número da linha, dicionário ou None)."""
+    if formato == "csv":
+        leitor = csv.DictReader(arquivo)
+        for registro in leitor:
+            yield leitor.line_num, registro
+        return
+    for numero, linha in enumerate(arquivo, start=1):
+        if not linha.strip():
+            continue
+        try:
+            registro = json.loads(linha)
+        except ValueError:
+            registro = None
+        yield numero, registro if isinstance(registro, dict) else None
+
+
+def normalizar_tarefa(registro):
+    """Tarefa importável a partir de um registro lido, ou None se ele não tiver título.
+
+    Campos ausentes recebem os padrões do formulário (descrição vazia, status "Pendente").
+    """
+    if not registro:
+        return None
+    titulo = str(registro.get("titulo") or "").strip()
+    if not titulo:
+        return None
+    status = registro.get("status")
+    tarefa = {
+        "titulo": titulo,
+        "descricao": str(registro.get("descricao") or ""),
+        "status": status if status in STATUS_VALIDOS else "Pendente",
+    }
+    # Um _id válido (ObjectId em hexadecimal) é preservado; sem ele, a tarefa recebe um novo
+    id_tarefa = str(registro.get("_id") or "").lower()
+    if re.fullmatch(r"[0-9a-f]{24}", id_tarefa):
+        tarefa["_id"] = id_tarefa
+    return tarefa
+
+
+class EscritorTarefas:
+    """Grava tarefas, uma por vez, em JSONL ou CSV (com cabeçalho)."""
+
+    def __init__(self, arquivo, formato):
+        self.arquivo = arquivo
+        self.formato = formato
+        if formato == "csv":
+            self._csv = csv.DictWriter(arquivo, fieldnames=CAMPOS_EXPORTADOS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def escrever(self, tarefa):
+        """Acrescenta uma tarefa ao arquivo."""
+        registro = {campo: tarefa.get(campo, "") for campo in CAMPOS_EXPORTADOS}
+        registro["_id"] = str(registro["_id"])
+        if self.formato == "csv":
+            self._csv.writerow(registro)
+        else:
+            self.arquivo.write(json.dumps(registro, ensure_ascii=False) + "\n")
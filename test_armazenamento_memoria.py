@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do armazenamento em memória: contrato das operações e escala com 1M de tarefas
+"""
+
+import random
+import time
+
+from model.armazenamento_memoria import ArmazenamentoMemoria, tokenizar
+
+TOTAL_TAREFAS = 1_000_000
+TAREFAS_BUSCA = 100_000
+
+
+class RegistrosSemVarredura(dict):
+    """Registros do armazenamento que falham se alguma operação percorrer todas as tarefas.
+
+    Os tempos ficam para os benchmarks; os testes conferem que o custo não depende do total.
+    """
+    def __iter__(self):
+        raise AssertionError("operação percorreu todas as tarefas")
+
+    def values(self):
+        return self.__iter__()
+
+    def items(self):
+        return self.__iter__()
+
+    def keys(self):
+        return self.__iter__()
+
+
+def _cronometrar(descricao, funcao, *args):
+    """Executa a função, imprime o tempo gasto e retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args)
+    segundos = time.perf_counter() - inicio
+    print(f"  ⏱️  {descricao}: {segundos * 1000:.2f} ms")
+    return resultado, segundos
+
+
+def _todas_as_paginas(armazenamento, filtro_status, tamanho_pagina):
+    """Percorre todas as páginas de um filtro e retorna as tarefas concatenadas."""
+    tarefas, cursor = [], None
+    while True:
+        pagina = armazenamento.listar_pagina(filtro_status, tamanho_pagina, cursor)
+        tarefas.extend(pagina["tarefas"])
+        cursor = pagina["proximo_cursor"]
+        if cursor is None:
+            return tarefas
+
+
+def testar_operacoes_memoria():
+    """Confere as operações contra uma referência simples (lista de dicionários)."""
+    print("=== Teste de Operações do Armazenamento em Memória ===")
+    armazenamento = ArmazenamentoMemoria()
+    referencia = {}
+    aleatorio = random.Random(42)
+    status_possiveis = ["Pendente", "Concluída"]
+
+    for i in range(3000):
+        operacao = aleatorio.random()
+        if operacao < 0.6 or not referencia:
+            status = aleatorio.choice(status_possiveis)
+            resultado = armazenamento.adicionar(f"Tarefa {i}", f"Descrição {i}", status)
+            referencia[resultado.inserted_id] = {"_id": resultado.inserted_id, "titulo": f"Tarefa {i}", "descricao": f"Descrição {i}", "status": status}
+        elif operacao < 0.85:
+            id_tarefa = aleatorio.choice(list(referencia))
+            status = aleatorio.choice(status_possiveis)
+            resultado = armazenamento.atualizar(id_tarefa, f"Editada {i}", "Nova descrição", status)
+            assert resultado.matched_count == 1
+            referencia[id_tarefa].update(titulo=f"Editada {i}", descricao="Nova descrição", status=status)
+        else:
+            id_tarefa = aleatorio.choice(list(referencia))
+            assert armazenamento.excluir(id_tarefa).deleted_count == 1
+            del referencia[id_tarefa]
+
+    esperado = sorted(referencia.values(), key=lambda t: t["_id"])
+    assert armazenamento.listar() == esperado
+    for status in status_possiveis:
+        filtradas = [t for t in esperado if t["status"] == status]
+        assert armazenamento.listar(status) == filtradas
+        assert _todas_as_paginas(armazenamento, status, 37) == filtradas
+        assert armazenamento.listar_pagina(status, 10, None, True)["total"] == len(filtradas)
+    assert _todas_as_paginas(armazenamento, None, 37) == esperado
+
+    # Resultados são cópias: alterar o retorno não altera o armazenamento
+    tarefa = armazenamento.buscar_por_id(esperado[0]["_id"])
+    tarefa["titulo"] = "Alterada fora"
+    assert armazenamento.buscar_por_id(esperado[0]["_id"])["titulo"] == esperado[0]["titulo"]
+
+    # Operações em massa: tarefas já no status e ids inexistentes não contam
+    pendentes = armazenamento.listar_ids("Pendente")
+    assert pendentes == [t["_id"] for t in esperado if t["status"] == "Pendente"]
+    assert armazenamento.atualizar_status_muitos(pendentes + ["0" * 24], "Concluída").modified_count == len(pendentes)
+    assert armazenamento.listar("Pendente") == [] and armazenamento.listar_ids("Concluída") == armazenamento.listar_ids()
+    assert armazenamento.excluir_muitos(pendentes[:10] + ["0" * 24]).deleted_count == 10
+    assert len(armazenamento) == len(esperado) - 10
+    esperado = armazenamento.listar()
+
+    assert armazenamento.buscar_por_id("0" * 24) is None
+    assert armazenamento.atualizar("0" * 24, "x", "x", "Pendente").matched_count == 0
+    assert armazenamento.excluir("0" * 24).deleted_count == 0
+    print("✅ Operações conferem com a referência")
+
+
+def testar_versao_por_filtro():
+    """A versão de um filtro muda apenas com escritas que alteram o resultado desse filtro."""
+    armazenamento = ArmazenamentoMemoria()
+    pendente = armazenamento.adicionar("A", "", "Pendente").inserted_id
+    versoes = {f: armazenamento.versao(f) for f in (None, "Pendente", "Concluída")}
+
+    armazenamento.adicionar("B", "", "Concluída")
+    assert armazenamento.versao("Pendente") == versoes["Pendente"]
+    assert armazenamento.versao("Concluída") != versoes["Concluída"]
+    assert armazenamento.versao(None) != versoes[None]
+
+    # Mudar de status altera os dois filtros; ids inexistentes não alteram nada
+    versoes = {f: armazenamento.versao(f) for f in (None, "Pendente", "Concluída")}
+    armazenamento.atualizar("0" * 24, "x", "x", "Pendente")
+    armazenamento.excluir("0" * 24)
+    assert {f: armazenamento.versao(f) for f in versoes} == versoes
+    armazenamento.atualizar(pendente, "A", "", "Concluída")
+    assert all(armazenamento.versao(f) != v for f, v in versoes.items())
+
+    versao = armazenamento.versao("Pendente")
+    armazenamento.esvaziar()
+    assert armazenamento.versao("Pendente") != versao
+
+
+def testar_contagem_por_status():
+    """As contagens por status acompanham cada escrita, inclusive as em massa."""
+    armazenamento = ArmazenamentoMemoria()
+    assert armazenamento.contar_por_status() == {"total": 0, "por_status": {"Pendente": 0, "Concluída": 0}}
+    ids = [armazenamento.adicionar(f"T{i}", "", "Pendente").inserted_id for i in range(6)]
+    armazenamento.atualizar(ids[0], "T0", "", "Concluída")
+    armazenamento.excluir(ids[1])
+    armazenamento.atualizar_status_muitos(ids[2:4], "Concluída")
+    assert armazenamento.contar_por_status() == {"total": 5, "por_status": {"Pendente": 2, "Concluída": 3}}
+    armazenamento.excluir_muitos(ids[:3])
+    assert armazenamento.contar_por_status() == {"total": 3, "por_status": {"Pendente": 2, "Concluída": 1}}
+    armazenamento.esvaziar()
+    assert armazenamento.contar_por_status()["total"] == 0
+
+
+def testar_busca_textual():
+    """A busca ignora acentos e maiúsculas, trata a última palavra como prefixo e ordena por relevância."""
+    print(f"=== Teste de Busca Textual com {TAREFAS_BUSCA} tarefas ===")
+    armazenamento = ArmazenamentoMemoria()
+    no_titulo = armazenamento.adicionar("Revisar relatório", "Enviar ao time", "Pendente").inserted_id
+    na_descricao = armazenamento.adicionar("Reunião", "Levar o RELATÓRIO de vendas", "Concluída").inserted_id
+    assert [t["_id"] for t in armazenamento.buscar("relatorio")] == [no_titulo, na_descricao]
+    assert [t["_id"] for t in armazenamento.buscar("rela")] == [no_titulo, na_descricao]
+    assert [t["_id"] for t in armazenamento.buscar("relatório vend")] == [na_descricao]
+    assert [t["_id"] for t in armazenamento.buscar("relatorio", "Pendente")] == [no_titulo]
+    assert armazenamento.buscar("inexistente") == [] and armazenamento.buscar("  ") == []
+
+    # O índice acompanha as escritas feitas depois de criado
+    armazenamento.atualizar(no_titulo, "Revisar planilha", "Enviar ao time", "Pendente")
+    armazenamento.excluir(na_descricao)
+    nova = armazenamento.adicionar("Relatório anual", "", "Pendente").inserted_id
+    assert [t["_id"] for t in armazenamento.buscar("relatorio")] == [nova]
+    assert [t["_id"] for t in armazenamento.buscar("planilha")] == [no_titulo]
+
+    # Escala: o índice é criado de uma vez sobre tarefas já existentes
+    armazenamento = ArmazenamentoMemoria()
+    aleatorio = random.Random(3)
+    comuns = ["relatório", "reunião", "orçamento", "cliente", "revisão", "entrega", "contrato", "ação",
+              "projeto", "equipe", "planilha", "sistema", "migração", "análise", "pagamento", "cadastro"]
+    raras = [f"termo{i}" for i in range(5000)]
+    for i in range(TAREFAS_BUSCA):
+        armazenamento.adicionar(
+            " ".join(aleatorio.choices(comuns, k=2) + aleatorio.choices(raras, k=2)),
+            " ".join(aleatorio.choices(comuns, k=3) + aleatorio.choices(raras, k=5)),
+            "Concluída" if i % 3 == 0 else "Pendente"
+        )
+    _cronometrar("criação do índice de busca", armazenamento.preparar_busca)
+    # Depois de criado o índice, cada tecla digitada consulta só as tarefas que casam
+    armazenamento._registros = RegistrosSemVarredura(armazenamento._registros)
+    for texto in ["rel", "relat", "relatorio", "relatorio orc", "relatorio orcamento cli", "termo12"]:
+        resultado, _ = _cronometrar(f"buscar('{texto}')", armazenamento.buscar, texto, None, 200, 101)
+        assert resultado
+        *inteiras, prefixo = tokenizar(texto)
+        for tarefa in resultado:
+            palavras = tokenizar(f"{tarefa['titulo']} {tarefa['descricao']}")
+            assert all(p in palavras for p in inteiras) and any(p.startswith(prefixo) for p in palavras)
+    print("✅ Busca sem acentos, por prefixo e com ranking")
+
+
+def testar_escala_um_milhao():
+    """Operações pontuais e listagem filtrada com 1M de tarefas não dependem do total."""
+    print(f"=== Teste de Escala com {TOTAL_TAREFAS} tarefas ===")
+    armazenamento = ArmazenamentoMemoria()
+    adicionar = armazenamento.adicionar
+    ids = []
+    inicio = time.perf_counter()
+    for i in range(TOTAL_TAREFAS):
+        # 1 em cada 1000 tarefas fica concluída
+        ids.append(adicionar("Tarefa", "Descrição", "Concluída" if i % 1000 == 0 else "Pendente").inserted_id)
+    print(f"  ⏱️  inserção de {TOTAL_TAREFAS} tarefas: {time.perf_counter() - inicio:.2f} s")
+    assert len(armazenamento) == TOTAL_TAREFAS
+
+    amostra = random.Random(7).sample(ids, 10000)
+    # Com varreduras lineares cada operação percorreria até 1M de tarefas
+    armazenamento._registros = RegistrosSemVarredura(armazenamento._registros)
+
+    def buscar():
+        for id_tarefa in amostra:
+            assert armazenamento.buscar_por_id(id_tarefa) is not None
+
+    def atualizar():
+        # Troca de status move a tarefa entre os índices por status
+        for id_tarefa in amostra:
+            armazenamento.atualizar(id_tarefa, "Editada", "Descrição", "Concluída")
+
+    def excluir():
+        for id_tarefa in amostra:
+            assert armazenamento.excluir(id_tarefa).deleted_count == 1
+
+    _cronometrar("10000 buscas por id", buscar)
+    _cronometrar("10000 atualizações com troca de status", atualizar)
+    # A listagem filtrada percorre só o resultado (~11k); a contagem, nem isso
+    concluidas, _ = _cronometrar("listar('Concluída')", armazenamento.listar, "Concluída")
+    assert len(concluidas) == 1000 + 10000 - len(set(amostra) & set(ids[::1000]))
+    pagina, _ = _cronometrar("página profunda de 'Concluída'", armazenamento.listar_pagina, "Concluída", 200, ids[-2000], True)
+    assert pagina["total"] == len(concluidas)
+    _cronometrar("10000 exclusões", excluir)
+    assert len(armazenamento) == TOTAL_TAREFAS - 10000
+    assert armazenamento.listar_pagina(None, 10, None, True)["total"] == TOTAL_TAREFAS - 10000
+    contagem, _ = _cronometrar("contagem por status", armazenamento.contar_por_status)
+    assert contagem["total"] == TOTAL_TAREFAS - 10000
+    assert contagem["por_status"]["Concluída"] == len(concluidas) - 10000
+    print("✅ Operações pontuais e listagem filtrada independentes do total de tarefas")
+
+
+if __name__ == "__main__":
+    testar_operacoes_memoria()
+    testar_versao_por_filtro()
+    testar_contagem_por_status()
+    testar_busca_textual()
+    testar_escala_um_milhao()
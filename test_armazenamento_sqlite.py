@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do armazenamento local em SQLite: contrato, durabilidade e escritas confirmadas
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+
+from model.armazenamento_sqlite import ArmazenamentoSqlite
+
+ESCRITAS_CONFIRMADAS = 5000
+
+
+def testar_operacoes_e_persistencia_sqlite():
+    """Executa o CRUD, fecha o arquivo e confere que as tarefas continuam lá ao reabrir."""
+    print("=== Teste de Operações do Armazenamento SQLite ===")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "tarefas.db")
+        armazenamento = ArmazenamentoSqlite(caminho)
+        assert armazenamento.conexao.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        ids = [armazenamento.adicionar(f"Tarefa {i}", "x" * 300, "Pendente").inserted_id for i in range(10)]
+        assert armazenamento.atualizar(ids[3], "Editada", "Nova descrição", "Concluída").matched_count == 1
+        versao = armazenamento.versao()
+        assert armazenamento.excluir(ids[5]).deleted_count == 1
+        assert armazenamento.versao() != versao
+        versao = armazenamento.versao()
+        assert armazenamento.excluir(ids[5]).deleted_count == 0
+        assert armazenamento.atualizar(ids[5], "x", "x", "Pendente").matched_count == 0
+        assert armazenamento.versao() == versao
+
+        assert [t["_id"] for t in armazenamento.listar()] == [i for i in ids if i != ids[5]]
+        assert [t["_id"] for t in armazenamento.listar("Concluída")] == [ids[3]]
+
+        pagina = armazenamento.listar_pagina("Pendente", 4, None, True, 101)
+        assert [t["_id"] for t in pagina["tarefas"]] == ids[:3] + [ids[4]]
+        assert pagina["total"] == 8 and pagina["proximo_cursor"] == ids[4]
+        assert all(len(t["descricao"]) == 101 for t in pagina["tarefas"])
+        pagina = armazenamento.listar_pagina("Pendente", 4, pagina["proximo_cursor"])
+        assert [t["_id"] for t in pagina["tarefas"]] == ids[6:]
+        assert pagina["proximo_cursor"] is None and pagina["total"] is None
+        armazenamento.fechar()
+
+        reaberto = ArmazenamentoSqlite(caminho)
+        assert reaberto.buscar_por_id(ids[3]) == {"_id": ids[3], "titulo": "Editada", "descricao": "Nova descrição", "status": "Concluída"}
+        assert reaberto.buscar_por_id(ids[5]) is None
+        assert len(reaberto.listar()) == 9
+
+        # Operações em massa: tarefas já no status e ids inexistentes não contam
+        assert reaberto.atualizar_status_muitos(ids[:6], "Concluída").modified_count == 4
+        assert reaberto.listar_ids("Concluída") == ids[:5] and reaberto.listar_ids() == [i for i in ids if i != ids[5]]
+        assert reaberto.excluir_muitos(ids[:5]).deleted_count == 5
+        assert reaberto.listar_ids("Concluída") == [] and reaberto.contar() == 4
+        assert reaberto.contar_por_status() == {"total": 4, "por_status": {"Pendente": 4, "Concluída": 0}}
+
+        # Substituição interrompida no meio: a transação é desfeita e as tarefas anteriores ficam
+        def lotes_interrompidos():
+            yield [{"_id": "f" * 24, "titulo": "Nova", "descricao": "", "status": "Pendente"}]
+            raise ConnectionError("conexão perdida")
+        try:
+            reaberto.substituir(lotes_interrompidos())
+        except ConnectionError:
+            pass
+        assert reaberto.contar() == 4 and reaberto.buscar_por_id("f" * 24) is None
+        reaberto.gravar_metadado("revisao_mongodb", "origem 1 2")
+        reaberto.fechar()
+        reaberto = ArmazenamentoSqlite(caminho)
+        assert reaberto.ler_metadado("revisao_mongodb") == "origem 1 2"
+        reaberto.fechar()
+    print("✅ Tarefas preservadas após reabrir o arquivo")
+
+
+def testar_busca_fts_sqlite():
+    """A busca acompanha inserções, edições, substituições e exclusões, sem acentos e por prefixo."""
+    with tempfile.TemporaryDirectory() as pasta:
+        armazenamento = ArmazenamentoSqlite(os.path.join(pasta, "tarefas.db"))
+        no_titulo = armazenamento.adicionar("Revisar relatório", "Enviar ao time", "Pendente").inserted_id
+        na_descricao = armazenamento.adicionar("Reunião", "Levar o RELATÓRIO de vendas", "Concluída").inserted_id
+        assert [t["_id"] for t in armazenamento.buscar("rela")] == [no_titulo, na_descricao]
+        assert [t["_id"] for t in armazenamento.buscar("relatorio", "Concluída")] == [na_descricao]
+
+        armazenamento.atualizar(no_titulo, "Revisar planilha", "Enviar ao time", "Pendente")
+        armazenamento.gravar({"_id": na_descricao, "titulo": "Reunião", "descricao": "Pauta", "status": "Concluída"})
+        assert armazenamento.buscar("relatorio") == []
+        assert [t["_id"] for t in armazenamento.buscar("pauta")] == [na_descricao]
+        armazenamento.excluir(na_descricao)
+        assert armazenamento.buscar("pauta") == []
+        armazenamento.fechar()
+
+
+def testar_escritas_confirmadas_sqlite():
+    """Cada escrita é uma transação própria, visível para outra conexão assim que retorna.
+
+    A vazão é apenas informada: os números ficam com o benchmark_armazenamento.py.
+    """
+    print("=== Teste de Escritas Confirmadas do SQLite ===")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "tarefas.db")
+        armazenamento = ArmazenamentoSqlite(caminho)
+        assert armazenamento.conexao.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        leitor = sqlite3.connect(caminho)
+        inicio = time.perf_counter()
+        ids = []
+        for i in range(ESCRITAS_CONFIRMADAS):
+            ids.append(armazenamento.adicionar(f"Tarefa {i}", "Descrição", "Pendente").inserted_id)
+            if i % 500 == 0:
+                assert leitor.execute("SELECT COUNT(*) FROM tarefas").fetchone()[0] == i + 1
+        for id_tarefa in ids:
+            armazenamento.atualizar(id_tarefa, "Editada", "Descrição", "Concluída")
+        segundos = time.perf_counter() - inicio
+        assert not armazenamento.conexao.in_transaction
+        assert leitor.execute("SELECT COUNT(*) FROM tarefas WHERE status = 'Concluída'").fetchone()[0] == ESCRITAS_CONFIRMADAS
+        leitor.close()
+        armazenamento.fechar()
+    print(f"  ⏱️  {2 * ESCRITAS_CONFIRMADAS / segundos:.0f} escritas por segundo")
+    print("✅ Escritas confirmadas uma a uma")
+
+
+if __name__ == "__main__":
+    testar_operacoes_e_persistencia_sqlite()
+    testar_busca_fts_sqlite()
+    testar_escritas_confirmadas_sqlite()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do cache de leituras: despejo LRU, limite de bytes, validade e contadores
+"""
+
+import time
+
+from model.cache import CacheLRU, AUSENTE, estimar_bytes
+
+
+def testar_despejo_lru_e_limites():
+    """As entradas usadas há mais tempo saem primeiro, por quantidade ou por bytes."""
+    print("=== Teste do Cache LRU ===")
+    cache = CacheLRU(max_entradas=2, max_bytes=10**6, ttl_s=0)
+    cache.guardar("a", {"titulo": "A"})
+    cache.guardar("b", {"titulo": "B"})
+    assert cache.obter("a") == {"titulo": "A"}  # "a" passa a ser a mais recente
+    cache.guardar("c", {"titulo": "C"})
+    assert cache.obter("b") is AUSENTE and cache.obter("a") is not AUSENTE
+
+    grande = {"descricao": "x" * 1000}
+    cache = CacheLRU(max_entradas=100, max_bytes=3 * estimar_bytes(grande), ttl_s=0)
+    for chave in range(5):
+        cache.guardar(chave, dict(grande))
+    assert len(cache) == 3 and cache.obter(0) is AUSENTE and cache.obter(4) is not AUSENTE
+
+    estatisticas = cache.estatisticas()
+    assert estatisticas["despejos"] == 2 and estatisticas["acertos"] == 1 and estatisticas["falhas"] == 1
+    assert estatisticas["bytes"] <= cache.max_bytes
+    print("✅ Despejo pelas entradas menos usadas")
+
+
+def testar_validade_e_invalidacao():
+    """Entradas vencidas, reprovadas na validação ou invalidadas contam como falha."""
+    cache = CacheLRU(max_entradas=10, max_bytes=10**6, ttl_s=0.05)
+    cache.guardar(("tarefa", "1"), (None, {"titulo": "A"}))
+    cache.guardar(("pagina", "Pendente"), ("v1", {"tarefas": []}))
+    cache.guardar(("pagina", None), ("v1", {"tarefas": []}))
+    assert cache.obter(("pagina", "Pendente"), lambda guardado: guardado[0] == "v2") is AUSENTE
+
+    cache.invalidar_onde(lambda chave: chave[0] == "pagina")
+    assert cache.obter(("pagina", None)) is AUSENTE
+    time.sleep(0.06)
+    assert cache.obter(("tarefa", "1")) is AUSENTE
+    assert cache.estatisticas()["expiradas"] == 2 and len(cache) == 0
+
+
+if __name__ == "__main__":
+    testar_despejo_lru_e_limites()
+    testar_validade_e_invalidacao()
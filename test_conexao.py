@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes do gerenciador de conexão compartilhado (não precisam de um servidor MongoDB)
+"""
+
+import os
+import threading
+from types import SimpleNamespace
+
+from database.database import GerenciadorConexao, MongoContext, obter_gerenciador
+
+# Porta sem servidor: as tentativas de conexão falham rapidamente
+URI_INACESSIVEL = "mongodb://127.0.0.1:1/?appname=teste_conexao"
+
+
+def testar_cliente_compartilhado():
+    """Os contextos do mesmo MONGO_URI usam um único cliente, com as opções do .env."""
+    variaveis = {"MONGO_URI": URI_INACESSIVEL, "MONGO_TIMEOUT_MS": "200", "MONGO_POOL_MAX": "7",
+                 "MONGO_POOL_MIN": "", "MONGO_COMPRESSORES": "zlib", "MONGO_INTERVALO_RECONEXAO_S": "60"}
+    anteriores = {nome: os.environ.get(nome) for nome in variaveis}
+    os.environ.update(variaveis)
+    try:
+        primeiro, segundo = MongoContext(), MongoContext()
+        assert primeiro.gerenciador is segundo.gerenciador is obter_gerenciador(URI_INACESSIVEL)
+        assert not primeiro.aguardar_conexao(timeout=10)
+        assert primeiro.cliente is not None and primeiro.cliente is segundo.cliente
+        assert primeiro.get_colecao() is None
+
+        avisos = []
+        primeiro.adicionar_ouvinte_conexao(avisos.append)
+        estatisticas = segundo.estatisticas()
+        assert estatisticas["conectado"] is False
+        assert estatisticas["opcoes"] == {"maxPoolSize": 7, "compressors": ["zlib"], "serverSelectionTimeoutMS": 200}
+        assert estatisticas["ouvintes"] == 1
+        assert estatisticas["conexoes_em_uso"] == 0
+        primeiro.encerrar()
+        assert segundo.estatisticas()["ouvintes"] == 0 and avisos == []
+    finally:
+        for nome, valor in anteriores.items():
+            if valor is None:
+                os.environ.pop(nome, None)
+            else:
+                os.environ[nome] = valor
+
+
+def testar_estatisticas_pool_e_heartbeat():
+    """Os ouvintes do cliente contam as conexões do pool e registram os heartbeats."""
+    from database.monitoramento import EstatisticasConexao, OuvinteHeartbeat, OuvintePool
+
+    estatisticas = EstatisticasConexao()
+    pool, heartbeat = OuvintePool(estatisticas), OuvinteHeartbeat(estatisticas)
+    evento = SimpleNamespace()
+    for _ in range(3):
+        pool.connection_created(evento)
+    for _ in range(2):
+        pool.connection_check_out_started(evento)
+        pool.connection_checked_out(evento)
+    pool.connection_checked_in(evento)
+    pool.connection_closed(evento)
+    pool.connection_check_out_failed(evento)
+    heartbeat.succeeded(SimpleNamespace(duration=0.004))
+    heartbeat.failed(SimpleNamespace(reply=TimeoutError("sem resposta")))
+
+    resumo = estatisticas.resumo()
+    assert resumo["conexoes_abertas"] == 2 and resumo["conexoes_em_uso"] == 1
+    assert resumo["retiradas"] == 2 and resumo["falhas_retirada"] == 1
+    assert resumo["heartbeats"] == 1 and resumo["falhas_heartbeat"] == 1
+    assert round(resumo["ultimo_heartbeat_ms"]) == 4
+    assert resumo["ultima_falha_heartbeat"] == "sem resposta"
+
+
+def testar_falha_em_um_ouvinte():
+    """Um ouvinte que falha não impede os demais; os ouvintes nunca rodam na thread de quem os registra."""
+    gerenciador = GerenciadorConexao("")
+    gerenciador.cliente = SimpleNamespace(admin=SimpleNamespace(command=lambda nome: {"ok": 1}))
+    avisados = []
+
+    def falhar(cliente):
+        raise RuntimeError("índice de texto incompatível")
+    gerenciador._ouvintes = [falhar, avisados.append]
+    gerenciador._conectar()
+    assert gerenciador.conectado and avisados == [gerenciador.cliente]
+    assert gerenciador.aguardar_conexao(timeout=0)
+
+    # Já conectado, um novo ouvinte também é chamado fora da thread de quem o registrou
+    chamado = threading.Event()
+    threads = []
+
+    def registrar_thread(cliente):
+        threads.append(threading.current_thread())
+        chamado.set()
+    gerenciador.adicionar_ouvinte(registrar_thread)
+    assert chamado.wait(timeout=5) and threads[0] is not threading.current_thread()
+
+
+if __name__ == "__main__":
+    testar_cliente_compartilhado()
+    testar_estatisticas_pool_e_heartbeat()
+    testar_falha_em_um_ouvinte()
+    print("✅ Testes do gerenciador de conexão concluídos")
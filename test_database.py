@@ -14,8 +14,8 @@ def testar_conexao_mongodb():
     # Inicializa o modelo
     model = TarefaModel()
     
-    # Verifica se está conectado
-    if model.mongo_context.is_connected():
+    # Aguarda a conexão em segundo plano e verifica se está conectado
+    if model.mongo_context.aguardar_conexao():
         print("✅ Conectado ao MongoDB com sucesso!")
         print(f"📊 Banco: {model.mongo_context.database_name}")
         print(f"📋 Coleção: {model.mongo_context.collection_name}")
@@ -49,6 +49,10 @@ def testar_conexao_mongodb():
     print(f"  📊 Total de tarefas: {len(todas_tarefas)}")
     for tarefa in todas_tarefas:
         print(f"  - {tarefa['titulo']} ({tarefa['status']})")
+
+    estatisticas = model.mongo_context.estatisticas()
+    print(f"\n🔌 Pool de conexões: {estatisticas['conexoes_abertas']} abertas, "
+          f"{estatisticas['retiradas']} retiradas, último heartbeat {estatisticas['ultimo_heartbeat_ms'] or 0:.1f} ms")
     
     # Teste 3: Filtrar por status
     print("\n🔍 Teste 3: Filtrando tarefas por status...")
@@ -96,6 +100,10 @@ def testar_conexao_mongodb():
     print(f"  📋 Total de tarefas restantes: {len(tarefas_finais)}")
     for tarefa in tarefas_finais:
         print(f"  - {tarefa['titulo']} ({tarefa['status']})")
+
+    estatisticas = model.mongo_context.estatisticas()
+    print(f"\n🔌 Pool de conexões: {estatisticas['conexoes_abertas']} abertas, "
+          f"{estatisticas['retiradas']} retiradas, último heartbeat {estatisticas['ultimo_heartbeat_ms'] or 0:.1f} ms")
     
     print("\n🎉 Todos os testes concluídos com sucesso!")
 
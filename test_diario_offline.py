@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do modo offline: diário de escritas, réplica local e reprodução no MongoDB
+"""
+
+import os
+import tempfile
+import time
+
+from bson import ObjectId, Timestamp
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from model.armazenamento_memoria import ArmazenamentoMemoria
+from model.armazenamento_mongo import ArmazenamentoMongo
+from model.diario_offline import DiarioOffline, reproduzir_diario
+from model.tarefa_model import TarefaModel
+from teste_falsos import ColecaoFalsa
+
+
+def _criar_model_offline():
+    """TarefaModel sem MongoDB: usa a réplica em memória e o diário."""
+    anterior = os.environ.get("MONGO_URI")
+    os.environ["MONGO_URI"] = ""
+    try:
+        return TarefaModel()
+    finally:
+        if anterior is None:
+            del os.environ["MONGO_URI"]
+        else:
+            os.environ["MONGO_URI"] = anterior
+
+
+def _registrar_offline(replica, diario, operacao, id_tarefa=None, **campos):
+    """Aplica a escrita na réplica e a registra no diário, como o TarefaModel faz sem conexão."""
+    if operacao == "inserir":
+        id_tarefa = replica.adicionar(campos["titulo"], campos["descricao"], campos["status"]).inserted_id
+        diario.registrar("inserir", id_tarefa, campos)
+        return id_tarefa
+    antes = {c: v for c, v in replica.buscar_por_id(id_tarefa).items() if c != "_id"}
+    if operacao == "atualizar":
+        replica.atualizar(id_tarefa, campos["titulo"], campos["descricao"], campos["status"])
+        diario.registrar("atualizar", id_tarefa, campos, antes)
+    else:
+        replica.excluir(id_tarefa)
+        diario.registrar("excluir", id_tarefa, antes=antes)
+    return id_tarefa
+
+
+def testar_reproducao_com_conflitos():
+    """Escritas offline chegam ao servidor em lotes; as que divergem do servidor são conflitos."""
+    print("=== Teste de Reprodução do Diário Offline ===")
+    tarefa = {"titulo": "T", "descricao": "D", "status": "Pendente"}
+    no_servidor = [dict(tarefa, _id=ObjectId()) for _ in range(4)]
+    replica, diario = ArmazenamentoMemoria(), DiarioOffline()
+    replica.adicionar_muitos(no_servidor)
+    colecao = ColecaoFalsa(no_servidor)
+    a, b, c, d = (str(t["_id"]) for t in no_servidor)
+
+    # Offline: 2500 inserções, edições e exclusões
+    novas = [_registrar_offline(replica, diario, "inserir", titulo=f"Nova {i}", descricao="", status="Pendente") for i in range(2500)]
+    _registrar_offline(replica, diario, "atualizar", a, titulo="Editada", descricao="D", status="Concluída")
+    _registrar_offline(replica, diario, "atualizar", b, titulo="Editada", descricao="D", status="Concluída")
+    _registrar_offline(replica, diario, "excluir", c)
+    _registrar_offline(replica, diario, "excluir", d)
+    _registrar_offline(replica, diario, "atualizar", novas[0], titulo="Nova editada", descricao="", status="Concluída")
+
+    # Enquanto isso, outro cliente altera b e exclui d no servidor
+    colecao.documentos[ObjectId(b)]["titulo"] = "Editada por outro cliente"
+    del colecao.documentos[ObjectId(d)]
+
+    relatorio = reproduzir_diario(diario, colecao, tamanho_lote=1000)
+    assert relatorio["operacoes"] == 2505 and relatorio["aplicadas"] == 2503
+    assert {(c["_id"], c["motivo"]) for c in relatorio["conflitos"]} == {(b, "alterada no servidor"), (d, "excluída no servidor")}
+    assert relatorio["operacoes_por_segundo"] > 0
+    assert colecao.chamadas == 3 and len(diario) == 0
+    assert colecao.documentos[ObjectId(a)]["status"] == "Concluída"
+    assert colecao.documentos[ObjectId(b)]["titulo"] == "Editada por outro cliente"
+    assert ObjectId(c) not in colecao.documentos
+    assert colecao.database["tarefas_exclusoes"].ids == {ObjectId(c)}
+    assert colecao.documentos[ObjectId(novas[0])]["titulo"] == "Nova editada"
+    assert len(colecao.documentos) == 2 + 2500
+    print("✅ Diário reproduzido com conflitos detectados")
+
+
+def testar_insercao_repetida_vira_conflito():
+    """Um _id que já existe no servidor não interrompe o resto do lote."""
+    diario = DiarioOffline()
+    existente = ObjectId()
+    colecao = ColecaoFalsa([{"_id": existente, "titulo": "X", "descricao": "", "status": "Pendente"}])
+    diario.registrar("inserir", existente, {"titulo": "Y", "descricao": "", "status": "Pendente"}, verificar=False)
+    diario.registrar("inserir", ObjectId(), {"titulo": "Z", "descricao": "", "status": "Pendente"})
+    relatorio = reproduzir_diario(diario, colecao)
+    assert relatorio["aplicadas"] == 1 and [c["_id"] for c in relatorio["conflitos"]] == [str(existente)]
+    assert len(colecao.documentos) == 2 and colecao.documentos[existente]["titulo"] == "X"
+
+
+def testar_operacoes_em_massa_offline():
+    """Concluir e excluir em massa sem conexão: uma entrada por tarefa, reproduzidas em um lote."""
+    no_servidor = [{"_id": ObjectId(), "titulo": f"T{i}", "descricao": "", "status": "Pendente"} for i in range(600)]
+    ids = [str(t["_id"]) for t in no_servidor]
+    model = _criar_model_offline()
+    model.local.adicionar_muitos([dict(t, _id=i) for t, i in zip(no_servidor, ids)])
+
+    assert model.atualizar_status_muitos("Concluída", ids[:500]).ids == ids[:500]
+    assert model.atualizar_status_muitos("Concluída", ids[:10]).ids == []  # já concluídas
+    resultado = model.excluir_muitos(filtro_status="Pendente")
+    assert resultado.ids == ids[500:] and resultado.deleted_count == 100
+    assert model.local.contar("Concluída") == 500 and model.local.contar() == 500
+    contagem = model.contar_por_status()
+    assert contagem["total"] == 500 and contagem["por_status"] == {"Pendente": 0, "Concluída": 500}
+    assert model.contar_por_status(contagem["versao"]) is None  # nada mudou desde a contagem
+    assert len(model.diario) == 600
+
+    colecao = ColecaoFalsa(no_servidor)
+    relatorio = reproduzir_diario(model.diario, colecao)
+    assert relatorio["aplicadas"] == 600 and not relatorio["conflitos"] and colecao.chamadas == 1
+    assert len(colecao.documentos) == 500 and all(d["status"] == "Concluída" for d in colecao.documentos.values())
+    assert colecao.database["tarefas_exclusoes"].ids == {ObjectId(i) for i in ids[500:]}
+
+
+def testar_operacoes_em_massa_por_filtro():
+    """Conectado, a operação sobre todo o filtro é um único comando no servidor, sem listar os ids."""
+    model = _criar_model_offline()
+    ids = [model.local.adicionar(f"T{i}", "", "Pendente" if i % 2 else "Concluída").inserted_id for i in range(10)]
+    colecao = ColecaoFalsa([dict(t, _id=ObjectId(t["_id"])) for t in model.local.listar()])
+    model.remoto = ArmazenamentoMongo(colecao)
+
+    resultado = model.atualizar_status_muitos("Concluída", filtro_status="Pendente")
+    assert resultado.ids is None and resultado.modified_count == 5
+    assert colecao.comandos == [("update_many", {"status": {"$ne": "Concluída", "$eq": "Pendente"}})]
+    assert model.local.contar("Pendente") == 0
+
+    colecao.comandos.clear()
+    resultado = model.excluir_muitos(filtro_status="Concluída")
+    assert resultado.ids is None and resultado.deleted_count == 10
+    (agregar, etapas), excluir = colecao.comandos
+    assert agregar == "aggregate" and etapas[0] == {"$match": {"status": "Concluída"}}
+    assert excluir == ("delete_many", {"status": "Concluída"})
+    # As exclusões foram registradas no servidor e depois receberam a revisão
+    assert colecao.exclusoes.ids == {ObjectId(i) for i in ids}
+    assert colecao.exclusoes.comandos == [("update_many", {"revisao": None})]
+    assert model.local.contar() == 0 and len(model.diario) == 0
+
+    # Com ids informados, continua indo em lotes de $in
+    model.local.adicionar_muitos([{"_id": i, "titulo": "T", "descricao": "", "status": "Pendente"} for i in ids[:2]])
+    colecao.comandos.clear()
+    assert model.atualizar_status_muitos("Concluída", ids[:2]).ids == ids[:2]
+    assert colecao.comandos[0][1]["_id"] == {"$in": [ObjectId(i) for i in ids[:2]]}
+
+
+class ColecaoRecusada:
+    """Coleção em que o servidor recusa todas as operações (ex.: recurso não suportado)."""
+    name = "tarefas"
+    full_name = "banco.tarefas"
+
+    def __init__(self):
+        self.database = {"tarefas_exclusoes": self}
+
+    def __getattr__(self, nome):
+        def recusar(*args, **kwargs):
+            raise OperationFailure(f"{nome} não suportado")
+        return recusar
+
+
+def testar_falha_ao_ativar_mongodb():
+    """Um erro do servidor na ativação mantém a réplica local e agenda nova tentativa."""
+    model = _criar_model_offline()
+    id_tarefa = model.adicionar("Offline", "", "Pendente").inserted_id
+    tentativas = []
+    model.mongo_context.marcar_desconectado = lambda: tentativas.append(True)
+    model._ativar_mongodb(ColecaoRecusada())
+    assert model.remoto is None and tentativas == [True]
+    assert len(model.diario) == 1 and model.buscar_por_id(id_tarefa)["titulo"] == "Offline"
+
+
+def testar_sincronizacao_da_replica():
+    """A cópia completa só substitui a réplica ao terminar; as seguintes trazem apenas o que mudou."""
+    agora = int(time.time())
+    documentos = [{"_id": ObjectId(), "titulo": f"T{i}", "descricao": "", "status": "Pendente", "revisao": Timestamp(agora - 3000 + i, 1)}
+                  for i in range(2500)]
+    colecao = ColecaoFalsa(documentos)
+    exclusoes = colecao.exclusoes
+    model = _criar_model_offline()
+    anterior = model.local.adicionar("Da réplica", "", "Pendente").inserted_id
+
+    # A conexão cai no meio da cópia completa: a réplica continua como estava
+    colecao.falhar_apos = 1500
+    try:
+        model._sincronizar_replica(colecao)
+        assert False, "a falha de conexão deveria chegar a quem sincroniza"
+    except AutoReconnect:
+        pass
+    assert model.local.contar() == 1 and model.local.buscar_por_id(anterior) is not None
+
+    colecao.falhar_apos, colecao.lidos = None, 0
+    model._sincronizar_replica(colecao)
+    assert model.local.contar() == 2500 and colecao.lidos == 2500
+
+    # Depois: uma tarefa editada e outra excluída por outro cliente; só elas são lidas
+    colecao.lidos = 0
+    editada, excluida = documentos[0]["_id"], documentos[1]["_id"]
+    colecao.documentos[editada].update(titulo="Editada", revisao=Timestamp(agora, 1))
+    del colecao.documentos[excluida]
+    exclusoes.documentos[excluida] = {"_id": excluida, "revisao": Timestamp(agora, 2)}
+    model._sincronizar_replica(colecao)
+    # A editada e as 3 tarefas gravadas nos 2 s de margem antes da revisão copiada
+    assert colecao.lidos == 4 and exclusoes.lidos == 1
+    assert model.local.buscar_por_id(str(editada))["titulo"] == "Editada"
+    assert model.local.buscar_por_id(str(excluida)) is None and model.local.contar() == 2499
+
+
+def testar_diario_persistente():
+    """Com um arquivo, o diário sobrevive ao fechamento e é esvaziado após a reprodução."""
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "diario.jsonl")
+        diario = DiarioOffline(caminho)
+        id_tarefa = ObjectId()
+        diario.registrar("inserir", id_tarefa, {"titulo": "Ação", "descricao": "Descrição", "status": "Pendente"})
+        diario.fechar()
+
+        reaberto = DiarioOffline(caminho)
+        assert reaberto.entradas() == [{"operacao": "inserir", "_id": str(id_tarefa), "campos": {"titulo": "Ação", "descricao": "Descrição", "status": "Pendente"}, "antes": None}]
+        reproduzir_diario(reaberto, ColecaoFalsa())
+        reaberto.fechar()
+        assert len(DiarioOffline(caminho)) == 0
+
+
+if __name__ == "__main__":
+    testar_reproducao_com_conflitos()
+    testar_insercao_repetida_vira_conflito()
+    testar_operacoes_em_massa_offline()
+    testar_operacoes_em_massa_por_filtro()
+    testar_falha_ao_ativar_mongodb()
+    testar_sincronizacao_da_replica()
+    testar_diario_persistente()
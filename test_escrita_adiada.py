@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste da escrita adiada: agrupamento por _id e envio em lotes via bulk_write
+"""
+
+import os
+
+from bson import ObjectId
+from pymongo.errors import AutoReconnect
+
+from model.escrita_adiada import EscritaAdiada
+from model.tarefa_model import TarefaModel
+from teste_falsos import ColecaoFalsa
+
+
+class ArmazenamentoRegistrado:
+    """Substitui o ArmazenamentoMongo nas leituras, lendo do dicionário da coleção."""
+    def __init__(self):
+        self.colecao = ColecaoFalsa()
+
+    def listar(self, filtro_status=None):
+        return [d for d in self.colecao.documentos.values() if filtro_status is None or d["status"] == filtro_status]
+
+
+def testar_agrupamento_e_lotes():
+    """Uma sessão de triagem com 920 escritas em 100 tarefas vira um único bulk_write."""
+    print("=== Teste de Escrita Adiada ===")
+    armazenamento = ArmazenamentoRegistrado()
+    escrita = EscritaAdiada(armazenamento, tamanho_lote=500, intervalo_ms=60000)
+
+    ids = [escrita.adicionar(f"Tarefa {i}", "Descrição", "Pendente").inserted_id for i in range(100)]
+    for rodada in range(8):
+        for id_tarefa in ids:
+            escrita.atualizar(id_tarefa, f"Editada {rodada}", "Descrição", "Concluída" if rodada % 2 else "Pendente")
+    for id_tarefa in ids[:20]:
+        escrita.excluir(id_tarefa)
+
+    # A leitura envia as pendências antes de consultar
+    tarefas = escrita.listar()
+    estatisticas = escrita.estatisticas()
+    print(f"  📦 {estatisticas['operacoes_recebidas']} escritas em {estatisticas['idas_ao_servidor']} idas ao servidor")
+    assert estatisticas["operacoes_recebidas"] == 920 and estatisticas["pendentes"] == 0
+    assert armazenamento.colecao.chamadas == estatisticas["idas_ao_servidor"] == 1
+    assert sorted(t["_id"] for t in tarefas) == sorted(ids[20:])
+    assert all(t["titulo"] == "Editada 7" and t["status"] == "Concluída" for t in tarefas)
+
+    # Inserir e excluir antes do envio se anulam; atualizar o excluído não encontra nada
+    id_temporario = escrita.adicionar("Temporária", "", "Pendente").inserted_id
+    assert escrita.excluir(id_temporario).deleted_count == 1
+    assert escrita.excluir(ids[30]).deleted_count == 1
+    assert escrita.atualizar(ids[30], "x", "x", "Pendente").matched_count == 0
+    chamadas = armazenamento.colecao.chamadas
+    escrita.fechar()
+    assert armazenamento.colecao.chamadas == chamadas + 1
+    assert id_temporario not in armazenamento.colecao.documentos
+    assert ids[30] not in armazenamento.colecao.documentos
+    print("✅ Escritas agrupadas e enviadas em lote")
+
+
+def testar_envio_por_tamanho_do_lote():
+    """Ao atingir o tamanho do lote, as pendências são enviadas sem esperar o intervalo."""
+    armazenamento = ArmazenamentoRegistrado()
+    escrita = EscritaAdiada(armazenamento, tamanho_lote=10, intervalo_ms=60000)
+    for i in range(25):
+        escrita.adicionar(f"Tarefa {i}", "", "Pendente")
+    assert armazenamento.colecao.chamadas == 2
+    assert escrita.estatisticas()["pendentes"] == 5
+    escrita.fechar()
+    assert len(armazenamento.colecao.documentos) == 25
+
+
+def testar_lote_com_recusas():
+    """Num lote com uma inserção recusada, as demais operações recebem a revisão e a recusa é informada."""
+    armazenamento = ArmazenamentoRegistrado()
+    escrita = EscritaAdiada(armazenamento, tamanho_lote=500, intervalo_ms=60000)
+    recebidas = []
+    escrita.ao_recusar = recebidas.append
+    existente = escrita.adicionar("Existente", "", "Pendente").inserted_id
+    escrita.descarregar()
+
+    # Outro cliente já gravou uma tarefa com o _id que esta inserção vai usar
+    repetida = escrita.adicionar("Repetida", "", "Pendente").inserted_id
+    armazenamento.colecao.documentos[repetida] = {"_id": repetida, "titulo": "Do servidor", "descricao": "", "status": "Pendente"}
+    nova = escrita.adicionar("Nova", "", "Pendente").inserted_id
+    escrita.excluir(existente)
+    recusadas = escrita.descarregar()
+
+    assert recusadas == [("inserir", str(repetida), "E11000 duplicate key")] and recebidas == [recusadas]
+    assert nova in armazenamento.colecao.revisados and repetida not in armazenamento.colecao.revisados
+    assert armazenamento.colecao.database["tarefas_exclusoes"].ids == {existente}
+    assert escrita.estatisticas()["recusadas"] == 1
+    escrita.fechar()
+
+
+def _criar_model_sem_mongo():
+    """TarefaModel só com a réplica local; o teste instala o remoto."""
+    anterior = os.environ.get("MONGO_URI")
+    os.environ["MONGO_URI"] = ""
+    try:
+        return TarefaModel()
+    finally:
+        if anterior is None:
+            del os.environ["MONGO_URI"]
+        else:
+            os.environ["MONGO_URI"] = anterior
+
+
+def testar_falha_no_envio_do_lote_cheio():
+    """Com o servidor fora, a escrita que enche o lote fica na fila e vai uma única vez ao diário."""
+    model = _criar_model_sem_mongo()
+    armazenamento = ArmazenamentoRegistrado()
+
+    def sem_conexao(operacoes, ordered=True):
+        raise AutoReconnect("conexão perdida")
+    armazenamento.colecao.bulk_write = sem_conexao
+    model.remoto = EscritaAdiada(armazenamento, tamanho_lote=1, intervalo_ms=60000)
+
+    id_tarefa = model.adicionar("Tarefa", "", "Pendente").inserted_id
+    assert model.local.buscar_por_id(str(id_tarefa)) is not None and len(model.diario) == 0
+    # A próxima leitura percebe a queda: a inserção pendente passa ao diário, sem duplicar
+    assert [t["_id"] for t in model.listar()] == [str(id_tarefa)]
+    assert model.remoto is None
+    assert [(e["operacao"], e["_id"]) for e in model.diario.entradas()] == [("inserir", str(id_tarefa))]
+
+
+def testar_resumo_sem_descarregar():
+    """O resumo por status vem da réplica local e não força o envio do lote pendente."""
+    model = _criar_model_sem_mongo()
+    armazenamento = ArmazenamentoRegistrado()
+    model.remoto = EscritaAdiada(armazenamento, tamanho_lote=100, intervalo_ms=60000)
+
+    model.adicionar("Primeira", "", "Pendente")
+    contagem = model.contar_por_status()
+    assert contagem["total"] == 1 and contagem["por_status"]["Pendente"] == 1
+    assert model.contar_por_status(versao=contagem["versao"]) is None
+
+    model.adicionar("Segunda", "", "Concluída")
+    contagem = model.contar_por_status(versao=contagem["versao"])
+    assert contagem["total"] == 2 and contagem["por_status"]["Concluída"] == 1
+    assert armazenamento.colecao.chamadas == 0 and model.remoto.estatisticas()["pendentes"] == 2
+    model.remoto.fechar()
+    assert armazenamento.colecao.chamadas == 1
+
+
+def testar_edicoes_agrupadas_entre_selecoes():
+    """Selecionar e editar várias vezes não envia o lote: as edições vão juntas em um bulk_write."""
+    model = _criar_model_sem_mongo()
+    armazenamento = ArmazenamentoRegistrado()
+    tarefas = [{"_id": ObjectId(), "titulo": f"T{i}", "descricao": "", "status": "Pendente"} for i in range(3)]
+    armazenamento.colecao.documentos = {t["_id"]: dict(t) for t in tarefas}
+    model.local.adicionar_muitos([dict(t, _id=str(t["_id"])) for t in tarefas])
+    model.remoto = EscritaAdiada(armazenamento, tamanho_lote=100, intervalo_ms=60000)
+
+    versao = model.versao()
+    for rodada in range(4):
+        for tarefa in tarefas:
+            id_tarefa = str(tarefa["_id"])
+            selecionada = model.buscar_por_id(id_tarefa)
+            assert selecionada["titulo"] == (tarefa["titulo"] if rodada == 0 else f"Editada {rodada - 1}")
+            model.atualizar(id_tarefa, f"Editada {rodada}", "", "Pendente")
+            model.contar_por_status()
+        assert model.versao() != versao
+        versao = model.versao()
+    assert armazenamento.colecao.chamadas == 0 and model.remoto.estatisticas()["pendentes"] == 3
+    model.remoto.fechar()
+    assert armazenamento.colecao.chamadas == 1
+    assert all(d["titulo"] == "Editada 3" for d in armazenamento.colecao.documentos.values())
+
+
+if __name__ == "__main__":
+    testar_agrupamento_e_lotes()
+    testar_envio_por_tamanho_do_lote()
+    testar_lote_com_recusas()
+    testar_falha_no_envio_do_lote_cheio()
+    testar_resumo_sem_descarregar()
+    testar_edicoes_agrupadas_entre_selecoes()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do acompanhamento de alterações por consulta de revisão
+"""
+
+from bson import ObjectId, Timestamp
+
+from model.notificacoes import MonitorAlteracoes
+
+
+class ConsultaRevisao(list):
+    """Resultado de find() com sort/limit encadeáveis."""
+    def sort(self, ordem):
+        return ConsultaRevisao(sorted(self, key=lambda d: tuple(d[campo] for campo, _ in ordem)))
+
+    def limit(self, quantidade):
+        return ConsultaRevisao(self[:quantidade])
+
+
+class ColecaoRevisada:
+    """Coleção mínima que responde às consultas de revisão do monitor."""
+    def __init__(self, nome, database):
+        self.name = nome
+        self.database = database
+        self.documentos = {}
+        self.consultas = 0
+
+    def find(self, consulta):
+        self.consultas += 1
+        if "$or" in consulta:
+            # Continuação da página anterior: depois do (revisao, _id) informado
+            posterior, empate = consulta["$or"]
+            revisao, ultimo_id = empate["revisao"], empate["_id"]["$gt"]
+            return ConsultaRevisao(dict(d) for d in self.documentos.values() if (d["revisao"], d["_id"]) > (revisao, ultimo_id))
+        desde = consulta["revisao"]["$gt"]
+        return ConsultaRevisao(dict(d) for d in self.documentos.values() if d["revisao"] > desde)
+
+    def find_one(self, consulta, projecao, sort):
+        documentos = sorted(self.documentos.values(), key=lambda d: d["revisao"], reverse=True)
+        return documentos[0] if documentos else None
+
+
+def testar_consulta_de_alteracoes():
+    """Cada alteração é entregue uma vez, inclusive exclusões, e sem alterações nada é entregue."""
+    print("=== Teste do Monitor de Alterações ===")
+    database = {}
+    colecao = ColecaoRevisada("tarefas", database)
+    database["tarefas_exclusoes"] = ColecaoRevisada("tarefas_exclusoes", database)
+    antiga = ObjectId()
+    colecao.documentos[antiga] = {"_id": antiga, "titulo": "Antiga", "descricao": "", "status": "Pendente", "revisao": Timestamp(1000, 1)}
+
+    monitor = MonitorAlteracoes(colecao, ao_alterar=None)
+    # A tarefa antiga cai na margem relida: é entregue uma vez e não se repete
+    assert [e[0] for e in monitor._consultar()] == ["gravada"]
+    assert monitor._consultar() == []
+
+    nova = ObjectId()
+    colecao.documentos[nova] = {"_id": nova, "titulo": "Nova", "descricao": "", "status": "Pendente", "revisao": Timestamp(1001, 1)}
+    colecao.documentos[antiga].update(titulo="Editada", revisao=Timestamp(1001, 2))
+    eventos = monitor._consultar()
+    assert eventos == [
+        ("gravada", {"_id": nova, "titulo": "Nova", "descricao": "", "status": "Pendente"}),
+        ("gravada", {"_id": antiga, "titulo": "Editada", "descricao": "", "status": "Pendente"}),
+    ]
+
+    del colecao.documentos[nova]
+    database["tarefas_exclusoes"].documentos[nova] = {"_id": nova, "revisao": Timestamp(1002, 1)}
+    assert monitor._consultar() == [("excluida", str(nova))]
+
+    # Bem depois da última alteração, a margem não traz mais nada
+    monitor._ultima = Timestamp(2000, 0)
+    assert monitor._consultar() == []
+    print("✅ Alterações entregues uma única vez")
+
+
+def testar_escrita_em_massa_na_mesma_revisao():
+    """Mais alterações que o limite por página no mesmo segundo: todas entregues, uma vez cada."""
+    database = {}
+    colecao = ColecaoRevisada("tarefas", database)
+    database["tarefas_exclusoes"] = ColecaoRevisada("tarefas_exclusoes", database)
+    monitor = MonitorAlteracoes(colecao, ao_alterar=None)
+
+    # Uma ação em massa: 2500 tarefas com revisões do mesmo segundo (muitas repetidas)
+    ids = [ObjectId() for _ in range(2500)]
+    for i, id_tarefa in enumerate(ids):
+        colecao.documentos[id_tarefa] = {"_id": id_tarefa, "titulo": f"T{i}", "descricao": "", "status": "Concluída",
+                                         "revisao": Timestamp(1000, i // 1000)}
+    eventos = monitor._consultar()
+    assert sorted(e[1]["_id"] for e in eventos) == sorted(ids)
+    assert monitor._ultima == Timestamp(1000, 2)
+    assert monitor._consultar() == []
+
+    # O monitor continua avançando depois da escrita em massa
+    nova = ObjectId()
+    colecao.documentos[nova] = {"_id": nova, "titulo": "Nova", "descricao": "", "status": "Pendente", "revisao": Timestamp(1001, 1)}
+    assert [e[1]["_id"] for e in monitor._consultar()] == [nova]
+    # Fora da margem, as revisões vistas são esquecidas
+    colecao.documentos.clear()
+    monitor._ultima = Timestamp(2000, 0)
+    monitor._consultar()
+    assert monitor._vistas == {}
+
+
+if __name__ == "__main__":
+    testar_consulta_de_alteracoes()
+    testar_escrita_em_massa_na_mesma_revisao()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste do rastreamento de desempenho (trechos, resumo e trace do Chrome)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from utils import rastreamento
+from utils.rastreamento import Rastreador, formatar_resumo
+
+# Executado em outro processo: o rastreamento é lido do ambiente quando os módulos são carregados
+SCRIPT_APLICACAO = """
+from model.tarefa_model import TarefaModel
+model = TarefaModel()
+for i in range(20):
+    model.adicionar(f"Tarefa {i}", "Descrição", "Pendente")
+model.listar()
+model.listar_pagina("Pendente", 5)
+model.encerrar()
+"""
+
+
+def testar_rastreador():
+    """Registra trechos síncronos e assíncronos, resume por nome e exporta no formato do Chrome."""
+    print("=== Teste do Rastreador ===")
+    rastreador = Rastreador(janela=100)
+    for i in range(200):
+        rastreador.registrar("model.listar", "model", 0.0, (i + 1) / 1000)
+    with rastreador.trecho("view.exibir_tarefas", "view", tarefas=3):
+        pass
+    rastreador.registrar("executor.listar", "executor", 0.0, 0.5, assincrono=True)
+
+    resumo = rastreador.resumo()
+    assert list(resumo) == ["model.listar", "executor.listar", "view.exibir_tarefas"]
+    # p50/p99 consideram só a janela recente (as últimas 100 durações); a contagem, todas
+    assert resumo["model.listar"]["contagem"] == 200
+    assert round(resumo["model.listar"]["p50_ms"]) == 150 and round(resumo["model.listar"]["p99_ms"]) == 200
+    assert "model.listar" in formatar_resumo(resumo)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        with open(rastreador.exportar(os.path.join(pasta, "trace.json")), encoding="utf-8") as arquivo:
+            eventos = json.load(arquivo)["traceEvents"]
+    fases = [e["ph"] for e in eventos if e["name"] == "executor.listar"]
+    assert fases == ["b", "e"] and any(e["ph"] == "M" for e in eventos)
+    assert sum(1 for e in eventos if e["ph"] == "X") == 201
+
+    rastreador.limpar()
+    assert rastreador.resumo() == {}
+    # Desligado (padrão), o decorador não envolve a função
+    if rastreamento.rastreador is None:
+        funcao = lambda: None
+        assert rastreamento.rastrear("model")(funcao) is funcao
+    print("✅ Trechos resumidos e exportados")
+
+
+def testar_rastreamento_aplicacao():
+    """Com RASTREAMENTO=true, as consultas do model e do armazenamento aparecem no trace ao sair."""
+    print("=== Teste do Rastreamento da Aplicação ===")
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "rastreamento.json")
+        ambiente = dict(os.environ, RASTREAMENTO="true", RASTREAMENTO_ARQUIVO=caminho, MONGO_URI="",
+                        ARMAZENAMENTO_LOCAL="memoria", DIARIO_OFFLINE_CAMINHO="", ESCRITA_ADIADA="false")
+        processo = subprocess.run([sys.executable, "-c", SCRIPT_APLICACAO], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  env=ambiente, capture_output=True, text=True)
+        assert processo.returncode == 0, processo.stderr
+        assert "model.adicionar" in processo.stdout
+        with open(caminho, encoding="utf-8") as arquivo:
+            nomes = [e["name"] for e in json.load(arquivo)["traceEvents"]]
+    assert nomes.count("model.adicionar") == 20
+    assert "model.listar_pagina" in nomes and "local.listar_pagina" in nomes
+    print("✅ Consultas do model registradas no trace")
+
+
+if __name__ == "__main__":
+    testar_rastreador()
+    testar_rastreamento_aplicacao()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste da importação e exportação em massa (JSONL e CSV) pela réplica local
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from bson import ObjectId
+
+from model.armazenamento_mongo import ArmazenamentoMongo
+from model.tarefa_model import TarefaModel
+from teste_falsos import ColecaoFalsa
+
+# Executado em outro processo, sem MongoDB: importa um arquivo e informa se o bson foi carregado
+SCRIPT_IMPORTACAO_LOCAL = """
+import sys
+from model.tarefa_model import TarefaModel
+model = TarefaModel()
+relatorio = model.importar(sys.argv[1])
+print(relatorio["importadas"], "bson" in sys.modules, "pymongo" in sys.modules)
+"""
+
+
+def criar_model_local():
+    """TarefaModel sem MongoDB (MONGO_URI vazio): as escritas vão para a réplica e o diário."""
+    anterior = os.environ.get("MONGO_URI")
+    os.environ["MONGO_URI"] = ""
+    try:
+        return TarefaModel()
+    finally:
+        if anterior is None:
+            del os.environ["MONGO_URI"]
+        else:
+            os.environ["MONGO_URI"] = anterior
+
+
+def testar_importacao_e_exportacao():
+    """Importa em lotes, ignora linhas inválidas e exporta o mesmo conteúdo em CSV e JSONL."""
+    print("=== Teste de Importação e Exportação ===")
+    quantidade = 50000
+    with tempfile.TemporaryDirectory() as pasta:
+        origem = os.path.join(pasta, "origem.jsonl")
+        with open(origem, "w", encoding="utf-8") as arquivo:
+            for i in range(quantidade):
+                status = "Concluída" if i % 4 == 0 else "Pendente"
+                arquivo.write(json.dumps({"titulo": f"Tarefa {i}", "descricao": f"Descrição, \"{i}\"", "status": status}) + "\n")
+            arquivo.write("não é json\n")
+            arquivo.write(json.dumps({"descricao": "sem título"}) + "\n")
+
+        model = criar_model_local()
+        progresso = []
+        relatorio = model.importar(origem, tamanho_lote=1000, ao_progresso=progresso.append)
+        assert relatorio["importadas"] == quantidade and relatorio["ignoradas"] == 2
+        assert len(progresso) == quantidade // 1000 and progresso[-1] == quantidade
+        assert model.local.contar() == quantidade and len(model.diario) == quantidade
+
+        csv_caminho = os.path.join(pasta, "tarefas.csv")
+        assert model.exportar(csv_caminho)["exportadas"] == quantidade
+        concluidas = os.path.join(pasta, "concluidas.jsonl")
+        assert model.exportar(concluidas, "Concluída")["exportadas"] == quantidade // 4
+
+        # Reimportar a exportação não duplica: os _id já existem
+        relatorio = model.importar(csv_caminho)
+        assert relatorio["importadas"] == 0 and relatorio["existentes"] == quantidade
+
+        destino = criar_model_local()
+        destino.importar(csv_caminho)
+        tarefas = destino.listar()
+        assert tarefas == model.listar() and tarefas[1]["descricao"] == 'Descrição, "1"'
+    print("✅ Importação e exportação preservam as tarefas")
+
+
+def testar_importacao_com_ids_repetidos():
+    """No MongoDB, só contam como importadas as tarefas que o servidor inseriu."""
+    so_no_servidor, repetido, novo = ObjectId(), ObjectId(), ObjectId()
+    colecao = ColecaoFalsa([{"_id": so_no_servidor, "titulo": "Servidor", "descricao": "", "status": "Pendente"}])
+    model = criar_model_local()
+    model.remoto = ArmazenamentoMongo(colecao)
+    with tempfile.TemporaryDirectory() as pasta:
+        origem = os.path.join(pasta, "origem.jsonl")
+        with open(origem, "w", encoding="utf-8") as arquivo:
+            for id_tarefa, titulo in [(so_no_servidor, "Arquivo"), (repetido, "Primeira"), (repetido, "Segunda"), (novo, "Nova")]:
+                arquivo.write(json.dumps({"_id": str(id_tarefa), "titulo": titulo, "descricao": "", "status": "Pendente"}) + "\n")
+        relatorio = model.importar(origem)
+    assert relatorio["importadas"] == 2 and relatorio["existentes"] == 2
+    assert colecao.documentos[repetido]["titulo"] == "Primeira" and colecao.revisados == {repetido, novo}
+    assert model.local.buscar_por_id(str(so_no_servidor)) is None
+    assert model.local.buscar_por_id(str(repetido))["titulo"] == "Primeira" and model.local.contar() == 2
+    assert len(model.diario) == 0
+
+
+def testar_importacao_sem_pymongo():
+    """Sem MongoDB, importar gera os _id sem carregar o bson nem o pymongo."""
+    with tempfile.TemporaryDirectory() as pasta:
+        origem = os.path.join(pasta, "origem.jsonl")
+        with open(origem, "w", encoding="utf-8") as arquivo:
+            for i in range(3):
+                arquivo.write(json.dumps({"titulo": f"Tarefa {i}", "descricao": "", "status": "Pendente"}) + "\n")
+        ambiente = dict(os.environ, MONGO_URI="", ARMAZENAMENTO_LOCAL="memoria", DIARIO_OFFLINE_CAMINHO="")
+        processo = subprocess.run([sys.executable, "-c", SCRIPT_IMPORTACAO_LOCAL, origem], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                  env=ambiente, capture_output=True, text=True)
+    assert processo.returncode == 0, processo.stderr
+    assert processo.stdout.splitlines()[-1] == "3 False False"
+
+
+if __name__ == "__main__":
+    testar_importacao_e_exportacao()
+    testar_importacao_com_ids_repetidos()
+    testar_importacao_sem_pymongo()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Coleção falsa do MongoDB usada pelos scripts de teste que não precisam de um servidor
+"""
+
+from types import SimpleNamespace
+
+from pymongo import InsertOne, UpdateOne, DeleteOne
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+CODIGO_CHAVE_DUPLICADA = 11000
+
+
+def _corresponde(documento, filtro):
+    """Indica se o documento atende o filtro (igualdade e $in, $eq, $ne, $gt e $exists)."""
+    for campo, condicao in (filtro or {}).items():
+        valor = documento.get(campo)
+        if not isinstance(condicao, dict):
+            if valor != condicao:
+                return False
+            continue
+        for operador, alvo in condicao.items():
+            if operador == "$in" and valor not in alvo:
+                return False
+            if operador == "$eq" and valor != alvo:
+                return False
+            if operador == "$ne" and valor == alvo:
+                return False
+            if operador == "$gt" and (valor is None or not valor > alvo):
+                return False
+            if operador == "$exists" and (campo in documento) != alvo:
+                return False
+    return True
+
+
+def _erro_duplicada(indice):
+    return {"index": indice, "code": CODIGO_CHAVE_DUPLICADA, "errmsg": "E11000 duplicate key"}
+
+
+class ColecaoFalsa:
+    """Coleção em memória com o que o model usa do pymongo: documentos num dicionário por _id.
+
+    Cada coleção de tarefas cria a sua coleção de exclusões (outra ColecaoFalsa) em
+    database["<nome>_exclusoes"]. Os comandos recebidos ficam em `comandos`; os bulk_write
+    contam em `chamadas`, os documentos entregues pelos cursores em `lidos` e, com
+    `falhar_apos`, a conexão "cai" depois dessa quantidade de documentos lidos. A revisão
+    ($currentDate) não é simulada: os _id que a receberam por update_many ficam em `revisados`.
+    """
+    def __init__(self, documentos=(), nome="tarefas", database=None):
+        self.name = nome
+        self.full_name = f"banco.{nome}"
+        self.database = database if database is not None else {}
+        self.documentos = {d["_id"]: dict(d) for d in documentos}
+        self.comandos = []
+        self.chamadas = 0
+        self.revisados = set()
+        self.lidos = 0
+        self.falhar_apos = None
+        if not nome.endswith("_exclusoes"):
+            self.database[f"{nome}_exclusoes"] = ColecaoFalsa(nome=f"{nome}_exclusoes", database=self.database)
+
+    @property
+    def exclusoes(self):
+        return self.database[f"{self.name}_exclusoes"]
+
+    @property
+    def ids(self):
+        return set(self.documentos)
+
+    def _selecionar(self, filtro):
+        return [d for d in self.documentos.values() if _corresponde(d, filtro)]
+
+    def find(self, consulta=None, projecao=None):
+        return CursorFalso(self, [dict(d) for d in self._selecionar(consulta)])
+
+    def find_one(self, consulta=None, projecao=None, sort=None):
+        documentos = [d for d in self._selecionar(consulta) if d.get("revisao") is not None]
+        return dict(max(documentos, key=lambda d: d["revisao"])) if documentos else None
+
+    def insert_many(self, documentos, ordered=True):
+        self.comandos.append(("insert_many", len(documentos)))
+        erros, inseridos = [], []
+        for indice, documento in enumerate(documentos):
+            if documento["_id"] in self.documentos:
+                erros.append(_erro_duplicada(indice))
+                if ordered:
+                    break
+                continue
+            self.documentos[documento["_id"]] = dict(documento)
+            inseridos.append(documento["_id"])
+        if erros:
+            raise BulkWriteError({"writeErrors": erros, "nInserted": len(inseridos)})
+        return SimpleNamespace(inserted_ids=inseridos)
+
+    def update_many(self, filtro, atualizacao):
+        self.comandos.append(("update_many", filtro))
+        alvos = self._selecionar(filtro)
+        modificados = 0
+        for documento in alvos:
+            novos = atualizacao.get("$set", {})
+            if any(documento.get(campo) != valor for campo, valor in novos.items()):
+                documento.update(novos)
+                modificados += 1
+            if "$currentDate" in atualizacao:
+                self.revisados.add(documento["_id"])
+        return SimpleNamespace(matched_count=len(alvos), modified_count=modificados)
+
+    def delete_many(self, filtro):
+        self.comandos.append(("delete_many", filtro))
+        alvos = [d["_id"] for d in self._selecionar(filtro)]
+        for id_documento in alvos:
+            del self.documentos[id_documento]
+        return SimpleNamespace(deleted_count=len(alvos))
+
+    def aggregate(self, etapas, **opcoes):
+        """Só o pipeline $match + $project + $merge das exclusões por filtro."""
+        self.comandos.append(("aggregate", etapas))
+        selecionados = self._selecionar(etapas[0].get("$match"))
+        destino = etapas[-1].get("$merge", {}).get("into")
+        if destino is not None:
+            for documento in selecionados:
+                self.database[destino].documentos[documento["_id"]] = {"_id": documento["_id"]}
+        return iter(())
+
+    def bulk_write(self, operacoes, ordered=True):
+        self.chamadas += 1
+        self.comandos.append(("bulk_write", len(operacoes)))
+        erros = []
+        for indice, operacao in enumerate(operacoes):
+            if isinstance(operacao, InsertOne):
+                if operacao._doc["_id"] in self.documentos:
+                    erros.append(_erro_duplicada(indice))
+                    if ordered:
+                        break
+                    continue
+                self.documentos[operacao._doc["_id"]] = dict(operacao._doc)
+            elif isinstance(operacao, UpdateOne):
+                id_documento = operacao._filter["_id"]
+                alvo = self.documentos.get(id_documento)
+                if alvo is None and operacao._upsert:
+                    alvo = self.documentos[id_documento] = {"_id": id_documento}
+                if alvo is not None:
+                    alvo.update(operacao._doc.get("$set", {}))
+            elif isinstance(operacao, DeleteOne):
+                self.documentos.pop(operacao._filter["_id"], None)
+        if erros:
+            raise BulkWriteError({"writeErrors": erros})
+
+
+class CursorFalso(list):
+    """Resultado de find: uma lista que conta os documentos lidos e pode simular uma queda."""
+    def __init__(self, colecao, documentos):
+        super().__init__(documentos)
+        self.colecao = colecao
+
+    def batch_size(self, tamanho):
+        return self
+
+    def __iter__(self):
+        for documento in list.__iter__(self):
+            if self.colecao.falhar_apos is not None and self.colecao.lidos >= self.colecao.falhar_apos:
+                raise AutoReconnect("conexão perdida")
+            self.colecao.lidos += 1
+            yield documento
+
@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de importação e exportação de tarefas em massa (JSONL ou CSV, pela extensão do arquivo)
+
+Uso:
+    python transferir_tarefas.py importar tarefas.jsonl
+    python transferir_tarefas.py exportar tarefas.csv --status Pendente
+"""
+
+import argparse
+
+from model.tarefa_model import TarefaModel
+
+def transferir_tarefas(operacao, caminho, filtro_status=None, formato=None):
+    """Importa ou exporta as tarefas, exibindo o progresso a cada lote"""
+    print(f"=== {operacao.capitalize()} Tarefas: {caminho} ===")
+
+    model = TarefaModel()
+    if not model.mongo_context.aguardar_conexao():
+        print("⚠️ Sem conexão com o MongoDB: usando a réplica local (importações vão para o diário offline)")
+
+    def exibir_progresso(quantidade):
+        print(f"  ... {quantidade} tarefas", end="\r", flush=True)
+
+    try:
+        if operacao == "importar":
+            return model.importar(caminho, formato=formato, ao_progresso=exibir_progresso)
+        return model.exportar(caminho, filtro_status, formato=formato, ao_progresso=exibir_progresso)
+    finally:
+        model.encerrar()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa ou exporta tarefas em JSONL ou CSV")
+    parser.add_argument("operacao", choices=["importar", "exportar"])
+    parser.add_argument("arquivo")
+    parser.add_argument("--status", choices=["Pendente", "Concluída"], help="exporta apenas as tarefas com este status")
+    parser.add_argument("--formato", choices=["jsonl", "csv"], help="padrão: pela extensão do arquivo")
+    argumentos = parser.parse_args()
+    transferir_tarefas(argumentos.operacao, argumentos.arquivo, argumentos.status, argumentos.formato)
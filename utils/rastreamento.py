@@ -0,0 +1,165 @@
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from itertools import count
+import atexit
+import json
+import os
+import threading
+import time
+
+# Rastreamento de desempenho (desligado por padrão): trechos cronometrados do controller, do
+# model, do MongoDB e da renderização, exportados no formato de trace do Chrome
+RASTREAMENTO = os.getenv('RASTREAMENTO', 'false').lower() in ('1', 'true', 'sim')
+RASTREAMENTO_ARQUIVO = os.getenv('RASTREAMENTO_ARQUIVO', 'rastreamento.json')
+# Eventos mantidos para a exportação (os mais antigos são descartados)
+RASTREAMENTO_MAX_EVENTOS = int(os.getenv('RASTREAMENTO_MAX_EVENTOS', '200000'))
+# Durações mais recentes de cada trecho usadas no resumo (p50/p99)
+RASTREAMENTO_JANELA = int(os.getenv('RASTREAMENTO_JANELA', '1000'))
+
+_NULO = nullcontext()
+
+
+def _percentil(ordenadas, p):
+    """Percentil p (0-100) de uma lista já ordenada, pelo método do posto mais próximo."""
+    posicao = max(0, min(len(ordenadas) - 1, int(round(p / 100 * len(ordenadas) + 0.5)) - 1))
+    return ordenadas[posicao]
+
+
+class Rastreador:
+    """Registra trechos cronometrados (spans) de qualquer thread.
+
+    Cada trecho vira um evento "X" (início e duração) do formato de trace do Chrome, aberto em
+    chrome://tracing ou no Perfetto. Trechos assíncronos, que começam em uma thread e
+    terminam em outra, viram um par de eventos "b"/"e". Além dos eventos, são mantidas as
+    durações recentes de cada nome de trecho para o resumo com contagem, p50 e p99.
+    """
+    def __init__(self, arquivo=RASTREAMENTO_ARQUIVO, max_eventos=RASTREAMENTO_MAX_EVENTOS, janela=RASTREAMENTO_JANELA):
+        self.arquivo = arquivo
+        self.janela = janela
+        self._eventos = deque(maxlen=max_eventos)
+        self._duracoes = {}   # nome -> durações recentes (s)
+        self._contagens = {}  # nome -> (quantidade, soma das durações em s)
+        self._threads = {}    # id da thread -> nome
+        self._ids_assincronos = count(1)
+        self._trava = threading.Lock()
+        self._inicio = time.perf_counter()
+        self._pid = os.getpid()
+
+    def registrar(self, nome, categoria, inicio, duracao, argumentos=None, assincrono=False):
+        """Registra um trecho que começou em `inicio` (perf_counter) e durou `duracao` segundos."""
+        thread = threading.current_thread()
+        ts = (inicio - self._inicio) * 1e6
+        if assincrono:
+            evento = {"name": nome, "cat": categoria, "ts": ts, "pid": self._pid, "tid": thread.ident, "id": next(self._ids_assincronos)}
+            eventos = [dict(evento, ph="b", args=argumentos or {}), dict(evento, ph="e", ts=ts + duracao * 1e6)]
+        else:
+            eventos = [{"name": nome, "cat": categoria, "ph": "X", "ts": ts, "dur": duracao * 1e6,
+                        "pid": self._pid, "tid": thread.ident, "args": argumentos or {}}]
+        with self._trava:
+            self._eventos.extend(eventos)
+            self._threads.setdefault(thread.ident, thread.name)
+            duracoes = self._duracoes.get(nome)
+            if duracoes is None:
+                duracoes = self._duracoes[nome] = deque(maxlen=self.janela)
+            duracoes.append(duracao)
+            quantidade, soma = self._contagens.get(nome, (0, 0.0))
+            self._contagens[nome] = (quantidade + 1, soma + duracao)
+
+    @contextmanager
+    def trecho(self, nome, categoria, **argumentos):
+        """Cronometra o bloco `with` como um trecho."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, categoria, inicio, time.perf_counter() - inicio, argumentos)
+
+    def resumo(self):
+        """Contagem, tempo total e p50/p99 (sobre a janela recente) de cada trecho, do mais custoso ao menos."""
+        with self._trava:
+            itens = [(nome, self._contagens[nome], sorted(duracoes)) for nome, duracoes in self._duracoes.items()]
+        resumo = {}
+        for nome, (quantidade, soma), duracoes in sorted(itens, key=lambda item: -item[1][1]):
+            resumo[nome] = {
+                "contagem": quantidade,
+                "total_ms": soma * 1000,
+                "p50_ms": _percentil(duracoes, 50) * 1000,
+                "p99_ms": _percentil(duracoes, 99) * 1000,
+            }
+        return resumo
+
+    def exportar(self, caminho=None):
+        """Grava os eventos no formato de trace do Chrome e retorna o caminho do arquivo."""
+        caminho = caminho or self.arquivo
+        with self._trava:
+            eventos = list(self._eventos)
+            threads = dict(self._threads)
+        metadados = [
+            {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": ident, "args": {"name": nome}}
+            for ident, nome in threads.items()
+        ]
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"traceEvents": metadados + eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
+        return caminho
+
+    def limpar(self):
+        """Descarta os eventos e as durações registrados até aqui."""
+        with self._trava:
+            self._eventos.clear()
+            self._duracoes.clear()
+            self._contagens.clear()
+
+
+# Instância global usada pela aplicação; None com o rastreamento desligado
+rastreador = Rastreador() if RASTREAMENTO else None
+
+
+def trecho(nome, categoria="app", **argumentos):
+    """Context manager que cronometra um bloco; sem rastreamento, não faz nada."""
+    if rastreador is None:
+        return _NULO
+    return rastreador.trecho(nome, categoria, **argumentos)
+
+
+def rastrear(categoria, nome=None):
+    """Decorador que registra cada chamada da função como um trecho.
+
+    Com o rastreamento desligado a função é devolvida sem alteração, sem custo nas chamadas.
+    """
+    def decorar(funcao):
+        if rastreador is None:
+            return funcao
+        nome_trecho = nome or f"{categoria}.{funcao.__name__}"
+
+        @wraps(funcao)
+        def rastreada(*args, **kwargs):
+            inicio = time.perf_counter()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                rastreador.registrar(nome_trecho, categoria, inicio, time.perf_counter() - inicio)
+        return rastreada
+    return decorar
+
+
+def formatar_resumo(resumo):
+    """Tabela de texto com o resumo dos trechos (ver Rastreador.resumo)."""
+    linhas = [f"{'trecho':<40} {'contagem':>9} {'total ms':>11} {'p50 ms':>9} {'p99 ms':>9}"]
+    for nome, medida in resumo.items():
+        linhas.append(
+            f"{nome:<40} {medida['contagem']:>9} {medida['total_ms']:>11.1f} {medida['p50_ms']:>9.2f} {medida['p99_ms']:>9.2f}"
+        )
+    return "\n".join(linhas)
+
+
+def _exportar_ao_sair():
+    """Mostra o resumo e grava o trace ao encerrar o processo."""
+    resumo = rastreador.resumo() if rastreador is not None else None
+    if resumo:
+        print(formatar_resumo(resumo))
+        caminho = rastreador.exportar()
+        print(f"📈 Trace de desempenho gravado em {caminho}")
+
+
+atexit.register(_exportar_ao_sair)
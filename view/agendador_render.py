@@ -0,0 +1,64 @@
+from collections import deque
+import time
+
+from utils.rastreamento import rastrear
+
+# Tempo máximo (ms) de trabalho de renderização por quadro antes de devolver o controle ao Tk
+ORCAMENTO_QUADRO_MS = 12
+
+
+class AgendadorRender:
+    """Executa trabalhos de renderização em lotes via after_idle, respeitando um orçamento de tempo por quadro.
+
+    Um novo agendamento cancela o trabalho pendente do anterior, então uma atualização
+    que chega no meio de outra nunca desenha dados obsoletos.
+    """
+    def __init__(self, widget, orcamento_ms=ORCAMENTO_QUADRO_MS):
+        self.widget = widget
+        self.orcamento = orcamento_ms / 1000.0
+        self._fila = deque()
+        self._ao_concluir = None
+        self._geracao = 0
+        self._id_after = None
+
+    def agendar(self, trabalhos, ao_concluir=None):
+        """Substitui o trabalho pendente pelos novos trabalhos e inicia a execução no próximo ocioso."""
+        self.cancelar()
+        self._fila = deque(trabalhos)
+        self._ao_concluir = ao_concluir
+        geracao = self._geracao
+        self._id_after = self.widget.after_idle(lambda: self._executar(geracao))
+
+    def cancelar(self):
+        """Descarta o trabalho pendente, incluindo o callback de conclusão."""
+        self._geracao += 1
+        if self._id_after is not None:
+            try:
+                self.widget.after_cancel(self._id_after)
+            except Exception:
+                pass  # O callback já foi executado ou o widget foi destruído
+            self._id_after = None
+        self._fila.clear()
+        self._ao_concluir = None
+
+    def ocupado(self):
+        """Indica se ainda há trabalho de renderização pendente."""
+        return self._id_after is not None
+
+    @rastrear("render", "render.quadro")
+    def _executar(self, geracao):
+        """Executa trabalhos até esgotar o orçamento do quadro e reagenda o restante."""
+        if geracao != self._geracao:
+            return
+        limite = time.perf_counter() + self.orcamento
+        while self._fila:
+            self._fila.popleft()()
+            if time.perf_counter() >= limite:
+                break
+        if self._fila:
+            self._id_after = self.widget.after_idle(lambda: self._executar(geracao))
+            return
+        self._id_after = None
+        ao_concluir, self._ao_concluir = self._ao_concluir, None
+        if ao_concluir is not None:
+            ao_concluir()
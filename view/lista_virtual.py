@@ -0,0 +1,302 @@
+import customtkinter as ctk
+import tkinter as tk
+import sys
+from view.agendador_render import AgendadorRender
+from utils.rastreamento import trecho
+
+
+def configurar_se_mudou(widget, **opcoes):
+    """Chama configure() apenas com as opções cujo valor mudou desde a última chamada."""
+    aplicadas = getattr(widget, "_opcoes_aplicadas", None)
+    if aplicadas is None:
+        aplicadas = widget._opcoes_aplicadas = {}
+    alteradas = {chave: valor for chave, valor in opcoes.items() if aplicadas.get(chave, aplicadas) != valor}
+    if alteradas:
+        widget.configure(**alteradas)
+        aplicadas.update(alteradas)
+
+
+class PoolCards:
+    """Conjunto de cards reutilizáveis de um modo de visualização, que cresce ou encolhe apenas pelo final."""
+    def __init__(self, canvas, criar_card, vincular_card, colunas, altura_linha):
+        self.canvas = canvas
+        self.criar_card = criar_card
+        self.vincular_card = vincular_card
+        self.colunas = colunas
+        self.altura_linha = altura_linha
+        self.cards = []        # ordem de criação
+        self.por_indice = {}   # índice do item -> card associado
+        self.livres = []       # cards materializados sem item associado
+
+    def obter_livre(self):
+        """Retorna um card livre, materializando um novo no final do pool se necessário."""
+        if self.livres:
+            return self.livres.pop()
+        with trecho("render.criar_card", "render"):
+            card = self.criar_card(self.canvas)
+        card.indice = None
+        card.id_janela = self.canvas.create_window(0, 0, window=card, anchor="nw", state="hidden")
+        self.cards.append(card)
+        return card
+
+    def liberar(self, indice):
+        """Desassocia o card do índice informado e o esconde."""
+        card = self.por_indice.pop(indice)
+        self.canvas.itemconfigure(card.id_janela, state="hidden")
+        card.indice = None
+        self.livres.append(card)
+
+    def reduzir_para(self, quantidade):
+        """Destrói os cards excedentes a partir do final do pool."""
+        while len(self.cards) > quantidade:
+            card = self.cards.pop()
+            if card.indice is not None:
+                del self.por_indice[card.indice]
+            else:
+                self.livres.remove(card)
+            self.canvas.delete(card.id_janela)
+            card.destroy()
+
+    def ocultar(self):
+        """Esconde todos os cards do pool, mantendo-os materializados para reuso."""
+        for indice in list(self.por_indice):
+            self.liberar(indice)
+
+
+class ListaVirtual(ctk.CTkFrame):
+    """Lista rolável virtualizada: materializa apenas os cards visíveis (e uma margem ao redor)
+    e os reaproveita para outras linhas conforme o usuário rola.
+
+    Cada modo de visualização tem seu próprio PoolCards; rolar uma linha só re-vincula os
+    cards dessa linha. Atualizações completas e a criação de cards novos passam pelo
+    AgendadorRender, em lotes limitados por um orçamento de tempo por quadro.
+    """
+    def __init__(self, master, height=300, linhas_extras=2, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        # Canvas que representa a lista inteira; os cards são janelas posicionadas nele
+        self._canvas = tk.Canvas(self, height=self._apply_widget_scaling(height), highlightthickness=0)
+        self._canvas.grid(row=0, column=0, sticky="nsew", padx=(6, 0), pady=6)
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._rolar)
+        self._scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 4), pady=6)
+        self._canvas.configure(yscrollcommand=self._ao_mover_visao)
+        self._atualizar_cor_fundo()
+
+        self.itens = []
+        self.linhas_extras = linhas_extras
+        self._pools = {}  # modo de visualização -> PoolCards
+        self._pool = None
+        self._sujos = set()  # índices cujos cards exibem dados de uma versão anterior dos itens
+        self._janela = (0, 0)
+        self.agendador = AgendadorRender(self)
+        self.ao_concluir_render = None  # chamado quando uma atualização de itens termina de ser desenhada
+        self.ao_aproximar_fim = None    # chamado quando a janela visível alcança o fim dos itens
+        self._notificar_conclusao = False
+
+        self._canvas.bind("<Configure>", lambda e: self._relayout())
+        # Mesmo esquema do CTkScrollableFrame: bind global filtrado pela hierarquia do widget.
+        # Os ids ficam guardados para que destroy() retire só os handlers desta lista.
+        self._binds_globais = [
+            (sequencia, self.bind_all(sequencia, self._ao_rodar_mouse, add="+"))
+            for sequencia in ("<MouseWheel>", "<Button-4>", "<Button-5>")
+        ]
+
+    def destroy(self):
+        """Retira os handlers globais da roda do mouse antes de destruir a lista.
+
+        Sem isso, cada lista recriada (ex.: ao trocar o esquema de cores) deixaria mais um handler em "all",
+        apontando para um comando Tcl que deixa de existir com o widget.
+        """
+        for sequencia, funcid in self._binds_globais:
+            script = self.tk.call("bind", "all", sequencia)
+            restante = "\n".join(linha for linha in script.split("\n") if funcid not in linha)
+            self.tk.call("bind", "all", sequencia, restante)
+        self._binds_globais = []
+        super().destroy()
+
+    def configurar_layout(self, modo, colunas, altura_linha, criar_card, vincular_card):
+        """Ativa o pool de cards do modo informado; o pool do modo anterior é apenas ocultado."""
+        self.agendador.cancelar()
+        self._sujos = set()
+        if self._pool is not None:
+            self._pool.ocultar()
+        if modo not in self._pools:
+            self._pools[modo] = PoolCards(self._canvas, criar_card, vincular_card, colunas, altura_linha)
+        self._pool = self._pools[modo]
+
+    def definir_itens(self, itens, manter_posicao=False):
+        """Substitui os itens exibidos, re-vinculando apenas os cards que estão visíveis."""
+        self.itens = itens
+        self._notificar_conclusao = True
+        if self._pool is not None:
+            self._sujos = set(self._pool.por_indice)
+        self._atualizar_area_rolagem()
+        if not manter_posicao:
+            self._canvas.yview_moveto(0)
+        self._atualizar_janela()
+
+    def atualizar_item(self, indice):
+        """Re-vincula o card do item informado, se ele estiver materializado."""
+        if self._pool is None:
+            return
+        card = self._pool.por_indice.get(indice)
+        if card is not None:
+            self._pool.vincular_card(card, indice, self.itens[indice])
+            self._sujos.discard(indice)
+
+    def atualizar_visiveis(self):
+        """Re-vincula todos os cards materializados (ex.: após mudar a marcação das tarefas)."""
+        if self._pool is None:
+            return
+        for indice in list(self._pool.por_indice):
+            self.atualizar_item(indice)
+
+    def cards_visiveis(self):
+        """Retorna os cards atualmente associados a itens, na ordem dos índices."""
+        if self._pool is None:
+            return []
+        return [self._pool.por_indice[i] for i in sorted(self._pool.por_indice)]
+
+    @property
+    def colunas(self):
+        return self._pool.colunas if self._pool is not None else 1
+
+    def _altura_linha_px(self):
+        """Altura de cada linha já considerando o fator de escala do CustomTkinter."""
+        altura = self._pool.altura_linha if self._pool is not None else 1
+        return max(1, int(self._apply_widget_scaling(altura)))
+
+    def _total_linhas(self):
+        """Quantidade de linhas necessárias para todos os itens."""
+        return (len(self.itens) + self.colunas - 1) // self.colunas
+
+    def _atualizar_area_rolagem(self):
+        """Ajusta a região rolável do canvas ao tamanho virtual da lista inteira."""
+        largura = self._canvas.winfo_width()
+        altura = self._total_linhas() * self._altura_linha_px()
+        self._canvas.configure(scrollregion=(0, 0, largura, altura))
+
+    def _relayout(self):
+        """Reposiciona os cards e ajusta o tamanho do pool após redimensionamento do canvas."""
+        self._atualizar_area_rolagem()
+        if self._pool is None:
+            return
+        # Encolhe o pool se a área visível diminuiu (sempre pelo final)
+        self._pool.reduzir_para(self._tamanho_pool_necessario())
+        for indice, card in self._pool.por_indice.items():
+            self._posicionar(card, indice)
+        self._atualizar_janela()
+
+    def _tamanho_pool_necessario(self):
+        """Quantidade de cards para cobrir a área visível mais as linhas extras."""
+        linhas_visiveis = self._canvas.winfo_height() // self._altura_linha_px() + 1
+        return (linhas_visiveis + 2 * self.linhas_extras + 1) * self.colunas
+
+    def _posicionar(self, card, indice):
+        """Posiciona e dimensiona a janela de um card na linha/coluna do índice."""
+        altura_linha = self._altura_linha_px()
+        largura_coluna = max(1, self._canvas.winfo_width() // self.colunas)
+        linha, coluna = divmod(indice, self.colunas)
+        self._canvas.coords(card.id_janela, coluna * largura_coluna, linha * altura_linha)
+        self._canvas.itemconfigure(card.id_janela, width=largura_coluna, height=altura_linha, state="normal")
+
+    def _atualizar_janela(self):
+        """Vincula cards às linhas visíveis (mais a margem) e libera os que saíram da janela."""
+        pool = self._pool
+        if pool is None:
+            return
+        altura_linha = self._altura_linha_px()
+        topo = self._canvas.canvasy(0)
+        base = topo + self._canvas.winfo_height()
+        primeira = max(0, int(topo // altura_linha) - self.linhas_extras)
+        ultima = min(self._total_linhas() - 1, int(base // altura_linha) + self.linhas_extras)
+        inicio = primeira * self.colunas
+        fim = min(len(self.itens), (ultima + 1) * self.colunas)
+        self._janela = (inicio, fim)
+        if self.ao_aproximar_fim is not None and fim >= len(self.itens):
+            self.ao_aproximar_fim()
+
+        for indice in [i for i in pool.por_indice if not inicio <= i < fim]:
+            pool.liberar(indice)
+            self._sujos.discard(indice)
+
+        pendentes = [i for i in range(inicio, fim) if i in self._sujos or i not in pool.por_indice]
+        if not pendentes:
+            return
+        if len(pool.livres) >= len(pendentes) and not self._sujos:
+            # Rolagem comum: poucos cards já materializados mudam de linha, sem custo de criação
+            for indice in pendentes:
+                self._vincular_indice(indice)
+        else:
+            # Atualização completa ou criação de cards: executa em lotes por quadro
+            self.agendador.agendar(
+                [lambda i=indice: self._vincular_indice(i) for indice in pendentes],
+                ao_concluir=self._concluir_render if self._notificar_conclusao else None
+            )
+
+    def _concluir_render(self):
+        """Notifica a view de que a última atualização de itens terminou de ser desenhada."""
+        self._notificar_conclusao = False
+        if self.ao_concluir_render is not None:
+            self.ao_concluir_render()
+
+    def _vincular_indice(self, indice):
+        """Associa um card ao item do índice, se ele ainda estiver dentro da janela visível."""
+        inicio, fim = self._janela
+        if not inicio <= indice < fim:
+            return
+        pool = self._pool
+        card = pool.por_indice.get(indice)
+        if card is None:
+            card = pool.obter_livre()
+            card.indice = indice
+            pool.por_indice[indice] = card
+            self._posicionar(card, indice)
+        with trecho("render.vincular_card", "render"):
+            pool.vincular_card(card, indice, self.itens[indice])
+        self._sujos.discard(indice)
+
+    def _rolar(self, *args):
+        """Comando da barra de rolagem."""
+        self._canvas.yview(*args)
+        self._atualizar_janela()
+
+    def _ao_mover_visao(self, primeiro, ultimo):
+        """Sincroniza a barra de rolagem e a janela de cards quando a visão do canvas muda."""
+        self._scrollbar.set(primeiro, ultimo)
+        self._atualizar_janela()
+
+    def _ao_rodar_mouse(self, event):
+        """Rola a lista quando a roda do mouse é usada sobre ela."""
+        if not self.winfo_exists() or not self._pertence_a_lista(event.widget):
+            return
+        if event.num == 4:
+            passos = -1
+        elif event.num == 5:
+            passos = 1
+        elif sys.platform == "darwin":
+            passos = -event.delta
+        else:
+            passos = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self._canvas.yview_scroll(passos, "units")
+
+    def _pertence_a_lista(self, widget):
+        """Verifica se o widget está dentro do canvas desta lista."""
+        while widget is not None:
+            if widget == self._canvas:
+                return True
+            widget = getattr(widget, "master", None)
+        return False
+
+    def _atualizar_cor_fundo(self):
+        """Aplica ao canvas a cor de fundo do frame no modo de aparência atual."""
+        cor = self.cget("fg_color")
+        if cor == "transparent":
+            cor = self.cget("bg_color")
+        self._canvas.configure(bg=self._apply_appearance_mode(cor))
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        self._atualizar_cor_fundo()
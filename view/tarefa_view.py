@@ -1,13 +1,26 @@
 import customtkinter as ctk
 from controller.tarefa_controller import TarefaController
+from view.lista_virtual import ListaVirtual, configurar_se_mudou
+from utils.rastreamento import rastreador, rastrear, trecho, formatar_resumo
 import tkinter as tk
 import threading
 import time
+import os
 
 # Configuração do tema e aparência
 ctk.set_appearance_mode("Light")  # Modes: "System" (standard), "Dark", "Light"
 ctk.set_default_color_theme("blue")  # Themes: "blue" (standard), "green", "dark-blue"
 
+# Altura fixa (em pixels sem escala) de cada linha da lista virtual
+ALTURA_LINHA_LISTA = 90
+ALTURA_LINHA_GRID = 120
+
+# Espera (ms) após a última tecla antes de buscar, para não consultar a cada letra
+ATRASO_BUSCA_MS = int(os.getenv('ATRASO_BUSCA_MS', '150'))
+
+# Acima desta quantidade de tarefas as animações de fade são desativadas
+LIMITE_ANIMACAO_TAREFAS = int(os.getenv('LIMITE_ANIMACAO_TAREFAS', '200'))
+
 class ToolTip:
     """Classe para criar tooltips explicativos nos widgets."""
     def __init__(self, widget, text):
@@ -43,9 +56,17 @@ class ToolTip:
             tw.destroy()
 
 class TarefaView:
-    def __init__(self, root):
-        """Inicializa a interface gráfica moderna e conecta com o controller."""
+    def __init__(self, root, ao_primeira_lista=None, ao_janela_visivel=None):
+        """Inicializa a interface gráfica moderna e conecta com o controller.
+
+        A construção é feita em etapas: a estrutura da janela é desenhada primeiro, as seções
+        principais e a lista em seguida e as configurações por último, cada etapa depois de a
+        anterior ser pintada. ao_janela_visivel e ao_primeira_lista, se informados, são
+        chamados quando a estrutura da janela e a primeira lista, respectivamente, são pintadas.
+        """
         self.root = root
+        self._ao_primeira_lista = ao_primeira_lista
+        self._ao_janela_visivel = ao_janela_visivel
         self.root.title("🚀 Gerenciador de Tarefas Moderno")
         self.root.geometry("1200x800")
         
@@ -56,14 +77,29 @@ class TarefaView:
         self.controller = TarefaController(self)
         self.id_tarefa_selecionada = None
         self.tarefas_data = []  # Armazenar dados das tarefas
+        self.total_tarefas = None  # Total do filtro atual (as tarefas chegam em páginas)
+        self.resumo_status = None  # Última contagem por status exibida no painel de resumo
+        self._indice_por_id = {}  # id (str) -> posição em tarefas_data
+        self.ids_marcados = set()  # ids (str) marcados para as ações em massa
+        self.marcar_todas = False  # ações em massa valem para todas as tarefas do filtro
         self.modo_visualizacao = "lista"  # "lista" ou "grid"
+        self.interface_pronta = False  # todas as etapas de construção concluídas
         
-        self._criar_widgets()
-        self._configurar_atalhos_teclado()
-        self.controller.carregar_tarefas()
+        self._criar_estrutura()
+        self.root.protocol("WM_DELETE_WINDOW", self._ao_fechar)
+        self._agendar_etapa(self._criar_secoes_principais)
+
+    def _ao_fechar(self):
+        """Encerra a thread de trabalho do controller e fecha a janela."""
+        self.controller.encerrar()
+        self.root.destroy()
 
-    def _criar_widgets(self):
-        """Cria e posiciona todos os widgets da interface gráfica moderna."""
+    def _agendar_etapa(self, etapa):
+        """Executa a etapa de construção depois que a mainloop processar (e pintar) o que já existe."""
+        self.root.after_idle(lambda: self.root.after(0, etapa))
+
+    def _criar_estrutura(self):
+        """Cria a estrutura da janela (título e frame principal), exibida antes das seções."""
         # Título principal
         titulo_principal = ctk.CTkLabel(
             self.root, 
@@ -77,6 +113,11 @@ class TarefaView:
         self.main_frame.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="nsew")
         self.main_frame.grid_columnconfigure(0, weight=1)
         
+    def _criar_secoes_principais(self):
+        """Cria as seções de uso imediato e carrega a primeira página de tarefas."""
+        if self._ao_janela_visivel is not None:
+            self._ao_janela_visivel()
+        
         # Seção de entrada de dados
         self._criar_secao_entrada()
         
@@ -86,12 +127,18 @@ class TarefaView:
         # Seção de filtros
         self._criar_secao_filtros()
         
-        # Seção de configurações
-        self._criar_secao_configuracoes()
-        
         # Seção de lista de tarefas
         self._criar_secao_lista()
         
+        self._configurar_atalhos_teclado()
+        self.controller.carregar_tarefas()
+        self._agendar_etapa(self._criar_secoes_secundarias)
+        
+    def _criar_secoes_secundarias(self):
+        """Cria a seção de configurações, que não é necessária para a primeira lista."""
+        self._criar_secao_configuracoes()
+        self.interface_pronta = True
+        
     def _configurar_atalhos_teclado(self):
         """Configura atalhos de teclado para ações frequentes."""
         # Ctrl+N - Nova tarefa (limpar campos)
@@ -109,6 +156,9 @@ class TarefaView:
         # Ctrl+F - Focar no filtro
         self.root.bind('<Control-f>', lambda e: self.combo_filtro.focus())
         
+        # Ctrl+B - Focar na busca
+        self.root.bind('<Control-b>', lambda e: self.entrada_busca.focus())
+        
         # Enter no campo título - focar na descrição
         self.entrada_titulo.bind('<Return>', lambda e: self.texto_descricao.focus())
         
@@ -119,12 +169,49 @@ class TarefaView:
         # Ctrl+G - Alternar modo de visualização
         self.root.bind('<Control-g>', lambda e: self._alternar_modo_visualizacao())
         
+        # Ctrl+T - Resumo de desempenho (apenas com RASTREAMENTO=true)
+        if rastreador is not None:
+            self.root.bind('<Control-t>', lambda e: self._abrir_resumo_rastreamento())
+        
     def _limpar_campos_atalho(self):
         """Limpa os campos e remove seleção (atalho Ctrl+N)."""
         self.limpar_campos()
         self.id_tarefa_selecionada = None
         self.entrada_titulo.focus()  # Foca no campo título
         
+    def _abrir_resumo_rastreamento(self):
+        """Abre a janela com o resumo dos trechos rastreados, atualizado a cada segundo (atalho Ctrl+T)."""
+        janela = getattr(self, "_janela_rastreamento", None)
+        if janela is not None and janela.winfo_exists():
+            janela.lift()
+            return
+        janela = self._janela_rastreamento = ctk.CTkToplevel(self.root)
+        janela.title("📈 Desempenho")
+        janela.geometry("820x480")
+        janela.grid_columnconfigure(2, weight=1)
+        janela.grid_rowconfigure(0, weight=1)
+        
+        texto = ctk.CTkTextbox(janela, font=ctk.CTkFont(family="Courier", size=12), wrap="none")
+        texto.grid(row=0, column=0, columnspan=3, padx=10, pady=(10, 5), sticky="nsew")
+        mensagem = ctk.CTkLabel(janela, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        
+        def exportar():
+            mensagem.configure(text=f"Trace gravado em {rastreador.exportar()}")
+        
+        ctk.CTkButton(janela, text="💾 Exportar trace", command=exportar, width=140).grid(row=1, column=0, padx=(10, 5), pady=(5, 10))
+        ctk.CTkButton(janela, text="🧹 Limpar", command=rastreador.limpar, width=100).grid(row=1, column=1, padx=5, pady=(5, 10))
+        mensagem.grid(row=1, column=2, padx=10, pady=(5, 10), sticky="w")
+        
+        def atualizar():
+            if not janela.winfo_exists():
+                return
+            texto.configure(state="normal")
+            texto.delete("1.0", "end")
+            texto.insert("1.0", formatar_resumo(rastreador.resumo()))
+            texto.configure(state="disabled")
+            janela.after(1000, atualizar)
+        atualizar()
+        
     def _criar_secao_entrada(self):
         """Cria a seção de entrada de dados."""
         # Frame de entrada
@@ -280,9 +367,48 @@ class TarefaView:
             fg_color="#4169E1",
             hover_color="#0000CD"
         )
-        self.btn_filtrar.grid(row=1, column=2, padx=(10, 20), pady=(5, 20), sticky="e")
+        self.btn_filtrar.grid(row=1, column=2, padx=(10, 20), pady=5, sticky="e")
         ToolTip(self.btn_filtrar, "Filtra a lista de tarefas pelo status selecionado")
         
+        # Busca por texto (enquanto digita)
+        ctk.CTkLabel(
+            filtros_frame, 
+            text="Buscar:", 
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).grid(row=2, column=0, padx=(20, 10), pady=(5, 20), sticky="w")
+        
+        self.entrada_busca = ctk.CTkEntry(
+            filtros_frame,
+            placeholder_text="Palavras do título ou da descrição...",
+            height=40,
+            font=ctk.CTkFont(size=14)
+        )
+        self.entrada_busca.grid(row=2, column=1, columnspan=2, padx=(10, 20), pady=(5, 20), sticky="ew")
+        self.entrada_busca.bind('<KeyRelease>', self._agendar_busca)
+        self.entrada_busca.bind('<FocusIn>', lambda e: self.controller.preparar_busca())
+        self._id_busca_agendada = None
+        ToolTip(self.entrada_busca, "Mostra as tarefas que contêm as palavras digitadas\nAtalho: Ctrl+B para focar")
+        
+        self._criar_painel_resumo(filtros_frame)
+        
+    def _criar_painel_resumo(self, filtros_frame):
+        """Cria o painel com a quantidade total de tarefas, as pendentes e as concluídas."""
+        resumo_frame = ctk.CTkFrame(filtros_frame, fg_color="transparent")
+        resumo_frame.grid(row=3, column=0, columnspan=3, padx=20, pady=(0, 15), sticky="ew")
+        resumo_frame.grid_columnconfigure((0, 1, 2, 3), weight=1)
+        
+        self.labels_resumo = {}
+        for coluna, (chave, cor) in enumerate([
+            ("total", None), ("Pendente", "#FF8C00"), ("Concluída", "#32CD32"), ("progresso", "#4169E1")
+        ]):
+            label = ctk.CTkLabel(resumo_frame, text="", font=ctk.CTkFont(size=14, weight="bold"))
+            if cor is not None:
+                label.configure(text_color=cor)
+            label.grid(row=0, column=coluna, padx=5, sticky="ew")
+            self.labels_resumo[chave] = label
+        ToolTip(resumo_frame, "Quantidade de tarefas por status, sem considerar o filtro e a busca")
+        self.exibir_resumo(self.resumo_status)
+        
     def _criar_secao_configuracoes(self):
         """Cria a seção de configurações de tema e cores."""
         config_frame = ctk.CTkFrame(self.main_frame, corner_radius=15)
@@ -342,6 +468,7 @@ class TarefaView:
         # Reinicia a interface para aplicar as novas cores
         self._recriar_interface()
         
+    @rastrear("view")
     def _recriar_interface(self):
         """Recria a interface para aplicar mudanças de cor."""
         # Limpa todos os widgets do frame principal
@@ -355,17 +482,31 @@ class TarefaView:
         self._criar_secao_configuracoes()
         self._criar_secao_lista()
         
-        # Recarrega as tarefas
-        self.controller.carregar_tarefas()
+        # Redesenha as tarefas já carregadas; o controller só as consulta de novo se mudaram
+        self.combo_filtro.set(self.controller.filtro_status or "Todos")
+        if self.controller.texto_busca:
+            self.entrada_busca.insert(0, self.controller.texto_busca)
+        self.exibir_tarefas(self.tarefas_data, total=self.total_tarefas)
+        self.controller.carregar_tarefas(self.controller.filtro_status)
         
     def _alternar_modo_visualizacao(self):
         """Alterna entre modo lista e grid com animação suave."""
+        if not self._animacoes_ativas():
+            # Muitas tarefas: alterna imediatamente, sem animação
+            self._completar_alternancia_modo()
+            return
+        
         # Animação de fade-out
         self._animar_fade_out()
         
         # Aguarda um pouco para o fade-out
         self.root.after(150, self._completar_alternancia_modo)
         
+    def _animacoes_ativas(self):
+        """As animações são desativadas automaticamente acima de LIMITE_ANIMACAO_TAREFAS tarefas."""
+        return len(self.tarefas_data) <= LIMITE_ANIMACAO_TAREFAS
+        
+    @rastrear("view")
     def _completar_alternancia_modo(self):
         """Completa a alternância de modo após o fade-out."""
         if self.modo_visualizacao == "lista":
@@ -374,48 +515,50 @@ class TarefaView:
         else:
             self.modo_visualizacao = "lista"
             self.btn_modo_visualizacao.configure(text="🔲 Grid")
+        self._configurar_layout_lista()
         
         # Reexibe as tarefas no novo modo com fade-in
         self.exibir_tarefas(self.tarefas_data)
         
     def _animar_fade_out(self):
         """Cria efeito de fade-out nos cards existentes."""
-        for widget in self.tarefas_scroll_frame.winfo_children():
+        for widget in self.lista_virtual.cards_visiveis():
             # Simula fade-out alterando a opacidade visual
             try:
                 widget.configure(fg_color=("gray85", "gray20"))
             except:
                 pass  # Ignora widgets que não suportam fg_color
     
-    def _animar_fade_in(self, widget):
-        """Anima fade-in de um widget"""
-        try:
-            # Inicia com transparência simulada
-            widget.configure(fg_color=("gray95", "gray15"))
-            
-            def fade_step(step):
-                if step < 10:
-                    # Gradualmente volta à cor normal
-                    progress = step / 10.0
-                    if progress < 0.5:
-                        # Primeira metade: de cinza claro para cor normal
-                        widget.configure(fg_color=("gray90", "gray18"))
-                    else:
-                        # Segunda metade: cor normal - remove o atributo para usar padrão
-                        widget.configure(fg_color=("gray75", "gray25"))  # Cor padrão do CTkFrame
-                    
-                    self.root.after(30, lambda: fade_step(step + 1))
+    def _animar_fade_in(self, widgets):
+        """Anima fade-in de um lote de widgets com uma única sequência de callbacks."""
+        widgets = list(widgets)
+        
+        def aplicar_cor(cor):
+            for widget in widgets:
+                try:
+                    widget.configure(fg_color=cor)
+                except:
+                    pass  # Ignora widgets destruídos ou que não suportam fg_color
+        
+        def fade_step(step):
+            if step < 10:
+                # Gradualmente volta à cor normal
+                progress = step / 10.0
+                if progress < 0.5:
+                    # Primeira metade: de cinza claro para cor normal
+                    aplicar_cor(("gray90", "gray18"))
                 else:
-                    # Garante que termina com a cor padrão do CTkFrame
-                    widget.configure(fg_color=("gray75", "gray25"))
-            
-            fade_step(0)
-        except:
-            # Se houver erro, apenas garante que o widget fica visível
-            try:
-                widget.configure(fg_color=("gray75", "gray25"))
-            except:
-                pass
+                    # Segunda metade: cor normal - remove o atributo para usar padrão
+                    aplicar_cor(("gray75", "gray25"))  # Cor padrão do CTkFrame
+                
+                self.root.after(30, lambda: fade_step(step + 1))
+            else:
+                # Garante que termina com a cor padrão do CTkFrame
+                aplicar_cor(("gray75", "gray25"))
+        
+        # Inicia com transparência simulada
+        aplicar_cor(("gray95", "gray15"))
+        fade_step(0)
         
     def _criar_secao_lista(self):
         """Cria a seção de lista de tarefas."""
@@ -428,12 +571,13 @@ class TarefaView:
         header_frame.grid(row=0, column=0, sticky="ew", padx=20, pady=(15, 10))
         header_frame.grid_columnconfigure(0, weight=1)
         
-        # Título da seção
-        ctk.CTkLabel(
+        # Título da seção (com a contagem de tarefas carregadas / total do filtro)
+        self.label_lista = ctk.CTkLabel(
             header_frame, 
             text="📝 Lista de Tarefas", 
             font=ctk.CTkFont(size=18, weight="bold")
-        ).grid(row=0, column=0, sticky="w")
+        )
+        self.label_lista.grid(row=0, column=0, sticky="w")
         
         # Botão para alternar visualização
         self.btn_modo_visualizacao = ctk.CTkButton(
@@ -444,207 +588,451 @@ class TarefaView:
             height=30,
             font=ctk.CTkFont(size=12)
         )
-        self.btn_modo_visualizacao.grid(row=0, column=1, sticky="e")
+        self.btn_modo_visualizacao.grid(row=0, column=2, sticky="e")
         ToolTip(self.btn_modo_visualizacao, "Alterna entre visualização em lista e grid\nAtalho: Ctrl+G")
         
-        # Frame scrollável para as tarefas
-        self.tarefas_scroll_frame = ctk.CTkScrollableFrame(
+        # Indicador de operação em andamento (visível apenas enquanto o banco é consultado)
+        self.barra_ocupado = ctk.CTkProgressBar(header_frame, mode="indeterminate", width=120, height=8)
+        self.definir_ocupado(self.controller.executor.ocupado())
+        
+        # Ações em massa sobre as tarefas marcadas nos cards
+        self._criar_barra_marcacao(lista_frame)
+        
+        # Lista virtualizada: apenas os cards visíveis são materializados
+        self.lista_virtual = ListaVirtual(
             lista_frame, 
             height=300,
             corner_radius=10
         )
-        self.tarefas_scroll_frame.grid(row=1, column=0, padx=20, pady=(0, 20), sticky="ew")
-        self.tarefas_scroll_frame.grid_columnconfigure(0, weight=1)
+        self.lista_virtual.grid(row=2, column=0, padx=20, pady=(0, 20), sticky="ew")
+        # Próximas páginas são buscadas quando o usuário rola perto do fim da lista
+        self.lista_virtual.ao_aproximar_fim = self.controller.carregar_mais_tarefas
+        self._configurar_layout_lista()
 
-    def exibir_tarefas(self, tarefas):
-        """Exibe as tarefas na interface gráfica moderna."""
-        # Limpa tarefas existentes
-        for widget in self.tarefas_scroll_frame.winfo_children():
-            widget.destroy()
-        
-        # Armazena as tarefas para seleção
-        self.tarefas_data = tarefas
-        
-        # Configura o grid baseado no modo de visualização
+    def _criar_barra_marcacao(self, lista_frame):
+        """Cria a barra de ações em massa (concluir, reabrir e excluir as tarefas marcadas)."""
+        barra_frame = ctk.CTkFrame(lista_frame, fg_color="transparent")
+        barra_frame.grid(row=1, column=0, sticky="ew", padx=20, pady=(0, 10))
+        barra_frame.grid_columnconfigure(1, weight=1)
+        
+        # Marca todas as tarefas do filtro, inclusive as das páginas ainda não carregadas
+        self.check_todas = ctk.CTkCheckBox(
+            barra_frame,
+            text="Todas",
+            command=self._alternar_todas,
+            font=ctk.CTkFont(size=12)
+        )
+        self.check_todas.grid(row=0, column=0, padx=(0, 10), sticky="w")
+        ToolTip(self.check_todas, "Marca todas as tarefas do filtro atual (ou do resultado da busca)")
+        
+        self.label_marcadas = ctk.CTkLabel(barra_frame, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        self.label_marcadas.grid(row=0, column=1, sticky="w")
+        
+        acoes = [
+            ("✅ Concluir", self._concluir_marcadas, "#2E8B57", "#228B22", "Marca as tarefas selecionadas como concluídas"),
+            ("⏳ Reabrir", self._reabrir_marcadas, "#FF8C00", "#FF7F00", "Volta as tarefas selecionadas para pendentes"),
+            ("🗑️ Excluir", self._excluir_marcadas, "#DC143C", "#B22222", "Remove permanentemente as tarefas selecionadas"),
+        ]
+        for coluna, (texto, comando, cor, cor_hover, dica) in enumerate(acoes, start=2):
+            botao = ctk.CTkButton(
+                barra_frame,
+                text=texto,
+                command=comando,
+                width=100,
+                height=30,
+                font=ctk.CTkFont(size=12),
+                fg_color=cor,
+                hover_color=cor_hover
+            )
+            botao.grid(row=0, column=coluna, padx=(10, 0), sticky="e")
+            ToolTip(botao, dica)
+        self._atualizar_marcacao()
+
+    def _configurar_layout_lista(self):
+        """Ativa na lista virtual o pool de cards do modo de visualização atual."""
         if self.modo_visualizacao == "grid":
             # Modo grid: 2 colunas
-            self.tarefas_scroll_frame.grid_columnconfigure(0, weight=1)
-            self.tarefas_scroll_frame.grid_columnconfigure(1, weight=1)
-            
-            # Cria cards para cada tarefa em grid com animação
-            for i, tarefa in enumerate(tarefas):
-                row = i // 2
-                col = i % 2
-                self.root.after(i * 50, lambda t=tarefa, idx=i, r=row, c=col: self._criar_card_tarefa_grid_animado(t, idx, r, c))
+            self.lista_virtual.configurar_layout("grid", 2, ALTURA_LINHA_GRID, self._criar_card_tarefa_grid, self._vincular_card_tarefa_grid)
         else:
             # Modo lista: 1 coluna
-            self.tarefas_scroll_frame.grid_columnconfigure(0, weight=1)
-            
-            # Cria cards para cada tarefa em lista com animação
-            for i, tarefa in enumerate(tarefas):
-                self.root.after(i * 50, lambda t=tarefa, idx=i: self._criar_card_tarefa_animado(t, idx))
+            self.lista_virtual.configurar_layout("lista", 1, ALTURA_LINHA_LISTA, self._criar_card_tarefa, self._vincular_card_tarefa)
+
+    def definir_ocupado(self, ocupado):
+        """Mostra ou esconde o indicador de carregamento da lista."""
+        if ocupado:
+            self.barra_ocupado.grid(row=0, column=1, padx=(0, 10), sticky="e")
+            self.barra_ocupado.start()
+        else:
+            self.barra_ocupado.stop()
+            self.barra_ocupado.grid_remove()
+
+    @rastrear("view")
+    def exibir_tarefas(self, tarefas, total=None):
+        """Exibe as tarefas na interface gráfica moderna.
+
+        `total` é a quantidade de tarefas do filtro quando a lista é apenas a primeira página.
+        """
+        # Armazena as tarefas para seleção
+        self.tarefas_data = tarefas
+        self.total_tarefas = total
+        with trecho("view.exibir_tarefas.indexar", "view"):
+            self._indice_por_id = {str(t["_id"]): i for i, t in enumerate(tarefas)}
+        
+        # Só os cards da janela visível são (re)vinculados, independente do total de tarefas;
+        # os cards do pool são reconfigurados no lugar, em lotes agendados por quadro
+        if self._animacoes_ativas():
+            self.lista_virtual.ao_concluir_render = lambda: self._animar_fade_in(self.lista_virtual.cards_visiveis())
+        else:
+            self.lista_virtual.ao_concluir_render = None
+        with trecho("view.exibir_tarefas.definir_itens", "view"):
+            self.lista_virtual.definir_itens(tarefas)
+        self._atualizar_contagem()
+        if self._ao_primeira_lista is not None:
+            self._aguardar_primeira_pintura()
+
+    def _aguardar_primeira_pintura(self):
+        """Aguarda o fim da renderização em lotes e notifica que a primeira lista foi pintada."""
+        if self.lista_virtual.agendador.ocupado():
+            self.root.after(1, self._aguardar_primeira_pintura)
+            return
+        self.root.update_idletasks()
+        callback, self._ao_primeira_lista = self._ao_primeira_lista, None
+        if callback is not None:
+            callback()
     
-    def _criar_card_tarefa(self, tarefa, index):
-        """Cria um card visual para uma tarefa."""
+    def _localizar_tarefa(self, id_tarefa):
+        """Retorna a posição da tarefa em tarefas_data, ou None se ela não estiver exibida.
+
+        O mapa id -> posição é mantido a cada alteração de tarefas_data, então a consulta não
+        percorre a lista, nem para tarefas que não estão exibidas.
+        """
+        return self._indice_por_id.get(str(id_tarefa))
+
+    def exibir_resumo(self, contagem):
+        """Mostra no painel de resumo as contagens por status (ver TarefaModel.contar_por_status)."""
+        self.resumo_status = contagem
+        if contagem is None or not hasattr(self, "labels_resumo"):
+            return
+        total = contagem["total"]
+        pendentes = contagem["por_status"].get("Pendente", 0)
+        concluidas = contagem["por_status"].get("Concluída", 0)
+        progresso = concluidas * 100 // total if total else 0
+        textos = {
+            "total": f"📊 {total} tarefa(s)",
+            "Pendente": f"⏳ {pendentes} pendente(s)",
+            "Concluída": f"✅ {concluidas} concluída(s)",
+            "progresso": f"🎯 {progresso}% concluído",
+        }
+        for chave, texto in textos.items():
+            configurar_se_mudou(self.labels_resumo[chave], text=texto)
+
+    def _atualizar_contagem(self):
+        """Mostra no cabeçalho quantas tarefas estão carregadas e o total do filtro."""
+        carregadas = len(self.tarefas_data)
+        if self.total_tarefas is not None and self.total_tarefas > carregadas:
+            texto = f"📝 Lista de Tarefas ({carregadas} de {self.total_tarefas})"
+        else:
+            texto = f"📝 Lista de Tarefas ({carregadas})"
+        configurar_se_mudou(self.label_lista, text=texto)
+        self._atualizar_marcacao()
+
+    @rastrear("view")
+    def acrescentar_tarefas(self, tarefas):
+        """Acrescenta uma nova página de tarefas ao final da lista exibida."""
+        inicio = len(self.tarefas_data)
+        self.tarefas_data.extend(tarefas)
+        for i, tarefa in enumerate(tarefas, start=inicio):
+            self._indice_por_id[str(tarefa["_id"])] = i
+        self.lista_virtual.definir_itens(self.tarefas_data, manter_posicao=True)
+        self._atualizar_contagem()
+
+    def inserir_tarefa(self, tarefa):
+        """Acrescenta uma tarefa ao final da lista exibida sem recarregar as demais."""
+        self._indice_por_id[str(tarefa["_id"])] = len(self.tarefas_data)
+        self.tarefas_data.append(tarefa)
+        if self.total_tarefas is not None:
+            self.total_tarefas += 1
+        self.lista_virtual.definir_itens(self.tarefas_data, manter_posicao=True)
+        self._atualizar_contagem()
+
+    def atualizar_tarefa_exibida(self, tarefa):
+        """Substitui os dados de uma tarefa exibida e atualiza apenas o seu card."""
+        indice = self._localizar_tarefa(tarefa["_id"])
+        if indice is None:
+            return False
+        # Preserva o _id original (ObjectId no MongoDB) da tarefa exibida
+        self.tarefas_data[indice] = dict(tarefa, _id=self.tarefas_data[indice]["_id"])
+        self.lista_virtual.atualizar_item(indice)
+        return True
+
+    def remover_tarefa_exibida(self, id_tarefa):
+        """Remove uma tarefa da lista exibida; só os cards visíveis são re-vinculados."""
+        indice = self._localizar_tarefa(id_tarefa)
+        if indice is None:
+            return False
+        del self.tarefas_data[indice]
+        del self._indice_por_id[str(id_tarefa)]
+        # Só as tarefas depois da removida mudam de posição
+        indice_por_id = self._indice_por_id
+        for posicao in range(indice, len(self.tarefas_data)):
+            indice_por_id[str(self.tarefas_data[posicao]["_id"])] = posicao
+        if self.total_tarefas is not None:
+            self.total_tarefas -= 1
+        self.lista_virtual.definir_itens(self.tarefas_data, manter_posicao=True)
+        self._atualizar_contagem()
+        return True
+
+    def atualizar_status_exibidas(self, ids, status):
+        """Aplica um novo status a várias tarefas exibidas; só os cards visíveis são re-vinculados."""
+        for id_tarefa in ids:
+            indice = self._localizar_tarefa(id_tarefa)
+            if indice is not None:
+                self.tarefas_data[indice] = dict(self.tarefas_data[indice], status=status)
+        self.lista_virtual.atualizar_visiveis()
+
+    def remover_tarefas_exibidas(self, ids):
+        """Remove várias tarefas da lista exibida de uma vez; retorna quantas estavam exibidas."""
+        remover = {str(i) for i in ids}
+        restantes = [t for t in self.tarefas_data if str(t["_id"]) not in remover]
+        removidas = len(self.tarefas_data) - len(restantes)
+        if not removidas:
+            return 0
+        self.tarefas_data = restantes
+        self._indice_por_id = {str(t["_id"]): i for i, t in enumerate(restantes)}
+        if self.total_tarefas is not None:
+            self.total_tarefas -= removidas
+        self.lista_virtual.definir_itens(self.tarefas_data, manter_posicao=True)
+        self._atualizar_contagem()
+        return removidas
+
+    def _estilo_status(self, status):
+        """Retorna o ícone e a cor correspondentes ao status da tarefa."""
+        if status == "Concluída":
+            return "✅", "#2E8B57"
+        return "⏳", "#FF8C00"
+
+    def _criar_card_tarefa(self, master):
+        """Cria um card visual reutilizável para o modo lista."""
         # Frame do card
-        card_frame = ctk.CTkFrame(self.tarefas_scroll_frame, corner_radius=10)
-        card_frame.grid(row=index, column=0, padx=10, pady=5, sticky="ew")
-        card_frame.grid_columnconfigure(1, weight=1)
+        card_frame = ctk.CTkFrame(master, corner_radius=10)
+        card_frame.grid_columnconfigure(2, weight=1)
+        card_frame.grid_propagate(False)
         
-        # Ícone de status
-        status_icon = "✅" if tarefa["status"] == "Concluída" else "⏳"
-        status_color = "#2E8B57" if tarefa["status"] == "Concluída" else "#FF8C00"
+        # Marcação para as ações em massa
+        card_frame.marcador = self._criar_marcador(card_frame, card_frame)
+        card_frame.marcador.grid(row=0, column=0, rowspan=2, padx=(15, 0), pady=15)
         
         # Label do status
-        status_label = ctk.CTkLabel(
+        card_frame.status_label = ctk.CTkLabel(
             card_frame,
-            text=status_icon,
-            font=ctk.CTkFont(size=20),
-            text_color=status_color
+            text="",
+            font=ctk.CTkFont(size=20)
         )
-        status_label.grid(row=0, column=0, rowspan=2, padx=(15, 10), pady=15, sticky="n")
+        card_frame.status_label.grid(row=0, column=1, rowspan=2, padx=(5, 10), pady=15, sticky="n")
         
         # Título da tarefa
-        titulo_label = ctk.CTkLabel(
+        card_frame.titulo_label = ctk.CTkLabel(
             card_frame,
-            text=tarefa["titulo"],
+            text="",
             font=ctk.CTkFont(size=16, weight="bold"),
             anchor="w"
         )
-        titulo_label.grid(row=0, column=1, padx=(0, 15), pady=(15, 5), sticky="ew")
+        card_frame.titulo_label.grid(row=0, column=2, padx=(0, 15), pady=(15, 5), sticky="ew")
         
         # Descrição da tarefa
-        descricao_text = tarefa["descricao"][:100] + "..." if len(tarefa["descricao"]) > 100 else tarefa["descricao"]
-        descricao_label = ctk.CTkLabel(
+        card_frame.descricao_label = ctk.CTkLabel(
             card_frame,
-            text=descricao_text,
+            text="",
             font=ctk.CTkFont(size=12),
             anchor="w",
             text_color="gray"
         )
-        descricao_label.grid(row=1, column=1, padx=(0, 15), pady=(0, 15), sticky="ew")
+        card_frame.descricao_label.grid(row=1, column=2, padx=(0, 15), pady=(0, 15), sticky="ew")
         
         # Botão de seleção
-        select_btn = ctk.CTkButton(
+        card_frame.select_btn = ctk.CTkButton(
             card_frame,
             text="📝",
             width=40,
             height=30,
-            command=lambda idx=index: self._selecionar_tarefa(idx),
+            command=lambda: self._selecionar_tarefa(card_frame.indice),
             font=ctk.CTkFont(size=14)
         )
-        select_btn.grid(row=0, column=2, rowspan=2, padx=(0, 15), pady=15)
-        ToolTip(select_btn, "Seleciona esta tarefa para edição ou exclusão")
+        card_frame.select_btn.grid(row=0, column=3, rowspan=2, padx=(0, 15), pady=15)
+        ToolTip(card_frame.select_btn, "Seleciona esta tarefa para edição ou exclusão")
+        return card_frame
+
+    def _vincular_card_tarefa(self, card_frame, index, tarefa):
+        """Associa um card do modo lista a uma tarefa."""
+        status_icon, status_color = self._estilo_status(tarefa["status"])
+        descricao_text = tarefa["descricao"][:100] + "..." if len(tarefa["descricao"]) > 100 else tarefa["descricao"]
+        configurar_se_mudou(card_frame.status_label, text=status_icon, text_color=status_color)
+        configurar_se_mudou(card_frame.titulo_label, text=tarefa["titulo"])
+        configurar_se_mudou(card_frame.descricao_label, text=descricao_text)
+        self._vincular_marcador(card_frame, tarefa)
         
-    def _criar_card_tarefa_grid(self, tarefa, index, row, col):
-        """Cria um card visual compacto para uma tarefa no modo grid."""
+    def _criar_card_tarefa_grid(self, master):
+        """Cria um card visual compacto e reutilizável para o modo grid."""
         # Frame do card (mais compacto para grid)
-        card_frame = ctk.CTkFrame(self.tarefas_scroll_frame, corner_radius=10)
-        card_frame.grid(row=row, column=col, padx=5, pady=5, sticky="ew")
+        card_frame = ctk.CTkFrame(master, corner_radius=10)
         card_frame.grid_columnconfigure(0, weight=1)
+        card_frame.grid_propagate(False)
         
         # Ícone de status e título na mesma linha
         header_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
         header_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 5))
         header_frame.grid_columnconfigure(1, weight=1)
         
-        # Ícone de status
-        status_icon = "✅" if tarefa["status"] == "Concluída" else "⏳"
-        status_color = "#2E8B57" if tarefa["status"] == "Concluída" else "#FF8C00"
-        
-        status_label = ctk.CTkLabel(
+        card_frame.status_label = ctk.CTkLabel(
             header_frame,
-            text=status_icon,
-            font=ctk.CTkFont(size=16),
-            text_color=status_color
+            text="",
+            font=ctk.CTkFont(size=16)
         )
-        status_label.grid(row=0, column=0, padx=(0, 8), sticky="w")
+        card_frame.status_label.grid(row=0, column=0, padx=(0, 8), sticky="w")
         
         # Título da tarefa (truncado para grid)
-        titulo_truncado = tarefa["titulo"][:25] + "..." if len(tarefa["titulo"]) > 25 else tarefa["titulo"]
-        titulo_label = ctk.CTkLabel(
+        card_frame.titulo_label = ctk.CTkLabel(
             header_frame,
-            text=titulo_truncado,
+            text="",
             font=ctk.CTkFont(size=14, weight="bold"),
             anchor="w"
         )
-        titulo_label.grid(row=0, column=1, sticky="ew")
+        card_frame.titulo_label.grid(row=0, column=1, sticky="ew")
+        
+        # Marcação para as ações em massa
+        card_frame.marcador = self._criar_marcador(header_frame, card_frame)
+        card_frame.marcador.grid(row=0, column=2, padx=(8, 0), sticky="e")
         
         # Descrição da tarefa (mais curta para grid)
-        descricao_text = tarefa["descricao"][:50] + "..." if len(tarefa["descricao"]) > 50 else tarefa["descricao"]
-        descricao_label = ctk.CTkLabel(
+        card_frame.descricao_label = ctk.CTkLabel(
             card_frame,
-            text=descricao_text,
+            text="",
             font=ctk.CTkFont(size=11),
             anchor="w",
             text_color="gray"
         )
-        descricao_label.grid(row=1, column=0, padx=10, pady=(0, 5), sticky="ew")
+        card_frame.descricao_label.grid(row=1, column=0, padx=10, pady=(0, 5), sticky="ew")
         
         # Botão de seleção (menor para grid)
-        select_btn = ctk.CTkButton(
+        card_frame.select_btn = ctk.CTkButton(
             card_frame,
             text="📝",
             width=60,
             height=25,
-            command=lambda idx=index: self._selecionar_tarefa(idx),
+            command=lambda: self._selecionar_tarefa(card_frame.indice),
             font=ctk.CTkFont(size=12)
         )
-        select_btn.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
-        ToolTip(select_btn, "Seleciona esta tarefa para edição ou exclusão")
-    
-    def _criar_card_tarefa_grid_animado(self, tarefa, index, row, col):
-        """Cria um card de tarefa no modo grid com animação de fade-in"""
-        # Cria o card normalmente
-        self._criar_card_tarefa_grid(tarefa, index, row, col)
-        
-        # Encontra o card recém-criado para aplicar animação
-        try:
-            # O card está na posição [row][col] do grid
-            for widget in self.tarefas_scroll_frame.winfo_children():
-                grid_info = widget.grid_info()
-                if grid_info.get('row') == row and grid_info.get('column') == col:
-                    # Aplica efeito de fade-in
-                    self._animar_fade_in(widget)
-                    break
-        except:
-            pass  # Se houver erro, o card aparece normalmente
-    
-    def _criar_card_tarefa_animado(self, tarefa, index):
-        """Cria um card de tarefa no modo lista com animação de fade-in"""
-        # Cria o card normalmente
-        self._criar_card_tarefa(tarefa, index)
-        
-        # Encontra o card recém-criado para aplicar animação
-        try:
-            # O card está na posição [index] do grid
-            for widget in self.tarefas_scroll_frame.winfo_children():
-                grid_info = widget.grid_info()
-                if grid_info.get('row') == index:
-                    # Aplica efeito de fade-in
-                    self._animar_fade_in(widget)
-                    break
-        except:
-            pass  # Se houver erro, o card aparece normalmente
-        
+        card_frame.select_btn.grid(row=2, column=0, padx=10, pady=(0, 10), sticky="ew")
+        ToolTip(card_frame.select_btn, "Seleciona esta tarefa para edição ou exclusão")
+        return card_frame
+
+    def _vincular_card_tarefa_grid(self, card_frame, index, tarefa):
+        """Associa um card do modo grid a uma tarefa."""
+        status_icon, status_color = self._estilo_status(tarefa["status"])
+        titulo_truncado = tarefa["titulo"][:25] + "..." if len(tarefa["titulo"]) > 25 else tarefa["titulo"]
+        descricao_text = tarefa["descricao"][:50] + "..." if len(tarefa["descricao"]) > 50 else tarefa["descricao"]
+        configurar_se_mudou(card_frame.status_label, text=status_icon, text_color=status_color)
+        configurar_se_mudou(card_frame.titulo_label, text=titulo_truncado)
+        configurar_se_mudou(card_frame.descricao_label, text=descricao_text)
+        self._vincular_marcador(card_frame, tarefa)
+        
+    def _criar_marcador(self, master, card_frame):
+        """Cria a caixa que marca a tarefa do card para as ações em massa."""
+        marcador = ctk.CTkCheckBox(
+            master,
+            text="",
+            width=24,
+            checkbox_width=20,
+            checkbox_height=20,
+            command=lambda: self._alternar_marcacao(card_frame)
+        )
+        ToolTip(marcador, "Marca esta tarefa para as ações em massa")
+        return marcador
+
+    def _vincular_marcador(self, card_frame, tarefa):
+        """Reflete no card se a tarefa está marcada."""
+        marcada = self.marcar_todas or str(tarefa["_id"]) in self.ids_marcados
+        if bool(card_frame.marcador.get()) != marcada:
+            if marcada:
+                card_frame.marcador.select()
+            else:
+                card_frame.marcador.deselect()
+
+    def _alternar_marcacao(self, card_frame):
+        """Marca ou desmarca a tarefa do card cujo marcador foi clicado."""
+        if card_frame.indice is None or card_frame.indice >= len(self.tarefas_data):
+            return
+        id_tarefa = str(self.tarefas_data[card_frame.indice]["_id"])
+        if card_frame.marcador.get():
+            self.ids_marcados.add(id_tarefa)
+        else:
+            if self.marcar_todas:
+                # Desmarcar uma tarefa com "Todas" ativo: ficam marcadas as demais já carregadas
+                self.marcar_todas = False
+                self.ids_marcados = {str(t["_id"]) for t in self.tarefas_data}
+            self.ids_marcados.discard(id_tarefa)
+        self._atualizar_marcacao()
+
+    def _alternar_todas(self):
+        """Marca ou desmarca todas as tarefas do filtro."""
+        self.marcar_todas = bool(self.check_todas.get())
+        self.ids_marcados = set()
+        self._atualizar_marcacao()
+        self.lista_virtual.atualizar_visiveis()
+
+    def _atualizar_marcacao(self):
+        """Atualiza a caixa "Todas" e o texto com a quantidade de tarefas marcadas."""
+        if self.marcar_todas:
+            total = self.total_tarefas if self.total_tarefas is not None else len(self.tarefas_data)
+            texto = f"{total} tarefa(s) marcada(s)"
+        else:
+            texto = f"{len(self.ids_marcados)} tarefa(s) marcada(s)" if self.ids_marcados else "Nenhuma tarefa marcada"
+        if bool(self.check_todas.get()) != self.marcar_todas:
+            if self.marcar_todas:
+                self.check_todas.select()
+            else:
+                self.check_todas.deselect()
+        configurar_se_mudou(self.label_marcadas, text=texto)
+
+    def limpar_marcacao(self):
+        """Desmarca todas as tarefas."""
+        self.ids_marcados = set()
+        self.marcar_todas = False
+        self._atualizar_marcacao()
+        self.lista_virtual.atualizar_visiveis()
+
+    def _ids_marcados_para_acao(self):
+        """Ids das tarefas marcadas, ou None para agir sobre todas as tarefas do filtro.
+
+        Durante uma busca, "Todas" vale apenas para o resultado exibido.
+        """
+        if self.marcar_todas:
+            if self.controller.texto_busca:
+                return [str(t["_id"]) for t in self.tarefas_data]
+            return None
+        return list(self.ids_marcados)
+
+    def _concluir_marcadas(self):
+        """Marca as tarefas selecionadas como concluídas."""
+        self.controller.alterar_status_tarefas("Concluída", self._ids_marcados_para_acao())
+
+    def _reabrir_marcadas(self):
+        """Volta as tarefas selecionadas para pendentes."""
+        self.controller.alterar_status_tarefas("Pendente", self._ids_marcados_para_acao())
+
+    def _excluir_marcadas(self):
+        """Exclui as tarefas selecionadas."""
+        self.controller.excluir_tarefas(self._ids_marcados_para_acao())
+
     def _selecionar_tarefa(self, index):
-        """Preenche os campos com os dados da tarefa selecionada."""
-        if 0 <= index < len(self.tarefas_data):
+        """Solicita ao controller a tarefa completa do card selecionado.
+
+        Os cards guardam apenas o resumo da tarefa; os campos são preenchidos (e o ID
+        selecionado é definido) quando o documento completo chega em preencher_campos.
+        """
+        if index is not None and 0 <= index < len(self.tarefas_data):
             tarefa = self.tarefas_data[index]
-            
-            # Preenche título
-            self.entrada_titulo.delete(0, "end")
-            self.entrada_titulo.insert(0, tarefa["titulo"])
-            
-            # Preenche descrição
-            self.texto_descricao.delete("1.0", "end")
-            self.texto_descricao.insert("1.0", tarefa["descricao"])
-            
-            # Define status
-            self.combo_status.set(tarefa["status"])
-            
-            # Armazena ID da tarefa selecionada
-            self.id_tarefa_selecionada = str(tarefa["_id"])
+            self.controller.selecionar_tarefa(str(tarefa["_id"]))
 
     def limpar_campos(self):
         """Limpa os campos de entrada da interface."""
@@ -659,6 +1047,9 @@ class TarefaView:
         self.texto_descricao.delete("1.0", "end")
         self.texto_descricao.insert("1.0", tarefa["descricao"])
         self.combo_status.set(tarefa["status"])
+        
+        # Armazena ID da tarefa selecionada
+        self.id_tarefa_selecionada = str(tarefa["_id"])
 
     def _adicionar(self):
         """Chama o controller para adicionar uma nova tarefa."""
@@ -675,11 +1066,26 @@ class TarefaView:
     def _aplicar_filtro(self):
         """Aplica o filtro de status selecionado pelo usuário."""
         filtro = self.combo_filtro.get()
+        self.limpar_marcacao()
         if filtro == "Todos":
             self.controller.carregar_tarefas()
         else:
             self.controller.carregar_tarefas(filtro)
 
+    def _agendar_busca(self, event=None):
+        """Busca o texto digitado quando o usuário para de digitar por ATRASO_BUSCA_MS."""
+        if self._id_busca_agendada is not None:
+            self.root.after_cancel(self._id_busca_agendada)
+        self._id_busca_agendada = self.root.after(ATRASO_BUSCA_MS, self._buscar)
+
+    def _buscar(self):
+        """Envia ao controller o texto do campo de busca, se ele mudou."""
+        self._id_busca_agendada = None
+        texto = self.entrada_busca.get().strip()
+        if texto != self.controller.texto_busca:
+            self.limpar_marcacao()
+            self.controller.buscar_tarefas(texto)
+
     def _selecionar(self, event):
         """Método mantido para compatibilidade (não usado na nova interface)."""
         pass